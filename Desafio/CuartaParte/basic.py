@@ -1,34 +1,35 @@
 from pyscipopt import Model, quicksum
-import time, math, sys
+import time, math, sys, os
+import numpy as np
 from itertools import combinations
 
-def read_base_data(input_txt):
-    with open(input_txt) as f:
-        O, I, A = map(int, f.readline().split())
-        demand = [[0]*I for _ in range(O)]
-        for b in range(O):
-            k, *pairs = map(int, f.readline().split())
-            for idx in range(0, 2*k, 2):
-                item, qty = pairs[idx], pairs[idx+1]
-                demand[b][item] = qty
-        supply = [[0]*I for _ in range(A)]
-        for a in range(A):
-            l, *pairs = map(int, f.readline().split())
-            for idx in range(0, 2*l, 2):
-                item, qty = pairs[idx], pairs[idx+1]
-                supply[a][item] = qty
-        LB, UB = map(int, f.readline().split())
-    return O, I, A, demand, supply, LB, UB
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from comun.presolve import load_reduced
+from comun.dinkelbach import dinkelbach
+from comun.cotas import KBounds
+from comun.dominancia import aisle_dominance
+from comun.busqueda_local import local_search, LocalSearch
+from comun.arranque import wave_for_k, lift_dominated
+from comun.lns import greedy_wave
 
 
 class Basic:
-    def __init__(self, input_txt):
-        self.O, self.I, self.A, self.demand, self.supply, self.LB, self.UB = read_base_data(input_txt)
+    def __init__(self, input_txt, incremental=True):
+        self.inst, self.red = load_reduced(input_txt)   # red: mapas a la instancia original
+        self.O, self.I, self.A = self.inst.O, self.inst.I, self.inst.A
+        self.LB, self.UB       = self.inst.LB, self.inst.UB
         self.base_model, self.x, self.y, self.con_K = self._build_master()
         self.best_aisles = set()
         self.best_sol    = None
         self.last_dual_bound : float = -float("inf") 
         self.best_dual_bound : float = -float("inf")
+        self.lambda_traj = []                # (it, λ, F(λ), cociente) de Opt_Dinkelbach
+        # incremental: un solo modelo para todos los K, sólo cambia el RHS de EqK
+        self.incremental = incremental
+        self.kbounds     = KBounds(self.inst)
+        self.waves       = []                # olas ya encontradas, para arrancar en caliente
+        self.ls          = LocalSearch(self.inst)
+        self.warm        = greedy_wave(self.inst)   # mejor ola vista (cociente), arranca con la greedy
 
     def _build_master(self):
         m = Model("Desafio_full")
@@ -38,23 +39,43 @@ class Basic:
 
         # one container-type constraint: Σ x_a == K
         con_K = m.addCons(quicksum(x.values()) == 1, name="EqK")
-        # cobertura
-        for i in range(self.I):
-            m.addCons(quicksum(self.demand[o][i]*y[o] for o in y) <=
-                      quicksum(self.supply[a][i]*x[a] for a in x))
-        # tamaño de wave
-        total_units = quicksum(self.demand[o][i]*y[o] for o in y for i in range(self.I))
+        # x_a >= x_b si a domina a b: no saca el óptimo y corta la simetría
+        dom = aisle_dominance(self.inst).dom
+        for b in np.flatnonzero(dom >= 0).tolist():
+            m.addCons(x[int(dom[b])] >= x[b], name=f"dom_{b}")
+        # cobertura: sólo ítems pedidos; si ningún pasillo los tiene, fuera sus órdenes
+        inst = self.inst
+        for i in np.flatnonzero(np.diff(inst.item_ord_ptr)).tolist():
+            ords, d_q = inst.orders_with(i)
+            ais,  s_q = inst.aisles_with(i)
+            if len(ais) == 0:
+                for o in ords.tolist():
+                    m.chgVarUb(y[o], 0)
+                continue
+            m.addCons(quicksum(q*y[o] for o, q in zip(ords.tolist(), d_q.tolist())) <=
+                      quicksum(q*x[a] for a, q in zip(ais.tolist(), s_q.tolist())))
+        # tamaño de wave: un término por orden (u_o), no uno por ítem pedido
+        units = inst.units.tolist()
+        total_units = quicksum(units[o]*y[o] for o in y if units[o])
         m.addCons(total_units >= self.LB, name="LB")
         m.addCons(total_units <= self.UB, name="UB")
         m.setObjective(total_units, "maximize")
         return m, x, y, con_K
 
     # ---------- auxiliares --------------------------------------------------
-    def _model_for_K(self, K):
+    def _model_for_K(self, K, fresh=False):
         """
-        Devuelve un modelo con RHS(K) sin crear todo de nuevo si la versión
-        de PySCIPOpt lo permite; de lo contrario crea uno nuevo.
+        Devuelve un modelo con RHS(K).  En modo incremental es siempre el
+        modelo base: se libera la transformación y sólo se mueve el RHS de
+        EqK.  Con ``fresh=True`` (para quien fija pasillos o cambia el
+        objetivo) se copia si la versión de PySCIPOpt lo permite; si no, se
+        crea uno nuevo.
         """
+        if self.incremental and not fresh:
+            m = self.base_model
+            m.freeTransform()
+            m.chgRhs(self.con_K, K)
+            return m
         try:
             clone = self.base_model.copyOrig()
             con_K = clone.getCons("EqK")
@@ -66,44 +87,65 @@ class Basic:
             return clone
 
     def _extract(self, model):
-        if model.getStatus() != "optimal":
+        if model.getNSols() == 0:            # óptimo o lo mejor que hubo al cortar
             return None
         aisles = {int(v.name.split("_")[1]) for v in model.getVars()
                   if v.name.startswith("x_") and model.getVal(v) > 0.5}
         orders = {int(v.name.split("_")[1]) for v in model.getVars()
                   if v.name.startswith("y_") and model.getVal(v) > 0.5}
-        return {"obj": int(model.getObjVal()) / len(aisles), "aisles": aisles, "orders": orders}
+        units = int(round(model.getObjVal()))
+        return {"obj": units / len(aisles), "units": units, "aisles": aisles, "orders": orders}
 
 
     def Opt_cantidadPasillosFija(self, k, umbral):
         model = self._model_for_K(k)
-        if self.best_sol and len(self.best_sol["aisles"]) == k:
+        self._warm_start(model, k)
+
+        model.setParam("limits/time", 1e20 if umbral is None else max(umbral, 0.01))
+        model.optimize()
+        self.last_dual_bound = model.getDualbound()
+        if self.last_dual_bound > self.best_dual_bound:
+            self.best_dual_bound = self.last_dual_bound
+        self.kbounds.dual(k, self.last_dual_bound)
+        sol = self._extract(model)
+        if sol:
+            self.waves.append(sol)
+            if self.warm is None or sol["obj"] > self.warm["obj"]:
+                self.warm = sol
+        return sol
+
+    def _warm_start(self, model, k):
+        """
+        Arranques en caliente con addSol: la ola de más unidades con <= k
+        pasillos (sigue siendo factible) y la mejor ola llevada a k pasillos
+        (comun.arranque), con los pasillos subidos a su dominador.
+        """
+        starts = [max((w for w in self.waves if len(w["aisles"]) <= k),
+                      key=lambda w: w["units"], default=None)]
+        s = wave_for_k(self.inst, self.warm, k, self.ls)
+        s = s and lift_dominated(self.inst, s, aisle_dominance(self.inst).dom)
+        if s:
+            starts.append({"aisles": s.aisles(), "orders": s.orders()})
+        for warm in filter(None, starts):
             sol = model.createSol()                 # solución vacía
             for v in model.getVars():
                 name, idx = v.name.split("_")
                 idx = int(idx)
                 if name == "x":                     # variable de pasillo
-                    val = 1.0 if idx in self.best_sol["aisles"] else 0.0
+                    val = 1.0 if idx in warm["aisles"] else 0.0
                 elif name == "y":                   # variable de orden
-                    val = 1.0 if idx in self.best_sol["orders"] else 0.0
+                    val = 1.0 if idx in warm["orders"] else 0.0
                 else:
                     val = 0.0
                 model.setSolVal(sol, v, val)
             model.addSol(sol, False)
 
-        model.setParam("limits/time", 60)
-        model.optimize()
-        self.last_dual_bound = model.getDualbound()
-        if self.last_dual_bound > self.best_dual_bound:
-            self.best_dual_bound = self.last_dual_bound
-        return self._extract(model)
-
     def Opt_PasillosFijos(self, umbral):
         if not self.best_aisles:
             raise RuntimeError("Primero ejecuta Opt_ExplorarCantidadPasillos")
 
         k = len(self.best_aisles)
-        m  = self._model_for_K(k)
+        m  = self._model_for_K(k, fresh=True)
 
         xvars = {int(v.name.split("_")[1]): v
                  for v in m.getVars() if v.name.startswith("x_")}
@@ -116,7 +158,7 @@ class Basic:
             else:
                 m.chgVarUb(var, 0.0)
 
-        m.setParam("limits/time", umbral)
+        m.setParam("limits/time", max(umbral, 0.01))
         m.optimize()
         sol = self._extract(m)
         if sol:
@@ -129,7 +171,14 @@ class Basic:
         return sorted(k_list,
                     key=lambda kk: abs(kk - best_k))
 
+    MIN_SLICE = 1.0          # segundos mínimos por k en la exploración
+
     def Opt_ExplorarCantidadPasillos(self, umbral):
+        """
+        Recorre los k vivos repartiendo el tiempo que queda en partes iguales
+        entre los k que faltan (al menos MIN_SLICE): un k difícil no se come
+        todo el umbral y lo que un k no usa queda para los siguientes.
+        """
         start = time.time()
         remaining = lambda: umbral - (time.time() - start)
 
@@ -137,24 +186,69 @@ class Basic:
         best_val  = -float("inf")
 
         
-        k_list = list(range(1, self.A + 1))
+        k_list = self.kbounds.prune(range(1, self.A + 1), best_val)
 
-        for k in k_list:  
-            sol = self.Opt_cantidadPasillosFija(k, None)
+        while k_list and remaining() > 0:
+            share = max(remaining() / len(k_list), self.MIN_SLICE)
+            k = k_list.pop(0)
+            sol = self.Opt_cantidadPasillosFija(k, min(share, remaining()))
 
             if sol and sol["obj"] > best_val:
                 best_sol, best_val = sol, sol["obj"]
 
+            # la cota dual de k también acota todo k' <= k
+            k_list = self.kbounds.prune(k_list, best_val)
             if best_sol:
                 k_list = self.Rankear(k_list, len(best_sol["aisles"]))
 
         if best_sol:
             self.best_aisles = best_sol["aisles"]
-            best_sol = self.Opt_PasillosFijos(remaining())
+            best_sol = self.Opt_PasillosFijos(max(remaining(), 0.1)) or best_sol
+            # lo que sobre del umbral: búsqueda local sobre la ola
+            best_sol = local_search(self.inst, best_sol, start + umbral)
 
         self.best_sol = best_sol
         return best_sol
 
+    # ---------- Dinkelbach ----------------------------------------------------
+    def _model_free_K(self):
+        """Modelo base con Σ x_a libre en [1, A] para el objetivo paramétrico."""
+        m = self._model_for_K(1, fresh=True)
+        con_K = next(c for c in m.getConss() if c.name == "EqK")
+        m.chgLhs(con_K, 1)
+        m.chgRhs(con_K, self.A)
+        return m
+
+    def Opt_Dinkelbach(self, umbral, tol=1e-4):
+        """
+        Maximiza unidades/|pasillos| directamente: itera max unidades - λ·Σ x_a
+        sobre un único modelo, cambiando sólo el objetivo.
+        """
+        m = self._model_free_K()
+        xvars = [v for v in m.getVars() if v.name.startswith("x_")]
+        yvars = [v for v in m.getVars() if v.name.startswith("y_")]
+        units = self.inst.units.tolist()
+
+        def solve(lam, rem):
+            m.freeTransform()
+            m.setObjective(quicksum(units[int(v.name.split("_")[1])] * v for v in yvars)
+                           - lam * quicksum(xvars), "maximize")
+            m.setParam("limits/time", rem)
+            m.optimize()
+            if m.getNSols() == 0:
+                return None
+            aisles = {int(v.name.split("_")[1]) for v in xvars if m.getVal(v) > 0.5}
+            orders = {int(v.name.split("_")[1]) for v in yvars if m.getVal(v) > 0.5}
+            if not aisles:
+                return None
+            return {"units": self.inst.units_of(orders), "aisles": aisles, "orders": orders}
+
+        best, self.lambda_traj = dinkelbach(solve, umbral, tol=tol)
+        if best:
+            self.best_aisles = best["aisles"]
+        self.best_sol = best
+        return best
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("uso:  python basic.py  input_0001.txt")
@@ -164,10 +258,10 @@ if __name__ == "__main__":
 
     print(">>> Opt_ExplorarCantidadPasillos  (umbral = 10 s)")
     best = basic.Opt_ExplorarCantidadPasillos(60)
-    print(best)
+    print(basic.red.to_original(best))
 
     print("\n>>> Opt_cantidadPasillosFija(k=10, umbral=5 s)")
-    print(basic.Opt_cantidadPasillosFija(10, 60))
+    print(basic.red.to_original(basic.Opt_cantidadPasillosFija(10, 60)))
 
     print("\n>>> Opt_PasillosFijos(umbral=5 s)  sobre la mejor selección previa")
-    print(basic.Opt_PasillosFijos(60))
\ No newline at end of file
+    print(basic.red.to_original(basic.Opt_PasillosFijos(60)))
\ No newline at end of file
@@ -1,11 +1,15 @@
 from basic import Basic
-import sys, json
+import sys, json, os
 
 infile  = sys.argv[1] if len(sys.argv) > 1 else "input_0001.txt"
 umbral  = int(sys.argv[2]) if len(sys.argv) > 2 else 10
 
 basic = Basic(infile)
-sol = basic.Opt_ExplorarCantidadPasillos(umbral)
+if os.environ.get("SOLVE_MODE") == "dinkelbach":
+    sol = basic.Opt_Dinkelbach(umbral)
+else:
+    sol = basic.Opt_ExplorarCantidadPasillos(umbral)
+sol = basic.red.to_original(sol)             # índices de la instancia original
 if sol:                                      
     sol["aisles"] = list(sol["aisles"])
     sol["orders"] = list(sol["orders"])
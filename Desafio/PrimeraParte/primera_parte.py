@@ -3,41 +3,23 @@
 
 #PARA EJECUTAR CORRER python .\primera_parte.py .\input_0001.txt 5 (O cualquier valor k)
 from pyscipopt import Model, quicksum
-import sys
+import sys, os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from comun.instancia import load_instance
 
 # --------------------------------------------------------------------
 # 1. Lectura del input
 # --------------------------------------------------------------------
 def read_data(fname):
-    with open(fname, "r") as f:
-        o, i, a = map(int, f.readline().split())
-        O, I, A = o, i, a
-
-        demand = [[0]*I for _ in range(O)]        # u_oi
-        for b in range(O):
-            line = list(map(int, f.readline().split()))
-            k, pairs = line[0], line[1:]
-            for idx in range(0, 2*k, 2):
-                item, qty = pairs[idx], pairs[idx+1]
-                demand[b][item] = qty
-
-        supply = [[0]*I for _ in range(A)]        # u_ai
-        for a_id in range(A):
-            line = list(map(int, f.readline().split()))
-            l, pairs = line[0], line[1:]
-            for idx in range(0, 2*l, 2):
-                item, qty = pairs[idx], pairs[idx+1]
-                supply[a_id][item] = qty
-
-        # última línea:  LB  UB
-        LB, UB = map(int, f.readline().split())
-
-    return O, I, A, demand, supply, LB, UB
+    """Instancia rala (ver comun/instancia.py): u_oi, u_ai, LB, UB."""
+    return load_instance(fname)
 
 # --------------------------------------------------------------------
 # 2. Solución
 # --------------------------------------------------------------------
-def solve(O, I, A, demand, supply, LB, UB, K):
+def solve(inst, K):
+    O, I, A, LB, UB = inst.O, inst.I, inst.A, inst.LB, inst.UB
     m = Model("Desafio_K")
 
     # Variables
@@ -45,9 +27,9 @@ def solve(O, I, A, demand, supply, LB, UB, K):
     x = {a: m.addVar(vtype="B", name=f"x_{a}") for a in range(A)}  # pasillos
 
     # Copias totales en las órdenes elegidas
-    total_units = quicksum( demand[b][i] * y[b]
+    total_units = quicksum( q * y[b]
                             for b in range(O)
-                            for i in range(I) )
+                            for q in inst.order(b)[1].tolist() )
 
     # Límites
     m.addCons(total_units >= LB, name="LB_wave")
@@ -55,9 +37,11 @@ def solve(O, I, A, demand, supply, LB, UB, K):
 
     # Cobertura por ítem
     for i in range(I):
+        ais, s_q = inst.aisles_with(i)
+        ords, d_q = inst.orders_with(i)
         m.addCons(
-            quicksum( supply[a][i] * x[a] for a in range(A) ) >=
-            quicksum( demand[b][i]  * y[b] for b in range(O) ),
+            quicksum( q * x[a] for a, q in zip(ais.tolist(), s_q.tolist()) ) >=
+            quicksum( q * y[b] for b, q in zip(ords.tolist(), d_q.tolist()) ),
             name=f"cover_item_{i}"
         )
 
@@ -90,9 +74,9 @@ if __name__ == "__main__":
     in_file = sys.argv[1]
     K_val   = int(sys.argv[2]) if len(sys.argv)==3 else 1   # valor por defecto
 
-    O,I,A,demand,supply,LB,UB = read_data(in_file)
-    if not (1 <= K_val <= A):
-        print(f"K debe estar entre 1 y {A}.  Valor recibido: {K_val}")
+    inst = read_data(in_file)
+    if not (1 <= K_val <= inst.A):
+        print(f"K debe estar entre 1 y {inst.A}.  Valor recibido: {K_val}")
         sys.exit(1)
 
-    solve(O,I,A,demand,supply,LB,UB,K_val)
+    solve(inst, K_val)
@@ -7,9 +7,16 @@ Resuelve el “wave picking” con:
   • subproblema de pricing 0-1 knapsack por pasillo
 """
 
-import sys, time, math
+import sys, time, math, os
+import numpy as np
 from pyscipopt import Model, quicksum
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from comun.instancia import load_instance
+from comun.candidatos import candidate_index
+from comun.knapsack import make_engine
+from comun.pricing import reduced_costs, price_aisle
+
 def add_coef(model, cons, var, coef):
     if hasattr(model, "addCoefLinear"):
         model.addCoefLinear(cons, var, coef)
@@ -24,95 +31,31 @@ def get_dual(model, cons):
     except Exception:
         return 0.0
 
-def read_instance(fname):
-    with open(fname) as f:
-        O, I, A = map(int, f.readline().split())
-        demand = [[0]*I for _ in range(O)]
-        for o in range(O):
-            k, *pairs = map(int, f.readline().split())
-            for j in range(0, 2*k, 2):
-                i, q = pairs[j], pairs[j+1]
-                demand[o][i] = q
-        supply = [[0]*I for _ in range(A)]
-        for a in range(A):
-            l, *pairs = map(int, f.readline().split())
-            for j in range(0, 2*l, 2):
-                i, q = pairs[j], pairs[j+1]
-                supply[a][i] = q
-        LB, UB = map(int, f.readline().split())
-    return O, I, A, demand, supply, LB, UB
-
-
-# pricing: knapsack 0-1
-def price_column(a, dual_cov, dual_lb, dual_ub, dual_k, dual_order, 
-                 demand, supply, LB, UB):
-    O = len(demand)
-    I = len(supply[0])
-    units_o = [sum(demand[o]) for o in range(O)] #u_o
-
-    price_o = []
-    for o in range(O):
-        rc_part  = units_o[o] # + u_o
-        rc_part -= sum(dual_cov[i]*demand[o][i] for i in range(I)) #  -π_i d_oi
-        rc_part -= units_o[o]*dual_lb #  -λ u_o
-        rc_part -= units_o[o]*dual_ub #  -μ u_o
-        rc_part -= dual_order[o]
-        price_o.append(rc_part)
-    CAP = 1e+09
-    for o in range(O):
-        if not math.isfinite(price_o[o]):
-            price_o[o] = CAP if price_o[o] > 0 else -CAP
-        elif price_o[o] >  CAP:
-            price_o[o] =  CAP
-        elif price_o[o] < -CAP:
-            price_o[o] = -CAP
-
-    knap = Model(f"pricing_{a}")
-    z = {o: knap.addVar(vtype="B", obj=price_o[o]) for o in range(O)}
-
-    for i in range(I):
-        knap.addCons(quicksum(demand[o][i] * z[o] for o in range(O))
-                     <= supply[a][i])
-    tot = quicksum(units_o[o] * z[o] for o in range(O))
-    knap.addCons(tot >= LB)
-    knap.addCons(tot <= UB)
-
-    try: knap.hideOutput()
-    except AttributeError: knap.setParam("display/verblevel", 0)
-
-    knap.optimize()
-    if knap.getStatus() != "optimal":
-        return None
-
-    rc = knap.getObjVal() - dual_k
-    if rc <= 1e-6:
-        return None
-    sel   = [o for o in z if knap.getVal(z[o]) > 0.5]
-    units = sum(units_o[o] for o in sel)
-    print(f"------------------------------------[pricing] a={a:3d}  rc={rc:6.2f}  units={units:3d}  sel={sel}------------------------------------", flush=True)
-    return sel, units, rc
 
 class Columns:
-    def __init__(self, fname):
-        (self.O, self.I, self.A,
-         self.demand, self.supply,
-         self.LB, self.UB) = read_instance(fname)
+    def __init__(self, fname, pricing="bb"):
+        self.inst = load_instance(fname)
+        self.O, self.I, self.A = self.inst.O, self.inst.I, self.inst.A
+        self.LB, self.UB       = self.inst.LB, self.inst.UB
+        self.engine = make_engine(pricing)   # "bb" o "scip" (comun/knapsack.py)
+        self.cand   = candidate_index(self.inst)
         self.rmp_cache = {} # un modelo por valor de k
         self.best_sol  = None
 
     # ---------------- patrón greed max por pasillo -------------------------
     def _greedy_pattern(self, a):
-        units_o = [(o, sum(self.demand[o])) for o in range(self.O)]
-        units_o.sort(key=lambda t: -t[1])
-        cap = self.supply[a][:]
+        fit = self.cand.orders_for(a)            # sólo las que entran solas en a
+        fit = fit[np.argsort(-self.inst.units[fit], kind="stable")]
+        units_o = zip(fit.tolist(), self.inst.units[fit].tolist())
+        cap = self.inst.supply_row(a)
         sel, tot = [], 0
         for o, u in units_o:
             if tot + u > self.UB:
                 continue
-            if all(self.demand[o][i] <= cap[i] for i in range(self.I)):
+            items, qty = self.inst.order(o)
+            if (qty <= cap[items]).all():
                 sel.append(o); tot += u
-                for i in range(self.I):
-                    cap[i] -= self.demand[o][i]
+                cap[items] -= qty
             if tot == self.UB:
                 break
         return sel, tot
@@ -155,9 +98,9 @@ class Columns:
 
             vname = f"col_{a}_" + "_".join(map(str, orders))
             v = m.addVar(vtype="C", lb=0, ub=1, obj=units, name=vname)
-            for i in range(self.I):
-                q = sum(self.demand[o][i] for o in orders)
-                if q: add_coef(m, cov[i], v, q)
+            items, qty = self.inst.demand_of(orders)
+            for i, q in zip(items.tolist(), qty.tolist()):
+                add_coef(m, cov[i], v, q)
             add_coef(m, lb,   v, units)
             add_coef(m, ub,   v, units)
             add_coef(m, card, v, 1)
@@ -190,9 +133,9 @@ class Columns:
         m = pack["model"]
         v = m.addVar(vtype="C", lb=0, ub=1, obj=units,
                      name=f"col_{a}_" + "_".join(map(str, orders)))
-        for i in range(self.I):
-            q = sum(self.demand[o][i] for o in orders)
-            if q: add_coef(m, pack["cov"][i], v, q)
+        items, qty = self.inst.demand_of(orders)
+        for i, q in zip(items.tolist(), qty.tolist()):
+            add_coef(m, pack["cov"][i], v, q)
         add_coef(m, pack["lb"],   v, units)
         add_coef(m, pack["ub"],   v, units)
         add_coef(m, pack["card"], v, 1)
@@ -218,13 +161,13 @@ class Columns:
             dual_ub  = get_dual(m, pack["ub"])
             dual_k   = get_dual(m, pack["card"])
             dual_order = [get_dual(m, pack["order_cons"][o]) for o in range(self.O)]
+            rc = reduced_costs(self.inst, dual_cov, dual_lb, dual_ub, dual_order)
             any_new = False
             for a in range(self.A):
-                priced = price_column(a, dual_cov, dual_lb, dual_ub, dual_k, dual_order,
-                                      self.demand, self.supply,
-                                      self.LB, self.UB)
+                priced = price_aisle(a, rc, dual_k, self.inst, self.engine)
                 if priced:
-                    sel, units, _ = priced
+                    sel, units, red = priced
+                    print(f"------------------------------------[pricing] a={a:3d}  rc={red:6.2f}  units={units:3d}  sel={sel}------------------------------------", flush=True)
                     m.freeTransform() 
                     self._add_column(pack, a, sel, units)
                     any_new = True
@@ -317,7 +260,7 @@ class Columns:
         if not ords:
             return None
 
-        units = sum(sum(self.demand[o]) for o in ords)
+        units = self.inst.units_of(ords)
         k     = len(ais) or 1
         prod  = units / k
 
@@ -344,7 +287,7 @@ class Columns:
         if not ords:
             return None
         
-        units = sum(sum(self.demand[o]) for o in ords)
+        units = self.inst.units_of(ords)
         if units < self.LB or units > self.UB:
             return None
         k     = len(ais) or 1
@@ -4,56 +4,31 @@
 #  - fixed_aisles.dat:  índices de los pasillos que SÍ se visitan
 
 from pyscipopt import Model, quicksum
-import sys
+import sys, os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from comun.instancia import load_instance
 
 # 1. datos
 # ---------------------------------------------------------------------------
 def read_data(fname_input, fname_fixed):
     """
     Devuelve:
-        cant_bolsitas, cant_items, cant_pasillos,
-        demanda_por_bolsita[b][i],
-        items_por_pasillo[a][i],
-        pasillos_fijos (set),
-        LB, UB
+        instancia rala (ver comun/instancia.py),
+        pasillos_fijos (set)
     """
-    with open(fname_input, "r") as f:
-        o, i, a = map(int, f.readline().split())
-        cant_bolsitas, cant_items, cant_pasillos = o, i, a
-
-        # demanda_por_bolsita[b][i] = u_oi
-        demanda_por_bolsita = [[0] * cant_items for _ in range(cant_bolsitas)]
-        for b in range(cant_bolsitas):
-            datos = list(map(int, f.readline().split()))
-            k, pares = datos[0], datos[1:]
-            for idx in range(0, 2 * k, 2):
-                item, qty = pares[idx], pares[idx + 1]
-                demanda_por_bolsita[b][item] = qty
-
-        # items_por_pasillo[a][i] = u_ai
-        items_por_pasillo = [[0] * cant_items for _ in range(cant_pasillos)]
-        for a_id in range(cant_pasillos):
-            datos = list(map(int, f.readline().split()))
-            l, pares = datos[0], datos[1:]
-            for idx in range(0, 2 * l, 2):
-                item, qty = pares[idx], pares[idx + 1]
-                items_por_pasillo[a_id][item] = qty
-
-        # última línea del input: LB  UB
-        LB, UB = map(int, f.readline().split())
+    inst = load_instance(fname_input)
 
     # pasillos fijados
     pasillos_fijos = set(map(int, open(fname_fixed).read().split()))
 
-    return (cant_bolsitas, cant_items, cant_pasillos,
-            demanda_por_bolsita, items_por_pasillo,
-            pasillos_fijos, LB, UB)
+    return inst, pasillos_fijos
 
 # 2. Modelo
 # ---------------------------------------------------------------------------
-def solve(cant_bolsitas, cant_items, cant_pasillos,
-          demanda_por_bolsita, items_por_pasillo,
-          pasillos_fijos, LB, UB):
+def solve(inst, pasillos_fijos):
+    cant_bolsitas, cant_items = inst.O, inst.I
+    LB, UB = inst.LB, inst.UB
 
     model = Model("Parte2_Afix")
 
@@ -61,21 +36,22 @@ def solve(cant_bolsitas, cant_items, cant_pasillos,
     y = {b: model.addVar(vtype="B", name=f"y_{b}") for b in range(cant_bolsitas)}
 
     # Unidades totales en la wave
-    total_units = quicksum(demanda_por_bolsita[b][i] * y[b]
+    total_units = quicksum(q * y[b]
                            for b in range(cant_bolsitas)
-                           for i in range(cant_items))
+                           for q in inst.order(b)[1].tolist())
 
     # Rango [LB, UB]
     model.addCons(total_units >= LB, name="LB_wave")
     model.addCons(total_units <= UB, name="UB_wave")
 
     # Cobertura: solo con los pasillos dados
+    capacidad = inst.supply_of(pasillos_fijos).tolist()
     for i in range(cant_items):
-        capacidad_i = sum(items_por_pasillo[a][i] for a in pasillos_fijos)
+        ords, d_q = inst.orders_with(i)
         model.addCons(
-            quicksum(demanda_por_bolsita[b][i] * y[b]
-                     for b in range(cant_bolsitas))
-            <= capacidad_i,
+            quicksum(q * y[b]
+                     for b, q in zip(ords.tolist(), d_q.tolist()))
+            <= capacidad[i],
             name=f"Cover_item_{i}"
         )
 
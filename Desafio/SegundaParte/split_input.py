@@ -6,49 +6,31 @@
 #       aisles.dat  –  aisle   item   units
 #       limits.dat  –  LB  UB  K   (K se pasa como 2º argumento)
 # ---------------------------------------------------------------------------
-import sys, pathlib, itertools
+import sys, os
+import numpy as np
 
-def main(fname, K):
-    with open(fname, "r", encoding="utf-8") as f:
-        tokens = list(map(int, f.read().strip().split()))
-    pos = 0
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from comun.instancia import load_instance
 
-    # cabecera
-    O, I, A = tokens[pos:pos+3]
-    pos += 3
+def write_rows(path, ptr, items, qty):
+    rows = np.repeat(np.arange(len(ptr) - 1), np.diff(ptr))
+    np.savetxt(path, np.column_stack([rows, items, qty]), fmt="%d")
 
-    head   = open("head.dat",   "w")
-    orders = open("orders.dat", "w")
-    aisles = open("aisles.dat", "w")
+def main(fname, K):
+    # instancia completa, sin presolve: los .dat (y fixed_aisles.dat,
+    # patrones.dat) van todos en los índices del archivo original
+    inst = load_instance(fname)
 
-    print(O, I, A, file=head)
+    with open("head.dat", "w") as head:
+        print(inst.O, inst.I, inst.A, file=head)
 
     # órdenes
-    for o in range(O):
-        k = tokens[pos]; pos += 1
-        for _ in range(k):
-            item = tokens[pos]
-            qty  = tokens[pos + 1]
-            pos += 2
-            print(o, item, qty, file=orders)
-
+    write_rows("orders.dat", inst.ord_ptr, inst.ord_items, inst.ord_qty)
     # pasillos
-    for a in range(A):
-        l = tokens[pos]; pos += 1
-        for _ in range(l):
-            item = tokens[pos]
-            qty  = tokens[pos + 1]
-            pos += 2
-            print(a, item, qty, file=aisles)
-
-    # última línea =  LB  UB
-    LB, UB = tokens[pos:pos+2]
+    write_rows("aisles.dat", inst.ais_ptr, inst.ais_items, inst.ais_qty)
 
     with open("limits.dat", "w") as f_lim:
-        print(LB, UB, K, file=f_lim)
-
-    for f in (head, orders, aisles):
-        f.close()
+        print(inst.LB, inst.UB, K, file=f_lim)
 
 if __name__ == "__main__":
     if len(sys.argv) not in (2, 3):
@@ -1,6 +1,13 @@
 import sys, time, os, json, math
+import numpy as np
 from pyscipopt import Model, quicksum
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from comun.instancia import load_instance
+from comun.candidatos import candidate_index
+from comun.knapsack import make_engine
+from comun.pricing import reduced_costs, price_aisle
+
 def add_coef(model, cons, var, coef):
     if hasattr(model, "addCoefLinear"):
         model.addCoefLinear(cons, var, coef)
@@ -25,96 +32,32 @@ def _mejor(sol, best_sol):
         return True
     return False
 
-def read_instance(fname):
-    with open(fname) as f:
-        O, I, A = map(int, f.readline().split())
-        demand = [[0]*I for _ in range(O)]
-        for o in range(O):
-            k, *pairs = map(int, f.readline().split())
-            for j in range(0, 2*k, 2):
-                i, q = pairs[j], pairs[j+1]
-                demand[o][i] = q
-        supply = [[0]*I for _ in range(A)]
-        for a in range(A):
-            l, *pairs = map(int, f.readline().split())
-            for j in range(0, 2*l, 2):
-                i, q = pairs[j], pairs[j+1]
-                supply[a][i] = q
-        LB, UB = map(int, f.readline().split())
-    return O, I, A, demand, supply, LB, UB
-
-
-# pricing
-def price_column(a, dual_cov, dual_lb, dual_ub, dual_k, dual_order, 
-                 demand, supply, LB, UB):
-    O = len(demand)
-    I = len(supply[0])
-    units_o = [sum(demand[o]) for o in range(O)] #u_o
-
-    price_o = []
-    for o in range(O):
-        rc_part  = units_o[o] # + u_o
-        rc_part -= sum(dual_cov[i]*demand[o][i] for i in range(I)) #  -π_i d_oi
-        rc_part -= units_o[o]*dual_lb #  -λ u_o
-        rc_part -= units_o[o]*dual_ub #  -μ u_o
-        rc_part -= dual_order[o]
-        price_o.append(rc_part)
-    CAP = 1e+09
-    for o in range(O):
-        if not math.isfinite(price_o[o]):
-            price_o[o] = CAP if price_o[o] > 0 else -CAP
-        elif price_o[o] >  CAP:
-            price_o[o] =  CAP
-        elif price_o[o] < -CAP:
-            price_o[o] = -CAP
-
-    knap = Model(f"pricing_{a}")
-    z = {o: knap.addVar(vtype="B", obj=price_o[o]) for o in range(O)}
-
-    for i in range(I):
-        knap.addCons(quicksum(demand[o][i] * z[o] for o in range(O))
-                     <= supply[a][i])
-    tot = quicksum(units_o[o] * z[o] for o in range(O))
-    knap.addCons(tot >= LB)
-    knap.addCons(tot <= UB)
-
-    try: knap.hideOutput()
-    except AttributeError: knap.setParam("display/verblevel", 0)
-
-    knap.optimize()
-    if knap.getStatus() != "optimal":
-        return None
-
-    rc = knap.getObjVal() - dual_k
-    if rc <= 1e-6:
-        return None
-    sel   = [o for o in z if knap.getVal(z[o]) > 0.5]
-    units = sum(units_o[o] for o in sel)
-    print(f"------------------------------------[pricing] a={a:3d}  rc={rc:6.2f}  units={units:3d}  sel={sel}------------------------------------", flush=True)
-    return sel, units, rc
 
 class Columns:
     WINDOW = 3
-    def __init__(self, fname):
-        (self.O, self.I, self.A,
-         self.demand, self.supply,
-         self.LB, self.UB) = read_instance(fname)
+    def __init__(self, fname, pricing="bb"):
+        self.inst = load_instance(fname)
+        self.O, self.I, self.A = self.inst.O, self.inst.I, self.inst.A
+        self.LB, self.UB       = self.inst.LB, self.inst.UB
+        self.engine = make_engine(pricing)   # "bb" o "scip" (comun/knapsack.py)
+        self.cand   = candidate_index(self.inst)
         self.rmp_cache = {}
         self.best_sol  = None
         self._iter = 0
 
     def _greedy_pattern(self, a):
-        units_o = [(o, sum(self.demand[o])) for o in range(self.O)]
-        units_o.sort(key=lambda t: -t[1])
-        cap = self.supply[a][:]
+        fit = self.cand.orders_for(a)            # sólo las que entran solas en a
+        fit = fit[np.argsort(-self.inst.units[fit], kind="stable")]
+        units_o = zip(fit.tolist(), self.inst.units[fit].tolist())
+        cap = self.inst.supply_row(a)
         sel, tot = [], 0
         for o, u in units_o:
             if tot + u > self.UB:
                 continue
-            if all(self.demand[o][i] <= cap[i] for i in range(self.I)):
+            items, qty = self.inst.order(o)
+            if (qty <= cap[items]).all():
                 sel.append(o); tot += u
-                for i in range(self.I):
-                    cap[i] -= self.demand[o][i]
+                cap[items] -= qty
             if tot == self.UB:
                 break
         return sel, tot
@@ -166,9 +109,9 @@ class Columns:
 
             vname = f"col_{a}_" + "_".join(map(str, orders))
             v = m.addVar(vtype="B", obj=units, name=vname)
-            for i in range(self.I):
-                q = sum(self.demand[o][i] for o in orders)
-                if q: add_coef(m, cov[i], v, q)
+            items, qty = self.inst.demand_of(orders)
+            for i, q in zip(items.tolist(), qty.tolist()):
+                add_coef(m, cov[i], v, q)
             add_coef(m, lb,   v, units)
             add_coef(m, ub,   v, units)
             add_coef(m, card, v, 1)
@@ -177,7 +120,7 @@ class Columns:
             cols[(a, frozenset(orders))] = v
             last[v.name] = 0
         
-        return {"model": m, "cols": cols, "cov": cov,
+        return {"model": m, "cols": cols, "cov": cov, "last": last,
                 "lb": lb, "ub": ub, "card": card,  "order_cons": order_cons}
 
     def _add_column(self, pack, a, orders, units):
@@ -187,9 +130,9 @@ class Columns:
         m = pack["model"]
         v = m.addVar(vtype="B", obj=units,
                      name=f"col_{a}_" + "_".join(map(str, orders)))
-        for i in range(self.I):
-            q = sum(self.demand[o][i] for o in orders)
-            if q: add_coef(m, pack["cov"][i], v, q)
+        items, qty = self.inst.demand_of(orders)
+        for i, q in zip(items.tolist(), qty.tolist()):
+            add_coef(m, pack["cov"][i], v, q)
         add_coef(m, pack["lb"],   v, units)
         add_coef(m, pack["ub"],   v, units)
         add_coef(m, pack["card"], v, 1)
@@ -198,22 +141,21 @@ class Columns:
         pack["cols"][key] = v
         pack["last"][v.name] = self._iter   
 
-    def _update_and_prune(self, pack):
+    def _update_and_prune(self, pack, vals):
+        # vals: valores de la última solución, leídos antes del freeTransform
         m     = pack["model"]
         last  = pack["last"]
         to_rm = []
 
-        for v in m.getVars():
-            name = v.name
-            if name in last and m.getVal(v) > 0.5:
+        for name, val in vals.items():
+            if name in last and val > 0.5:
                 last[name] = self._iter
 
         for name, tlast in list(last.items()):
             if tlast == -1: # dummy / slack
                 continue
             if (self._iter - tlast) >= self.WINDOW:
-                v = m.getVarByName(name)
-                if m.getVal(v) < 1e-6:
+                if vals.get(name, 0.0) < 1e-6:
                     to_rm.append(name)
 
         if not to_rm:
@@ -223,12 +165,22 @@ class Columns:
 
 
         m.freeTransform()
+        by_name = {v.name: key for key, v in pack["cols"].items()}
         for name  in to_rm:
-            v = m.getVarByName(name)
-            m.chgVarUb(v, 0.0) # desactiva la columna
-       
+            key = by_name[name]
+            v = pack["cols"].pop(key)
+            # sacarla de sus filas antes de borrarla: SCIP no transforma
+            # filas lineales que apuntan a una variable borrada
+            a, orders = key
+            rows = [pack["lb"], pack["ub"], pack["card"]]
+            rows += [pack["order_cons"][o] for o in orders]
+            if orders:
+                items, _ = self.inst.demand_of(sorted(orders))
+                rows += [pack["cov"][i] for i in items.tolist()]
+            for c in rows:
+                m.delCoefLinear(c, v)
             m.delVar(v) # borrar definitivamente
-            last.pop(v)
+            last.pop(name)
 
     def Opt_cantidadPasillosFija(self, k, umbral):
         if k not in self.rmp_cache:
@@ -243,29 +195,30 @@ class Columns:
             m.optimize()
             if m.getStatus() != "optimal":
                 break
+            vals = {v.name: m.getVal(v) for v in m.getVars()}
+            if (time.time()-start) >= 0.8*umbral:
+                break           # sale con el RMP resuelto, no a medio armar
 
             dual_cov = [get_dual(m, pack["cov"][i]) for i in range(self.I)]
             dual_lb  = get_dual(m, pack["lb"])
             dual_ub  = get_dual(m, pack["ub"])
             dual_k   = get_dual(m, pack["card"])
             dual_order = [get_dual(m, pack["order_cons"][o]) for o in range(self.O)]
+            rc = reduced_costs(self.inst, dual_cov, dual_lb, dual_ub, dual_order)
             any_new = False
             for a in range(self.A):
-                priced = price_column(a, dual_cov, dual_lb, dual_ub, dual_k, dual_order,
-                                      self.demand, self.supply,
-                                      self.LB, self.UB)
+                priced = price_aisle(a, rc, dual_k, self.inst, self.engine)
                 if priced:
-                    sel, units, _ = priced
+                    sel, units, red = priced
+                    print(f"------------------------------------[pricing] a={a:3d}  rc={red:6.2f}  units={units:3d}  sel={sel}------------------------------------", flush=True)
                     m.freeTransform() 
                     self._add_column(pack, a, sel, units)
                     any_new = True
             if not any_new:
                 break
               
-            self._update_and_prune(pack)
+            self._update_and_prune(pack, vals)
             rounds += 1
-            if (time.time()-start) >= 0.8*umbral:
-                break
         self._last_model = pack["model"]
         
         
@@ -342,7 +295,7 @@ class Columns:
         if not ords:
             return None
         
-        units = sum(sum(self.demand[o]) for o in ords)
+        units = self.inst.units_of(ords)
         if units < self.LB or units > self.UB:
             return None
         k     = len(ais) or 1
@@ -369,7 +322,7 @@ if __name__ == "__main__":
     if len(sys.argv) > 3: 
         out_file = sys.argv[3]
         with open(out_file, "w") as f:
-            json.dump(best, f)
+            json.dump(best, f, default=sorted)   # sets → listas
     m = solver._last_model
     total_c  = m.getNConss()
     total_v  = m.getNVars()
@@ -13,11 +13,26 @@ Branch-and-Price *minimalista*:
 """
 
 import sys, time, math, os, json
+import numpy as np
 from collections import defaultdict
 from typing import List, Dict, Tuple, Set
 
 from pyscipopt import Model, Pricer, quicksum, SCIP_RESULT
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from comun.presolve import load_reduced
+from comun.candidatos import candidate_index
+from comun.dominancia import aisle_dominance
+from comun.knapsack import make_engine
+from comun.pricing import reduced_costs, default_cols_per_aisle
+from comun.paralelo import AislePricer, default_workers
+from comun.pool import ColumnPool
+from comun.dinkelbach import dinkelbach
+from comun.cotas import KBounds
+from comun.exploracion import explore_parallel, default_explore_workers
+from comun.arranque import columns_for_k
+from comun.semillas import seed_columns
+
 def add_coef(model: Model, cons, var, coef):
     if hasattr(model, "addCoefLinear"):
         model.addCoefLinear(cons, var, coef)
@@ -26,68 +41,13 @@ def add_coef(model: Model, cons, var, coef):
 
 def get_dual(model: Model, cons):
     try:
-        return (model.getDualsolLinear(cons)
-                if hasattr(model, "getDualsolLinear")
-                else model.getDual(cons))
+        d = (model.getDualsolLinear(cons)
+             if hasattr(model, "getDualsolLinear")
+             else model.getDual(cons))
     except Exception:
         return 0.0
-
-def read_instance(fname: str):
-    with open(fname) as f:
-        O, I, A = map(int, f.readline().split())
-        demand = [[0]*I for _ in range(O)]
-        for o in range(O):
-            k, *pairs = map(int, f.readline().split())
-            for j in range(0, 2*k, 2):
-                i, q = pairs[j], pairs[j+1]
-                demand[o][i] = q
-        supply = [[0]*I for _ in range(A)]
-        for a in range(A):
-            l, *pairs = map(int, f.readline().split())
-            for j in range(0, 2*l, 2):
-                i, q = pairs[j], pairs[j+1]
-                supply[a][i] = q
-        LB, UB = map(int, f.readline().split())
-    return O, I, A, demand, supply, LB, UB
-
-def price_column(a: int, dual_cov: List[float],
-                 dual_lb: float, dual_ub: float,
-                 dual_k: float, dual_ord: List[float],
-                 demand: List[List[int]], supply: List[List[int]],
-                 LB: int, UB: int):
-    O = len(demand); I = len(supply[0])
-    u_o = [sum(demand[o]) for o in range(O)]
-
-    rc_obj = []
-    for o in range(O):
-        rc  = u_o[o]
-        rc -= sum(dual_cov[i]*demand[o][i] for i in range(I))
-        rc -= u_o[o]*(dual_lb + dual_ub)
-        rc -= dual_ord[o]
-        rc_obj.append(rc)
-
-    knap = Model(f"pricing_{a}")
-    z = {o: knap.addVar(vtype="B", obj=rc_obj[o]) for o in range(O)}
-
-    for i in range(I):
-        knap.addCons(quicksum(demand[o][i]*z[o] for o in range(O))
-                     <= supply[a][i])
-    tot = quicksum(u_o[o]*z[o] for o in range(O))
-    knap.addCons(tot >= LB)
-    knap.addCons(tot <= UB)
-
-    knap.hideOutput()
-    knap.optimize()
-    if knap.getStatus() != "optimal":
-        return None
-
-    red_cost = knap.getObjVal() - dual_k
-    if red_cost <= 1e-6:
-        return None
-
-    sel = [o for o in z if knap.getVal(z[o]) > 0.5]
-    units = sum(u_o[o] for o in sel)
-    return sel, units, red_cost
+    # duales del transformado (minimiza): en un máximo vienen con el signo cambiado
+    return -d if model.getObjectiveSense() == "maximize" else d
 
 #Pricer
 class WavePricer(Pricer):
@@ -99,75 +59,82 @@ class WavePricer(Pricer):
     def pricerredcost(self):
         m       = self.model
         pack    = self.pack
-        added   = False
 
         dual_cov   = [get_dual(m, pack["cov"][i])   for i in range(self.solver.I)]
         dual_lb    = get_dual(m, pack["lb"])
         dual_ub    = get_dual(m, pack["ub"])
-        dual_k     = get_dual(m, pack["card"])
+        dual_k     = get_dual(m, pack["card"]) + pack["lam"]   # cada pasillo cuesta λ
         dual_order = [get_dual(m, pack["order"][o]) for o in range(self.solver.O)]
-
-        for a in range(self.solver.A):
-            res = price_column(a, dual_cov, dual_lb, dual_ub, dual_k,
-                               dual_order,
-                               self.solver.demand, self.solver.supply,
-                               self.solver.LB, self.solver.UB)
-            if not res:
-                continue
-            orders, units, _ = res
+        rc = reduced_costs(self.solver.inst, dual_cov, dual_lb, dual_ub, dual_order)
+
+        # primero columnas ya vistas en otros k; si ninguna mejora, knapsack
+        pool  = self.solver.pool
+        found = pool.best(rc, dual_k, skip=pack["cols"], limit=self.solver.POOL_SEED)
+        if not found:
+            s = self.solver
+            found = [(a, o, u, r) for a, (o, u, r)
+                     in s.pricer.price(rc, dual_k, s.price_aisles, s.cols_per_aisle)]
+            for a, orders, units, _ in found:
+                pool.add(a, orders, units)
+
+        for a, orders, units, _ in found:
             key = (a, frozenset(orders))
             if key in pack["cols"]:
                 continue
 
-            #crea la variable en el nodo actual
-            name = f"col_{a}_" + "_".join(map(str, orders))
-            var  = m.addVar(vtype="B", obj=units, name=name)
-
-            for i in range(self.solver.I):
-                q = sum(self.solver.demand[o][i] for o in orders)
-                if q:
-                    add_coef(m, pack["cov"][i], var, q)
-            add_coef(m, pack["lb"]  , var, units)
-            add_coef(m, pack["ub"]  , var, units)
-            add_coef(m, pack["card"], var, 1)
+            #crea la variable en el nodo actual; vive en el problema
+            #transformado, que minimiza: objetivo con signo cambiado
+            cid  = pool.add(a, orders, units)
+            var  = m.addVar(vtype="B", obj=-(units - pack["lam"]), name=f"c{cid}", pricedVar=True)
+
+            tc = m.getTransformedCons
+            items, qty = pool.coverage(cid)
+            for i, q in zip(items.tolist(), qty.tolist()):
+                add_coef(m, tc(pack["cov"][i]), var, q)
+            add_coef(m, tc(pack["lb"])  , var, units)
+            add_coef(m, tc(pack["ub"])  , var, units)
+            add_coef(m, tc(pack["card"]), var, 1)
             for o in orders:
-                add_coef(m, pack["order"][o], var, 1)
+                add_coef(m, tc(pack["order"][o]), var, 1)
 
-            m.addPricedVar(var, 1.0)
             pack["cols"][key] = var
-            added = True
+            pack["priced"].add(key)
 
-        return {"result": SCIP_RESULT.SUCCESS if added
-                          else SCIP_RESULT.DIDNOTFIND}
+        # SUCCESS = el pricing terminó (haya o no columnas nuevas);
+        # SCIP no acepta DIDNOTFIND como resultado de un pricer
+        return {"result": SCIP_RESULT.SUCCESS}
 
     def pricerfarkas(self):
-        return {"result": SCIP_RESULT.DIDNOTRUN}
+        # sin pricing de Farkas: el RMP infactible se da por infactible
+        return {"result": SCIP_RESULT.SUCCESS}
 class Solver:
     PRUNE_HORIZON = 3
     PRUNE_WARMUP  = 5
-
-    def __init__(self, fname: str):
-        (self.O, self.I, self.A,
-         self.demand, self.supply,
-         self.LB, self.UB) = read_instance(fname)
+    POOL_SEED     = 50        # máx. columnas del pool por llamada al pricer
+
+    def __init__(self, fname: str, pricing: str = "bb", workers: int = 1,
+                 explore_workers: int = 1):
+        self.fname = fname
+        self.inst, self.red = load_reduced(fname)   # red: mapas a la instancia original
+        self.O, self.I, self.A = self.inst.O, self.inst.I, self.inst.A
+        self.LB, self.UB       = self.inst.LB, self.inst.UB
+        self.engine = make_engine(pricing)
+        self.cand   = candidate_index(self.inst)
+        self.dominance = aisle_dominance(self.inst)   # pricing sólo en no dominados
+        self.price_aisles = self.dominance.pricing_aisles().tolist()
+        print(self.dominance.summary())
+        self.pricer = AislePricer(self.inst, self.engine, workers)
+        self.cols_per_aisle = default_cols_per_aisle()   # columnas por pasillo y ronda
+        self.pool   = ColumnPool(self.inst)  # columnas compartidas entre los k (y su registro)
 
         self.rmp_cache : Dict[int, dict] = {}
-        self.last_seen : Dict[str,int]   = defaultdict(int)
+        self.last_seen : Dict[tuple,int] = defaultdict(int)
         self.k_stats   : Dict[int,dict]  = {k:{"best":-1e18,"trials":0} for k in range(1,self.A+1)}
-
-    def _greedy_pattern(self, a: int) -> Tuple[List[int], int]:
-        units = [(o, sum(self.demand[o])) for o in range(self.O)]
-        dens  = lambda t: t[1] / (sum(1 for q in self.demand[t[0]] if q>0) or 1)
-        units.sort(key=lambda t: (-dens(t), -t[1]))
-
-        cap = self.supply[a][:]; sel=[]; tot=0
-        for o,u in units:
-            if tot+u>self.UB: continue
-            if all(self.demand[o][i]<=cap[i] for i in range(self.I)):
-                sel.append(o); tot+=u
-                for i in range(self.I): cap[i]-=self.demand[o][i]
-            if tot==self.UB: break
-        return sel, tot
+        self.lambda_traj : List[tuple]   = []   # (it, λ, F(λ), cociente) de solve_dinkelbach
+        self.par_metrics = None                  # {k: k_metrics(k)} de los workers (solve_parallel)
+        self.kbounds = KBounds(self.inst)
+        self.explore_workers = explore_workers  # > 1: cada k en un proceso aparte
+        self.warm = None                        # mejor ola vista: arranque en caliente de cada k
 
     def _build_master(self, k:int):
         m = Model(f"RMP_k{k}"); m.hideOutput(); m.setMaximize()
@@ -189,44 +156,77 @@ class Solver:
         for cons in (lb,ub): add_coef(m,cons,s,self.LB)
         cols[("slack",frozenset())]=s
 
+        pack={"model":m,"cov":cov,"lb":lb,"ub":ub,"card":card,"order":order,"cols":cols,
+              "lam":0.0,"priced":set(),"k":k}
+        # semillas greedy por densidad, una vez por instancia (comun.semillas)
+        seeds=seed_columns(self.inst,"dens")
         for a in range(self.A):
-            orders,units = self._greedy_pattern(a)
+            orders,units = seeds[a][0] if seeds[a] and self.dominance.rep[a]==a else ([],0)
             if not orders:
-                v=m.addVar(vtype="B",obj=0,name=f"col_{a}_0")
+                v=m.addVar(vtype="B",obj=0,name=f"e{a}")          # sin órdenes
                 add_coef(m,card,v,1); cols[(a,frozenset())]=v; continue
-            name=f"col_{a}_"+"_".join(map(str,orders))
-            v=m.addVar(vtype="B",obj=units,name=name)
-            for i in range(self.I):
-                q=sum(self.demand[o][i] for o in orders)
-                if q: add_coef(m,cov[i],v,q)
-            for cons in (lb,ub): add_coef(m,cons,v,units)
-            add_coef(m,card,v,1)
-            for o in orders: add_coef(m,order[o],v,1)
-            cols[(a,frozenset(orders))]=v
-
-        pack={"model":m,"cov":cov,"lb":lb,"ub":ub,"card":card,"order":order,"cols":cols}
+            self._add_column(pack,a,orders,units)
+
+        for cons in [*order.values(), *cov.values(), lb, ub, card]:
+            m.setModifiable(cons, True)          # el pricer les agrega columnas
         pricer=WavePricer(self,pack)
         m.includePricer(pricer,"WavePricer","",1,False)
 
         return pack
 
+    def _add_column(self, pack, a, orders, units):
+        """Columna (a, órdenes) en el problema original (fuera del pricer)."""
+        key=(a,frozenset(orders))
+        if key in pack["cols"]: return
+        m=pack["model"]
+        if not orders:                           # pasillo sin órdenes: la e{a} de siempre, no va al pool
+            v=m.addVar(vtype="B",obj=-pack["lam"],name=f"e{a}")
+            add_coef(m,pack["card"],v,1); pack["cols"][key]=v; return
+        cid=self.pool.add(a,orders,units)
+        v=m.addVar(vtype="B",obj=units-pack["lam"],name=f"c{cid}")
+        items,qty=self.pool.coverage(cid)
+        for i,q in zip(items.tolist(),qty.tolist()): add_coef(m,pack["cov"][i],v,q)
+        for cons in (pack["lb"],pack["ub"]): add_coef(m,cons,v,units)
+        add_coef(m,pack["card"],v,1)
+        for o in orders: add_coef(m,pack["order"][o],v,1)
+        pack["cols"][key]=v
+
+    def _warm_start(self, pack):
+        """La mejor ola vista llevada a k = pack["k"] pasillos (comun.arranque), con addSol."""
+        parts=columns_for_k(self.inst,self.warm,pack["k"])
+        if not parts: return False
+        m=pack["model"]; m.freeTransform(); self._forget_priced(pack)
+        sol=m.createSol()                        # lo que no se fija queda en 0
+        for a,orders,units in parts:
+            self._add_column(pack,a,sorted(orders),units)
+            m.setSolVal(sol,pack["cols"][(a,frozenset(orders))],1.0)
+        return m.addSol(sol,free=True)
+
+    def _forget_priced(self, pack):
+        """Las columnas del pricer no sobreviven a freeTransform: vuelven desde el pool."""
+        for key in pack["priced"]: pack["cols"].pop(key,None)
+        pack["priced"].clear()
+
     def _purge(self, pack, round_):
         if round_<self.PRUNE_WARMUP: return
         m=pack["model"]; gone=[]
-        for v in m.getVars():
-            if not v.name.startswith("col_"): continue
-            key=v.name
+        for key,v in pack["cols"].items():
+            if not isinstance(key[0],int) or key in pack["priced"]: continue
             if m.getVal(v)<1e-6: self.last_seen[key]+=1
             else: self.last_seen[key]=0
-            if self.last_seen[key]>=self.PRUNE_HORIZON: gone.append(v)
+            if self.last_seen[key]>=self.PRUNE_HORIZON: gone.append(key)
         if gone:
-            m.freeTransform()
-            for v in gone:
-                m.delVar(v); self.last_seen.pop(v.name,None)
+            m.freeTransform(); self._forget_priced(pack)
+            for key in gone:
+                m.delVar(pack["cols"].pop(key)); self.last_seen.pop(key,None)
 
-    def solve_for_k(self,k:int,tlim:float):
+    def solve_for_k(self,k:int,tlim:float,incumbent:float=None):
         pack=self.rmp_cache.setdefault(k,self._build_master(k))
         m=pack["model"]; start=time.time(); rounds=0
+        if incumbent is not None:
+            m.freeTransform(); self._forget_priced(pack)
+            m.setObjlimit(incumbent*k)     # sólo interesan olas mejores que la incumbente
+        self._warm_start(pack)
         while True:
             rounds+=1
             m.setParam("limits/time",max(0.01,tlim-(time.time()-start)))
@@ -238,7 +238,9 @@ class Solver:
             if ncols_after == ncols_before:
                 break
             if time.time()-start>0.9*tlim: break
-        return self._extract(pack)
+        sol=self._extract(pack)
+        if sol and (self.warm is None or sol["obj"]>self.warm["obj"]): self.warm=sol
+        return sol
 
     def _ucb(self, k):
         s=self.k_stats[k]
@@ -247,8 +249,10 @@ class Solver:
         return s["best"]+C*math.sqrt(math.log(tot)/s["trials"])
 
     def solve(self,tlimit:float):
+        if self.explore_workers>1:
+            return self.solve_parallel(tlimit)
         start=time.time(); best=None; best_val=-1e18
-        k_list=list(range(1,self.A+1))
+        k_list=self.kbounds.prune(range(1,self.A+1),float("-inf"))   # infactibles por stock
         while k_list and time.time()-start<tlimit:
             k_list.sort(key=self._ucb,reverse=True)
             k=k_list.pop(0)
@@ -258,21 +262,67 @@ class Solver:
             if sol: st["best"]=max(st["best"],sol["obj"])
             if sol and sol["obj"]>best_val:
                 best_val=sol["obj"]; best=sol
+                k_list=self.kbounds.prune(k_list,best_val)
+        return best
+
+    def solve_parallel(self,tlimit:float):
+        """Los k en procesos aparte, con la incumbente compartida."""
+        k_list=self.kbounds.prune(range(1,self.A+1),float("-inf"))
+        k_list.sort(key=lambda k:-self.kbounds.bound[k])
+        args=(self.fname,self.engine.name,1)
+        best,st=explore_parallel(type(self),args,"solve_for_k",k_list,tlimit,self.explore_workers)
+        self.kbounds.pruned+=st["pruned"]
+        self.par_metrics=st["metrics"]      # los RMP quedaron en los workers
+        return best
+
+    def k_metrics(self, k):
+        """Restricciones, variables y columnas registradas del RMP(k), o None."""
+        pack=self.rmp_cache.get(k)
+        if pack is None: return None
+        mdl=pack["model"]
+        return {"conss":len(mdl.getConss()),"vars":len(mdl.getVars()),"cols":len(pack["cols"])}
+
+    def _set_lambda(self, pack, lam):
+        """
+        Objetivo Σ (unidades_c - λ) x_c.  Las columnas del pricer no
+        sobreviven a freeTransform: se olvidan y vuelven desde el pool.
+        """
+        m=pack["model"]; m.freeTransform(); self._forget_priced(pack)
+        obj=[]
+        for (a,orders),v in pack["cols"].items():
+            if isinstance(a,int): obj.append((self.inst.units_of(orders)-lam)*v)
+            else:                 obj.append(v.getObj()*v)      # dummy / slack
+        m.setObjective(quicksum(obj),"maximize")
+        pack["lam"]=lam
+
+    def solve_dinkelbach(self, tlimit: float, tol: float = 1e-4):
+        """Un único RMP con k libre en [1, A]; Dinkelbach mueve λ."""
+        pack=self._build_master(1); m=pack["model"]
+        m.chgLhs(pack["card"],1); m.chgRhs(pack["card"],self.A)
+        m.chgVarUb(pack["cols"][("slack",frozenset())],0)   # con k libre no hay excusa para violar LB
+        self.rmp_cache[0]=pack                              # k = 0: el RMP paramétrico
+
+        def solve(lam, rem):
+            self._set_lambda(pack,lam)
+            m.setParam("limits/time",max(0.01,rem))
+            m.optimize()
+            return self._extract(pack)
+
+        best, self.lambda_traj = dinkelbach(solve, tlimit, tol=tol)
         return best
 
     def _extract(self,pack):
         m=pack["model"]
         if m.getStatus()!="optimal": return None
-        for v in m.getVars():
-            if v.name.startswith(("dummy","slack")) and m.getVal(v)>1e-6:
-                return None
         ais=set(); ords=set()
-        for v in m.getVars():
-            if v.name.startswith("col_") and m.getVal(v)>0.5:
-                parts=v.name.split("_"); ais.add(int(parts[1]))
-                ords.update(int(x) for x in parts[2:])
+        for (a,orders),v in pack["cols"].items():     # sólo columnas registradas
+            val=m.getVal(v)
+            if not isinstance(a,int):
+                if val>1e-6: return None               # dummy o slack activos
+            elif val>0.5:
+                ais.add(a); ords.update(orders)
         if not ords: return None
-        units=sum(sum(self.demand[o]) for o in ords)
+        units=self.inst.units_of(ords)
         if units<self.LB or units>self.UB: return None
         return {"obj":units/len(ais),"units":units,
                 "aisles":sorted(ais),"orders":sorted(ords)}
@@ -284,23 +334,26 @@ def main(argv):
     inst = argv[1]
     tlim = float(argv[2]) if len(argv)>2 else 300
     start  = time.time()
-    solver=Solver(inst)
-    best = solver.solve(tlim)
+    solver=Solver(inst, workers=default_workers(),
+                  explore_workers=default_explore_workers())
+    if os.environ.get("SOLVE_MODE") == "dinkelbach":
+        best = solver.solve_dinkelbach(tlim)
+    else:
+        best = solver.solve(tlim)
     elapsed  = time.time() - start
+    best = solver.red.to_original(best)          # índices de la instancia original
     if len(sys.argv) > 3: 
         out_file = sys.argv[3]
         with open(out_file, "w") as f:
-            json.dump(best, f)
-    if best:
-        k_best = len(best["aisles"])
-        pack   = solver.rmp_cache[k_best]
-        mdl    = pack["model"]
-        total_c = len(mdl.getConss())
-        total_v = len(mdl.getVars())
-    else:
-        total_c = total_v = 0
-
-    rmp_v = sum(len(p["cols"]) for p in solver.rmp_cache.values())
+            json.dump(best, f, default=sorted)   # sets → listas
+    # en paralelo los números vienen de los workers; sin modelo, NA
+    mets = solver.par_metrics
+    if mets is None:
+        mets = {k: solver.k_metrics(k) for k in solver.rmp_cache}
+    mt = (mets.get(len(best["aisles"])) or mets.get(0)) if best else None
+    total_c = mt["conss"] if mt else "NA"
+    total_v = mt["vars"]  if mt else "NA"
+    rmp_v   = sum(m["cols"] for m in mets.values()) if mets else "NA"
 
 
     print(f"METRICS inst={os.path.basename(inst)} "
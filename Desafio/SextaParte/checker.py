@@ -1,38 +1,21 @@
+import os, sys
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from comun.instancia import load_instance
+from comun.verificador import check, check_dir, write_report
+
 class WaveOrderPicking:
     def __init__(self):
-        self.orders = None
-        self.aisles = None
+        self.inst = None
         self.wave_size_lb = None
         self.wave_size_ub = None
 
     def read_input(self, input_file_path):
-        with open(input_file_path, 'r') as file:
-            lines = file.readlines()
-            first_line = lines[0].strip().split()
-            o, i, a = int(first_line[0]), int(first_line[1]), int(first_line[2])
-
-            # Read orders
-            self.orders = []
-            for j in range(o):
-                order_line = lines[j + 1].strip().split()
-                d = int(order_line[0])
-                order_map = {int(order_line[2 * k + 1]): int(order_line[2 * k + 2]) for k in range(d)}
-                self.orders.append(order_map)
-
-            # Read aisles
-            self.aisles = []
-            for j in range(a):
-                aisle_line = lines[j + o + 1].strip().split()
-                d = int(aisle_line[0])
-                aisle_map = {int(aisle_line[2 * k + 1]): int(aisle_line[2 * k + 2]) for k in range(d)}
-                self.aisles.append(aisle_map)
-
-            # Read wave size bounds
-            bounds = lines[o + a + 1].strip().split()
-            self.wave_size_lb = int(bounds[0])
-            self.wave_size_ub = int(bounds[1])
+        # demanda y stock en CSR (comun.instancia), no en dicts por orden/pasillo
+        self.inst = load_instance(input_file_path)
+        self.wave_size_lb = self.inst.LB
+        self.wave_size_ub = self.inst.UB
 
     def read_output(self, output_file_path):
         with open(output_file_path, 'r') as file:
@@ -46,55 +29,41 @@ class WaveOrderPicking:
         visited_aisles = list(set(visited_aisles))
         return selected_orders, visited_aisles
 
-    def is_solution_feasible(self, selected_orders, visited_aisles):
-        total_units_picked = 0
-        for order in selected_orders:
-            total_units_picked += np.sum(list(self.orders[order].values()))
-
-        # Check if total units picked are within bounds
-        if not (self.wave_size_lb <= total_units_picked <= self.wave_size_ub):
-            return False
+    def check(self, selected_orders, visited_aisles):
+        # demanda = Dᵀx y stock = Sᵀy: dos productos ralos (comun.verificador)
+        return check(self.inst, selected_orders, visited_aisles)
 
-        # Compute all items that are required by the selected orders
-        required_items = set()
-        for order in selected_orders:
-            required_items.update(self.orders[order].keys())
-
-        # Check if all required items are available in the visited aisles
-        for item in required_items:
-            total_required = sum(self.orders[order].get(item, 0) for order in selected_orders)
-            total_available = sum(self.aisles[aisle].get(item, 0) for aisle in visited_aisles)
-            if total_required > total_available:
-                return False
-
-        return True
+    def is_solution_feasible(self, selected_orders, visited_aisles):
+        return self.check(selected_orders, visited_aisles)["feasible"]
 
     def compute_objective_function(self, selected_orders, visited_aisles):
-        total_units_picked = 0
-
-        # Calculate total units picked
-        for order in selected_orders:
-            total_units_picked += np.sum(list(self.orders[order].values()))
-
-        # Calculate the number of visited aisles
-        num_visited_aisles = len(visited_aisles)
-
         # Objective function: total units picked / number of visited aisles
-        return total_units_picked / num_visited_aisles
+        total_units_picked = int(self.inst.units[np.asarray(list(selected_orders), dtype=np.int64)].sum())
+        return total_units_picked / len(visited_aisles)
 
 if __name__ == "__main__":
-    import sys
+    if len(sys.argv) >= 4 and sys.argv[1] == "--batch":
+        # python checker.py --batch <out_dir> <datasets_dir> [reporte.json|.csv]
+        out_dir, data_dir = sys.argv[2], sys.argv[3]
+        report = sys.argv[4] if len(sys.argv) > 4 else os.path.join(out_dir, "check.json")
+        rows = check_dir(out_dir, data_dir)
+        write_report(rows, report)
+        print(f"[check] {sum(r['feasible'] for r in rows)}/{len(rows)} factibles -> {report}")
+        sys.exit(0)
+
     if len(sys.argv) != 3:
         print("Usage: python checker.py <input_file> <output_file>")
+        print("       python checker.py --batch <out_dir> <datasets_dir> [report.json|report.csv]")
         sys.exit(1)
 
     wave_order_picking = WaveOrderPicking()
     wave_order_picking.read_input(sys.argv[1])
     selected_orders, visited_aisles = wave_order_picking.read_output(sys.argv[2])
 
-    is_feasible = wave_order_picking.is_solution_feasible(selected_orders, visited_aisles)
-    objective_value = wave_order_picking.compute_objective_function(selected_orders, visited_aisles)
+    res = wave_order_picking.check(selected_orders, visited_aisles)
 
-    print("Is solution feasible:", is_feasible)
-    if is_feasible:
-        print("Objective function value:", objective_value)
\ No newline at end of file
+    print("Is solution feasible:", res["feasible"])
+    if res["feasible"]:
+        print("Objective function value:", res["obj"])
+    else:
+        print("Reason:", res["reason"])
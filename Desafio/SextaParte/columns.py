@@ -8,7 +8,24 @@ Resuelve el “wave picking” con:
 """
 
 import sys, time, os, json, math
-from pyscipopt import Model, quicksum
+import numpy as np
+from pyscipopt import Model, Pricer, quicksum, SCIP_PARAMSETTING, SCIP_RESULT
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from comun.presolve import load_reduced
+from comun.candidatos import candidate_index
+from comun.dominancia import aisle_dominance
+from comun.knapsack import make_engine
+from comun.pricing import reduced_costs, price_column, default_cols_per_aisle
+from comun.paralelo import AislePricer, default_workers
+from comun.pool import ColumnPool
+from comun.dinkelbach import dinkelbach
+from comun.cotas import KBounds
+from comun.exploracion import explore_parallel, default_explore_workers
+from comun.busqueda_local import local_search
+from comun.lns import lns
+from comun.arranque import columns_for_k
+from comun.semillas import seed_columns
 
 def add_coef(model, cons, var, coef):
     if hasattr(model, "addCoefLinear"):
@@ -18,110 +35,141 @@ def add_coef(model, cons, var, coef):
 
 def get_dual(model, cons):
     try:
-        return (model.getDualsolLinear(cons)
-                if hasattr(model, "getDualsolLinear")
-                else model.getDual(cons))
+        d = (model.getDualsolLinear(cons)
+             if hasattr(model, "getDualsolLinear")
+             else model.getDual(cons))
     except Exception:
         return 0.0                   # fila eliminada en presolve
+    # SCIP da los duales del problema transformado, que siempre minimiza:
+    # en un problema de máximo vienen con el signo cambiado
+    return -d if model.getObjectiveSense() == "maximize" else d
+
+
+class RoundPricer(Pricer):
+    """
+    Column generation del RMP relajado dentro de SCIP: cada llamada a
+    pricerredcost es una ronda.  Las columnas entran con addVar(pricedVar)
+    al problema transformado, así SCIP re-optimiza el LP desde la base
+    anterior en vez de liberar el modelo y arrancar de cero.  Como esas
+    variables mueren con freeTransform, quedan anotadas en pack["new"] y
+    se agregan al modelo original de una sola vez al terminar.
+    """
+
+    def __init__(self, solver, pack):
+        super().__init__()
+        self.solver, self.pack = solver, pack
+        self.active   = True
+        self.deadline = float("inf")
+        self.timed_out = False               # cortó por tiempo: el LP no es cota
+
+    def pricerinitsol(self):
+        m, pack = self.model, self.pack
+        names = ("cov", "order_cons")
+        self.t = {n: {j: m.getTransformedCons(c) for j, c in pack[n].items()} for n in names}
+        self.t.update({n: m.getTransformedCons(pack[n]) for n in ("lb", "ub", "card")})
+        self.mark = time.time()
+
+    def pricerredcost(self):
+        m, pack, s = self.model, self.pack, self.solver
+        if not self.active:                      # fase entera: sin pricing
+            return {"result": SCIP_RESULT.SUCCESS}
+        now = time.time()
+        s.cg_stats["rmp_time"] += now - self.mark
+        s.cg_stats["rounds"]   += 1
+        if now >= self.deadline:
+            self.timed_out = True
+            return {"result": SCIP_RESULT.SUCCESS}
+
+        dual_cov = [get_dual(m, pack["cov"][i]) for i in range(s.I)]
+        dual_lb  = get_dual(m, pack["lb"])
+        dual_ub  = get_dual(m, pack["ub"])
+        dual_k   = get_dual(m, pack["card"])
+        dual_order = [get_dual(m, pack["order_cons"][o]) for o in range(s.O)]
+        rc = reduced_costs(s.inst, dual_cov, dual_lb, dual_ub, dual_order)
+
+        t = self.t
+        for a, sel, units, red in s._price_round(pack, rc, dual_k):
+            key = (a, frozenset(sel))
+            cid = s.pool.add(a, sel, units)
+            v = m.addVar(vtype="C", ub=1, obj=-(units - pack["lam"]),   # objetivo transformado (min)
+                         pricedVar=True, name=f"c{cid}")
+            items, qty = s.pool.coverage(cid)
+            for i, q in zip(items.tolist(), qty.tolist()):
+                add_coef(m, t["cov"][i], v, q)
+            add_coef(m, t["lb"],   v, units)
+            add_coef(m, t["ub"],   v, units)
+            add_coef(m, t["card"], v, 1)
+            for o in sel:
+                add_coef(m, t["order_cons"][o], v, 1)
+            pack["new"][key] = units
+        self.mark = time.time()
+        return {"result": SCIP_RESULT.SUCCESS}
+
+    def pricerfarkas(self):
+        # sin pricing de Farkas: un RMP infactible se da por infactible (como
+        # en el loop con el RMP entero)
+        return {"result": SCIP_RESULT.SUCCESS}
 
 
-# lectura de instancia
-def read_instance(fname):
-    with open(fname) as f:
-        O, I, A = map(int, f.readline().split())
-        demand = [[0]*I for _ in range(O)]
-        for o in range(O):
-            k, *pairs = map(int, f.readline().split())
-            for j in range(0, 2*k, 2):
-                i, q = pairs[j], pairs[j+1]
-                demand[o][i] = q
-        supply = [[0]*I for _ in range(A)]
-        for a in range(A):
-            l, *pairs = map(int, f.readline().split())
-            for j in range(0, 2*l, 2):
-                i, q = pairs[j], pairs[j+1]
-                supply[a][i] = q
-        LB, UB = map(int, f.readline().split())
-    return O, I, A, demand, supply, LB, UB
-
-
-# pricing
-def price_column(a, dual_cov, dual_lb, dual_ub, dual_k, dual_order, 
-                 demand, supply, LB, UB):
-    O = len(demand)
-    I = len(supply[0])
-    units_o = [sum(demand[o]) for o in range(O)] #u_o
-
-    price_o = []
-    for o in range(O):
-        rc_part  = units_o[o] # + u_o
-        rc_part -= sum(dual_cov[i]*demand[o][i] for i in range(I)) #  -π_i d_oi
-        rc_part -= units_o[o]*dual_lb #  -λ u_o
-        rc_part -= units_o[o]*dual_ub #  -μ u_o
-        rc_part -= dual_order[o]
-        price_o.append(rc_part)
-    CAP = 1e+09
-    for o in range(O):
-        if not math.isfinite(price_o[o]):
-            price_o[o] = CAP if price_o[o] > 0 else -CAP
-        elif price_o[o] >  CAP:
-            price_o[o] =  CAP
-        elif price_o[o] < -CAP:
-            price_o[o] = -CAP
-
-    knap = Model(f"pricing_{a}")
-    z = {o: knap.addVar(vtype="B", obj=price_o[o]) for o in range(O)}
-
-    for i in range(I):
-        knap.addCons(quicksum(demand[o][i] * z[o] for o in range(O))
-                     <= supply[a][i])
-    tot = quicksum(units_o[o] * z[o] for o in range(O))
-    knap.addCons(tot >= LB)
-    knap.addCons(tot <= UB)
-
-    try: knap.hideOutput()
-    except AttributeError: knap.setParam("display/verblevel", 0)
-
-    knap.optimize()
-    if knap.getStatus() != "optimal":
-        return None
-
-    rc = knap.getObjVal() - dual_k
-    if rc <= 1e-6:
-        return None
-    sel   = [o for o in z if knap.getVal(z[o]) > 0.5]
-    units = sum(units_o[o] for o in sel)
-    print(f"------------------------------------[pricing] a={a:3d}  rc={rc:6.2f}  units={units:3d}  sel={sel}------------------------------------", flush=True)
-    return sel, units, rc
-
 class Columns:
-    def __init__(self, fname):
-        (self.O, self.I, self.A,
-         self.demand, self.supply,
-         self.LB, self.UB) = read_instance(fname)
+    def __init__(self, fname, pricing="bb", workers=1, relax=True, explore_workers=1):
+        self.fname = fname
+        self.inst, self.red = load_reduced(fname)   # red: mapas a la instancia original
+        self.O, self.I, self.A = self.inst.O, self.inst.I, self.inst.A
+        self.LB, self.UB       = self.inst.LB, self.inst.UB
+        self.engine = make_engine(pricing)   # "bb" o "scip" (comun/knapsack.py)
+        self.cand   = candidate_index(self.inst)
+        # sólo se pricean los pasillos no dominados; los idénticos no llevan semilla
+        self.dominance = aisle_dominance(self.inst)
+        self.price_aisles = self.dominance.pricing_aisles().tolist()
+        print(self.dominance.summary())
+        self.pricer = AislePricer(self.inst, self.engine, workers)  # pool si workers > 1
+        self.cols_per_aisle = default_cols_per_aisle()   # columnas por pasillo y ronda
+        # relax=True: el RMP es un LP mientras se generan columnas (duales de
+        # LP de verdad) y la integralidad se impone sólo al final
+        self.relax  = relax
+        self.vtype  = "C" if relax else "B"
         self.rmp_cache = {}          # un modelo por valor de k
+        self.cg_stats  = {"rounds": 0, "rmp_time": 0.0,   # resoluciones del RMP y su tiempo total
+                          "pricing": 0, "pool": 0}         # rondas de knapsack / columnas sacadas del pool
+        self.pool      = ColumnPool(self.inst)   # columnas vistas en cualquier k (y su registro)
+        self.lambda_traj = []                # (it, λ, F(λ), cociente) de Opt_Dinkelbach
+        self.kbounds   = KBounds(self.inst)  # cotas por k para descartar sin resolver
+        self.k_stats   = {"solved": 0, "time": 0.0}
+        self.explore_workers = explore_workers   # > 1: cada k en un proceso aparte
+        self.warm      = None                # mejor ola vista: arranque en caliente de cada k
         self.best_sol  = None
 
-    # ---------------- patrón semilla max por pasillo -------------------------
-    def _greedy_pattern(self, a):
-        units_o = [(o, sum(self.demand[o])) for o in range(self.O)]
-        units_o.sort(key=lambda t: -t[1])
-        cap = self.supply[a][:]
-        sel, tot = [], 0
-        for o, u in units_o:
-            if tot + u > self.UB:
-                continue
-            if all(self.demand[o][i] <= cap[i] for i in range(self.I)):
-                sel.append(o); tot += u
-                for i in range(self.I):
-                    cap[i] -= self.demand[o][i]
-            if tot == self.UB:
-                break
-        return sel, tot
+    # ---------------- columnas semilla -----------------------------------
+    def _seed_columns(self):
+        """
+        [(órdenes, unidades), ...] por pasillo: el greedy por unidades de
+        comun.semillas, calculado una vez por instancia y reusado en todos
+        los RMP.  Los idénticos a otro de menor índice no llevan semilla.
+        """
+        seeds = seed_columns(self.inst, "units")
+        rep = self.dominance.rep
+        return [seeds[a] if rep[a] == a else [] for a in range(self.A)]
+
+    def _setup_master(self, m):
+        if self.relax:                # sin presolve las filas del LP quedan y sus duales valen
+            m.setPresolve(SCIP_PARAMSETTING.OFF)
+
+    def _set_vtype(self, pack, vtype):
+        """Pasa todas las columnas del RMP a continuas ("C") o binarias ("B")."""
+        if pack["vtype"] == vtype:
+            return
+        m = pack["model"]
+        m.freeTransform()
+        for v in pack["cols"].values():
+            m.chgVarType(v, vtype)
+        m.setPresolve(SCIP_PARAMSETTING.OFF if vtype == "C" else SCIP_PARAMSETTING.DEFAULT)
+        pack["vtype"] = vtype
 
     #RMP(k) inicial
     def _build_rmp(self, k):
         m = Model(f"RMP_k{k}")
+        self._setup_master(m)
         try:
             m.hideOutput()
         except AttributeError:
@@ -142,41 +190,42 @@ class Columns:
         cols = {}
 
         # dummy único (factibiliza Σx=k y LB/UB)
-        dummy = m.addVar(vtype="B", obj=-1e6, name="dummy")
+        dummy = m.addVar(vtype=self.vtype, ub=1, obj=-1e6, name="dummy")
         add_coef(m, lb,   dummy, self.LB)
         add_coef(m, ub,   dummy, self.LB)
         add_coef(m, card, dummy, 1)
         cols[("dummy", frozenset())] = dummy
 
         # slack global
-        slack = m.addVar(vtype="B", obj=-1e-3, name="slack")
+        slack = m.addVar(vtype=self.vtype, ub=1, obj=-1e-3, name="slack")
         add_coef(m, lb,  slack, self.LB)
         add_coef(m, ub,  slack, self.LB)
         cols[("slack", frozenset())] = slack
 
-        # una columna semilla por pasillo
+        # columnas semilla de cada pasillo
+        seeds = self._seed_columns()
         for a in range(self.A):
-            orders, units = self._greedy_pattern(a)
-            if not orders:                       # columna "vacía" suave
-                v = m.addVar(vtype="B", obj=0, name=f"col_{a}_0")
+            if not seeds[a]:                     # columna "vacía" suave
+                v = m.addVar(vtype=self.vtype, ub=1, obj=0, name=f"e{a}")
                 add_coef(m, card, v, 1)
                 cols[(a, frozenset())] = v
                 continue
 
-            vname = f"col_{a}_" + "_".join(map(str, orders))
-            v = m.addVar(vtype="B", obj=units, name=vname)
-            for i in range(self.I):
-                q = sum(self.demand[o][i] for o in orders)
-                if q: add_coef(m, cov[i], v, q)
-            add_coef(m, lb,   v, units)
-            add_coef(m, ub,   v, units)
-            add_coef(m, card, v, 1)
-            for o in orders:
-                add_coef(m, order_cons[o], v, 1) 
-            cols[(a, frozenset(orders))] = v
+            for orders, units in seeds[a]:
+                cid = self.pool.add(a, orders, units)
+                v = m.addVar(vtype=self.vtype, ub=1, obj=units, name=f"c{cid}")
+                items, qty = self.pool.coverage(cid)
+                for i, q in zip(items.tolist(), qty.tolist()):
+                    add_coef(m, cov[i], v, q)
+                add_coef(m, lb,   v, units)
+                add_coef(m, ub,   v, units)
+                add_coef(m, card, v, 1)
+                for o in orders:
+                    add_coef(m, order_cons[o], v, 1)
+                cols[(a, frozenset(orders))] = v
         # m.writeProblem(f"rmp_k{k}_init.lp")
-        return {"model": m, "cols": cols, "cov": cov,
-                "lb": lb, "ub": ub, "card": card,  "order_cons": order_cons}
+        return {"model": m, "cols": cols, "cov": cov, "vtype": self.vtype, "lam": 0.0,
+                "lb": lb, "ub": ub, "card": card,  "order_cons": order_cons, "k": k}
 
     #añade columna nueva ----------------------------
     def _add_column(self, pack, a, orders, units):
@@ -184,11 +233,16 @@ class Columns:
         if key in pack["cols"]:
             return
         m = pack["model"]
-        v = m.addVar(vtype="B", obj=units,
-                     name=f"col_{a}_" + "_".join(map(str, orders)))
-        for i in range(self.I):
-            q = sum(self.demand[o][i] for o in orders)
-            if q: add_coef(m, pack["cov"][i], v, q)
+        if not orders:                           # pasillo sin órdenes: la e{a} de siempre, no va al pool
+            v = m.addVar(vtype=pack["vtype"], ub=1, obj=-pack["lam"], name=f"e{a}")
+            add_coef(m, pack["card"], v, 1)
+            pack["cols"][key] = v
+            return
+        cid = self.pool.add(a, orders, units)
+        v = m.addVar(vtype=pack["vtype"], ub=1, obj=units - pack["lam"], name=f"c{cid}")
+        items, qty = self.pool.coverage(cid)
+        for i, q in zip(items.tolist(), qty.tolist()):
+            add_coef(m, pack["cov"][i], v, q)
         add_coef(m, pack["lb"],   v, units)
         add_coef(m, pack["ub"],   v, units)
         add_coef(m, pack["card"], v, 1)
@@ -196,17 +250,133 @@ class Columns:
             add_coef(m, pack["order_cons"][o], v, 1)
         pack["cols"][key] = v
 
+    def _warm_start(self, pack):
+        """
+        Pasa a SCIP (addSol) la mejor ola vista llevada a k = pack["k"]
+        pasillos (comun.arranque); las columnas que falten se agregan.
+        """
+        parts = columns_for_k(self.inst, self.warm, pack["k"])
+        if not parts:
+            return False
+        m = pack["model"]
+        m.freeTransform()
+        keys = []
+        for a, orders, units in parts:
+            self._add_column(pack, a, sorted(orders), units)
+            keys.append((a, frozenset(orders)))
+        sol = m.createSol()                      # lo que no se fija queda en 0
+        for key in keys:
+            m.setSolVal(sol, pack["cols"][key], 1.0)
+        return m.addSol(sol, free=True)
+
+    def _update_warm(self, sol):
+        if sol and (self.warm is None or sol["obj"] > self.warm["obj"]):
+            self.warm = sol
+
+    POOL_SEED = 50           # máx. columnas del pool por ronda
+
+    def _price_round(self, pack, rc, dual_k):
+        """
+        Columnas nuevas para el RMP de pack con los duales de la ronda:
+        primero las del pool con costo reducido positivo (ya vistas en
+        otros k); si no hay ninguna, knapsack por pasillo.
+        Devuelve [(a, órdenes, unidades, costo reducido)].
+        """
+        dual_k = dual_k + pack["lam"]             # con Dinkelbach cada columna paga λ
+        taken = pack["cols"].keys() | pack.get("new", {}).keys()
+        found = self.pool.best(rc, dual_k, skip=taken, limit=self.POOL_SEED)
+        tag = "pool"
+        if found:
+            self.cg_stats["pool"] += len(found)
+        else:
+            tag = "pricing"
+            self.cg_stats["pricing"] += 1
+            found = [(a, sel, units, red) for a, (sel, units, red) in self.pricer.price(rc, dual_k, self.price_aisles, self.cols_per_aisle)
+                     if (a, frozenset(sel)) not in taken]
+            for a, sel, units, red in found:
+                self.pool.add(a, sel, units)
+        for a, sel, units, red in found:
+            print(f"------------------------------------[{tag}] a={a:3d}  rc={red:6.2f}  units={units:3d}  sel={sel}------------------------------------", flush=True)
+        return found
+
+    def _attach_pricer(self, pack):
+        """Engancha un RoundPricer al RMP (filas modificables, una vez por modelo)."""
+        m = pack["model"]
+        for cons in [*pack["cov"].values(), *pack["order_cons"].values(),
+                     pack["lb"], pack["ub"], pack["card"]]:
+            m.setModifiable(cons, True)
+        pack["pricer"] = RoundPricer(self, pack)
+        pack["new"]    = {}
+        m.includePricer(pack["pricer"], "RoundPricer", "", 1, False)
+
     #RMP(k) con column generation --------------------
-    def Opt_cantidadPasillosFija(self, k, umbral):
+    def Opt_cantidadPasillosFija(self, k, umbral, incumbent=None):
+        """
+        Con ``incumbent`` (cociente) se saltea la fase entera si la cota LP
+        de RMP(k) muestra que k no puede superarla.
+        """
         if k not in self.rmp_cache:
             self.rmp_cache[k] = self._build_rmp(k)
-        pack = self.rmp_cache[k];  m = pack["model"]
+        pack = self.rmp_cache[k]
+        cutoff = None if incumbent is None else incumbent * k
+        sol = self._solve_pack(pack, umbral, cutoff)
+        if pack.get("lp") is not None:
+            self.kbounds.lp(k, pack["lp"])
+        self._update_warm(sol)
+        return sol
+
+    def _solve_pack(self, pack, umbral, cutoff=None):
+        """CG sobre el RMP de pack y fase entera; devuelve la ola o None."""
+        m = pack["model"]
+        self._set_vtype(pack, self.vtype)        # por si quedó entero de una llamada previa
 
-        start = time.time(); rounds = 0
+        start = time.time()
+        if self.relax:
+            self._cg_relaxed(pack, start + 0.8*umbral)
+            if cutoff is not None and pack["lp"] is not None and pack["lp"] <= cutoff + 1e-9:
+                self._last_model = m             # la fase entera no puede mejorar
+                return None
+            # fase entera: RMP restringido con las columnas generadas
+            # (price-and-branch sin más pricing), con lo que queda de tiempo
+            self._set_vtype(pack, "B")
+            self._warm_start(pack)
+            m.setParam("limits/time", max(0.1, umbral - (time.time() - start)))
+            m.optimize()
+        else:
+            self._warm_start(pack)
+            self._cg_rounds(pack, start, umbral)
+        self._last_model = pack["model"]
+        return self._extract(pack)
+
+    def _cg_relaxed(self, pack, deadline):
+        """Un solo optimize: el RoundPricer hace las rondas sobre el mismo LP."""
+        m = pack["model"]
+        if "pricer" not in pack:
+            self._attach_pricer(pack)
+        pr = pack["pricer"]
+        pr.active, pr.deadline, pr.timed_out = True, deadline, False
+        m.setParam("limits/time", max(0.01, deadline - time.time()))
+        m.optimize()
+        pr.active = False
+        # valor del LP: cota de RMP(k) sólo si el pricing terminó solo
+        done = m.getStatus() == "optimal" and not pr.timed_out
+        pack["lp"] = m.getObjVal() if done else None
+        # las columnas del problema transformado pasan al original, en lote
+        m.freeTransform()
+        for (a, orders), units in pack["new"].items():
+            self._add_column(pack, a, sorted(orders), units)
+        pack["new"].clear()
+
+    def _cg_rounds(self, pack, start, umbral):
+        """CG con el RMP entero: un optimize por ronda, columnas en lote."""
+        m = pack["model"]
         while True:
             rem = max(0.01, umbral - (time.time() - start))
             m.setParam("limits/time", rem)
+            tic = time.time()
             m.optimize()
+            self.cg_stats["rmp_time"] += time.time() - tic
+            self.cg_stats["rounds"]   += 1
             if m.getStatus() != "optimal":
                 break
 
@@ -215,25 +385,16 @@ class Columns:
             dual_ub  = get_dual(m, pack["ub"])
             dual_k   = get_dual(m, pack["card"])
             dual_order = [get_dual(m, pack["order_cons"][o]) for o in range(self.O)]
-            any_new = False
-            for a in range(self.A):
-                priced = price_column(a, dual_cov, dual_lb, dual_ub, dual_k, dual_order,
-                                      self.demand, self.supply,
-                                      self.LB, self.UB)
-                if priced:
-                    sel, units, _ = priced
-                    m.freeTransform() 
-                    self._add_column(pack, a, sel, units)
-                    any_new = True
-            if not any_new:
+            rc = reduced_costs(self.inst, dual_cov, dual_lb, dual_ub, dual_order)
+            found = self._price_round(pack, rc, dual_k)
+            if not found:
                 break
-              
+            m.freeTransform()                    # una vez por ronda, no por columna
+            for a, sel, units, red in found:
+                self._add_column(pack, a, sel, units)
 
-            rounds += 1
             if (time.time()-start) >= 0.8*umbral:
                 break
-        self._last_model = pack["model"]
-        return self._extract(pack)
 
     # ---------------------------------------------------------------------
     def Opt_PasillosFijos(self, pasillos, umbral):
@@ -245,10 +406,10 @@ class Columns:
         # ---- crea un RMP nuevo desde cero -------------
         pack = self._build_rmp(k)                 # modelo limpio
         m    = pack["model"]
+        self._set_vtype(pack, "B")
         
-        for v in m.getVars():
-            if v.name.startswith(("slack", "dummy")):
-                m.chgVarUb(v, 0.0)
+        for key in (("slack", frozenset()), ("dummy", frozenset())):
+            m.chgVarUb(pack["cols"][key], 0.0)
 
         # fija bounds antes de transformar
         for a in range(self.A):
@@ -265,16 +426,32 @@ class Columns:
         self._last_model = pack["model"]
         return self._extract(pack)
 
+    def _pulir(self, sol, rem, deadline):
+        """
+        Opt_PasillosFijos sobre los pasillos de sol y, con lo que sobre hasta
+        deadline, búsqueda local (comun.busqueda_local) sobre la ola.
+        """
+        fixed = self.Opt_PasillosFijos(sol["aisles"], rem)
+        if fixed and fixed["obj"] >= sol["obj"]:
+            sol = fixed
+        return local_search(self.inst, sol, deadline)
+
     # ---------------------------------------------------------------------
     def Opt_ExplorarCantidadPasillos(self, umbral):
+        if self.explore_workers > 1:
+            return self._explorar_paralelo(umbral)
         start = time.time()
         best_val = float("-inf"); best_sol = None
-        k_list = list(range(1, self.A+1))
+        bounds = self.kbounds
+        k_list = bounds.prune(range(1, self.A+1), float("-inf"))   # infactibles por stock
 
         while k_list and (time.time()-start) < umbral:
             k = k_list.pop(0)
             rem = umbral - (time.time()-start)
-            sol = self.Opt_cantidadPasillosFija(k, rem)
+            tic = time.time()
+            sol = self.Opt_cantidadPasillosFija(k, rem, best_val if best_sol else None)
+            self.k_stats["solved"] += 1
+            self.k_stats["time"]   += time.time() - tic
 
             if sol and (best_sol is None or sol["obj"] > best_val or
                          (sol["obj"] == best_val and
@@ -282,16 +459,84 @@ class Columns:
                 best_val = sol["obj"]; best_sol = sol
 
             if best_sol:
-                k_list = self._rankear(k_list, best_sol["aisles"])
+                k_list = self._rankear(bounds.prune(k_list, best_val), best_sol["aisles"])
 
         if best_sol:
             rem = umbral - (time.time()-start)
             rem = max(rem, 0.1)
-            best_sol = self.Opt_PasillosFijos(best_sol["aisles"], rem)
+            best_sol = self._pulir(best_sol, rem, start + umbral)
+
+        self.best_sol = best_sol
+        return best_sol
+
+    def _explorar_paralelo(self, umbral):
+        """Los k se resuelven en procesos con incumbente compartida; el pulido, acá."""
+        start  = time.time()
+        bounds = self.kbounds
+        k_list = bounds.prune(range(1, self.A+1), float("-inf"))
+        k_list.sort(key=lambda k: -bounds.bound[k])
+        # cada worker con pricing secuencial: los procesos ya son los k
+        args = (self.fname, self.engine.name, 1, self.relax)
+        best_sol, st = explore_parallel(type(self), args, "Opt_cantidadPasillosFija",
+                                        k_list, 0.9*umbral, self.explore_workers)
+        bounds.pruned += st["pruned"]
+        self.k_stats["solved"] += st["solved"]
+        self.k_stats["time"]   += st["time"]
+        for key, v in st["cg"].items():           # rondas / pricing / pool de los workers
+            self.cg_stats[key] += v
+
+        if best_sol:
+            rem = max(umbral - (time.time()-start), 0.1)
+            best_sol = self._pulir(best_sol, rem, start + umbral)
 
         self.best_sol = best_sol
         return best_sol
 
+    # ---------------------------------------------------------------------
+    def _set_lambda(self, pack, lam):
+        """Objetivo paramétrico Σ_c (u_c - λ)·x_c; dummy y slack no cambian."""
+        m = pack["model"]
+        m.freeTransform()
+        obj = [(self.inst.units_of(key[1]) - lam if isinstance(key[0], int) else v.getObj(), v)
+               for key, v in pack["cols"].items()]
+        m.setObjective(quicksum(c * v for c, v in obj), "maximize")
+        pack["lam"] = lam
+
+    def Opt_Dinkelbach(self, umbral, tol=1e-4):
+        """
+        Maximiza unidades/|pasillos| con Dinkelbach sobre un único RMP con
+        Σ x = k libre en [1, A]; las columnas y el pool se conservan entre
+        iteraciones y sólo cambia λ en el objetivo y en el pricing.
+        """
+        start = time.time()
+        pack = self._build_rmp(1)
+        m = pack["model"]
+        m.chgLhs(pack["card"], 1)
+        m.chgRhs(pack["card"], self.A)
+        # con k libre el slack sería una forma barata de violar LB: afuera
+        m.chgVarUb(pack["cols"][("slack", frozenset())], 0)
+
+        def solve(lam, rem):
+            self._set_lambda(pack, lam)
+            return self._solve_pack(pack, rem)
+
+        best, self.lambda_traj = dinkelbach(solve, 0.8*umbral, tol=tol)
+        if best:                                  # mismo pulido que la exploración por k
+            rem = max(umbral - (time.time()-start), 0.1)
+            best = self._pulir(best, rem, start + umbral)
+        self.best_sol = best
+        return best
+
+    def Opt_LNS(self, umbral, sol=None):
+        """
+        LNS sobre subproblemas de pasillos fijos (comun.lns) desde sol, o
+        desde una ola greedy si no hay; no arma ningún RMP.
+        """
+        start = time.time()
+        best = lns(self.inst, sol, start + umbral)
+        self.best_sol = best
+        return best
+
     def _rankear(self, k_list, best_aisles):
         """Ordena k_list según lo ‘prometedor’ que es cada k."""
         return sorted(k_list, key=lambda kk: abs(kk - len(best_aisles)))
@@ -299,27 +544,28 @@ class Columns:
     
     # ---------------------------------------------------------------------
     def _extract(self, pack):
-        """Devuelve la ola sólo si está libre de slack/dummy."""
+        """
+        Devuelve la ola sólo si está libre de slack/dummy.  Pasillo y órdenes
+        salen de las claves de pack["cols"]; sólo se leen esas variables.
+        """
         m = pack["model"]
         if m.getStatus() != "optimal":
             return None
 
-        #Si slack o dummy están activos, rechazamos la solución
-        for v in m.getVars():
-            if v.name.startswith(("slack", "dummy")) and m.getVal(v) > 1e-6:
-                return None                       # solución infactible real
-
         ais, ords = set(), set()
-        for v in m.getVars():
-            if m.getVal(v) > 0.5 and v.name.startswith("col_"):
-                p = v.name.split("_")
-                ais.add(int(p[1]))
-                ords.update(int(x) for x in p[2:])
+        for (a, orders), v in pack["cols"].items():
+            val = m.getVal(v)
+            if not isinstance(a, int):
+                if val > 1e-6:                    # slack o dummy activos:
+                    return None                   # solución infactible real
+            elif val > 0.5:
+                ais.add(a)
+                ords.update(orders)
 
         if not ords:
             return None
         
-        units = sum(sum(self.demand[o]) for o in ords)
+        units = self.inst.units_of(ords)
         if units < self.LB or units > self.UB:
             return None
         k     = len(ais) or 1
@@ -339,22 +585,43 @@ if __name__ == "__main__":
     umbral = int(sys.argv[2]) if len(sys.argv) > 2 else 30
     instance = sys.argv[1]
 
-    solver = Columns(instance)
+    solver = Columns(instance, workers=default_workers(),
+                     explore_workers=default_explore_workers())
     tic = time.time()
-    best = solver.Opt_ExplorarCantidadPasillos(umbral)
+    if os.environ.get("SOLVE_MODE") == "dinkelbach":
+        best = solver.Opt_Dinkelbach(umbral)
+    elif os.environ.get("SOLVE_MODE") == "lns":
+        best = solver.Opt_LNS(umbral)
+    else:
+        best = solver.Opt_ExplorarCantidadPasillos(umbral)
     elapsed  = time.time() - tic
+    best = solver.red.to_original(best)          # índices de la instancia original
     # print(json.dumps(best))
     if len(sys.argv) > 3: 
         out_file = sys.argv[3]
         with open(out_file, "w") as f:
-            json.dump(best, f)
-    m = solver._last_model
-    total_c  = m.getNConss()
-    total_v  = m.getNVars()
-    rmp_v    = sum(1 for v in m.getVars() if v.vtype() == "B")
-    dual_bd  = m.getDualbound()
+            json.dump(best, f, default=sorted)   # sets → listas
+    m = getattr(solver, "_last_model", None)   # en paralelo puede no haber modelo local
+    if m is not None:
+        total_c  = m.getNConss()
+        total_v  = m.getNVars()
+        rmp_v    = sum(1 for v in m.getVars() if v.vtype() == "B")
+        dual_bd  = int(m.getDualbound())
+    else:                                      # sin modelo local no hay números que dar
+        total_c = total_v = rmp_v = dual_bd = "NA"
+
+    rounds   = solver.cg_stats["rounds"]
+    rmp_ms   = 1e3 * solver.cg_stats["rmp_time"] / max(rounds, 1)
+    pricing  = solver.cg_stats["pricing"]
+    pooled   = solver.cg_stats["pool"]
+    k_solved = solver.k_stats["solved"]
+    k_pruned = len(solver.kbounds.pruned)
+    # tiempo ahorrado: los k descartados al costo medio de los resueltos
+    saved    = k_pruned * solver.k_stats["time"] / max(k_solved, 1)
 
     print(f"METRICS inst={os.path.basename(instance)} "
         f"conss={total_c} vars={total_v} vars_rmp={rmp_v} "
-        f"dual={int(dual_bd)} obj={best['obj'] if best else 'NA'} "
-        f"time={elapsed:.1f}")
\ No newline at end of file
+        f"dual={dual_bd} obj={best['obj'] if best else 'NA'} "
+        f"time={elapsed:.1f} rounds={rounds} rmp_ms={rmp_ms:.1f} "
+        f"pricing={pricing} pool={pooled} "
+        f"k_solved={k_solved} k_pruned={k_pruned} saved_s={saved:.1f}")
\ No newline at end of file
@@ -18,7 +18,11 @@ Cada patrón  =  subconjunto de ≤ MAX_R órdenes que CABEN por inventario
 Ajusta los parámetros al comienzo según tu caso.
 """
 from itertools import combinations
-import sys, pathlib
+import sys, os, pathlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from comun.instancia import load_instance
+from comun.candidatos import candidate_index
 
 # ---------------------------  Parámetros tunables  --------------------------
 MAX_R              = 3     # nº máx. de órdenes por patrón
@@ -31,40 +35,23 @@ FIXED_AISLES_FILE = "fixed_aisles.dat"
 # ---------------------------------------------------------------------------
 
 def load_base():
-    with open(INPUT_FILE) as f:
-        O, I, A = map(int, f.readline().split())
-
-        demand = [[0]*I for _ in range(O)]
-        for b in range(O):
-            k, *pairs = map(int, f.readline().split())
-            for idx in range(0, 2*k, 2):
-                item, qty = pairs[idx], pairs[idx+1]
-                demand[b][item] = qty
-
-        supply = [[0]*I for _ in range(A)]
-        for a in range(A):
-            l, *pairs = map(int, f.readline().split())
-            for idx in range(0, 2*l, 2):
-                item, qty = pairs[idx], pairs[idx+1]
-                supply[a][item] = qty
-
-        # última línea = LB  UB (no las usamos aquí)
+    inst = load_instance(INPUT_FILE)       # LB / UB no se usan aquí
     aisles_fix = list(map(int, open(FIXED_AISLES_FILE).read().split()))
-    return O, I, demand, supply, aisles_fix
+    return inst, aisles_fix
 
-def cabe_todas(ordenes, pasillo, demand, supply, I):
+def cabe_todas(ordenes, pasillo, inst):
     """True si el pasillo tiene unidades suficientes para TODAS las órdenes."""
-    for i in range(I):
-        need = sum(demand[o][i] for o in ordenes)
-        if need > supply[pasillo][i]:
-            return False
-    return True
+    items, need = inst.demand_of(ordenes)
+    items_a, qty_a = inst.aisle(pasillo)
+    have = dict(zip(items_a.tolist(), qty_a.tolist()))
+    return all(q <= have.get(i, 0) for i, q in zip(items.tolist(), need.tolist()))
 
-def unidades(ordenes, demand):
-    return sum(sum(demand[o]) for o in ordenes)
+def unidades(ordenes, inst):
+    return inst.units_of(ordenes)
 
 def main():
-    O, I, demand, supply, aisles_fix = load_base()
+    inst, aisles_fix = load_base()
+    cand = candidate_index(inst)          # pasillo → órdenes que entran solas
 
     pat_id = 1
     pat_lines, aisle_lines, unit_lines = [], [], []
@@ -73,7 +60,7 @@ def main():
         patrones_generados = 0
 
         # lista de órdenes que caben individualmente en el pasillo
-        candidatas = [o for o in range(O) if cabe_todas([o], a, demand, supply, I)]
+        candidatas = cand.orders_for(a).tolist()
 
         # prueba todos los tamaños 1..MAX_R (orden lexicográfica)
         for r in range(1, MAX_R+1):
@@ -82,10 +69,10 @@ def main():
             for subset in combinations(candidatas, r):
                 if patrones_generados >= MAX_PAT_PER_AISLE:
                     break
-                if not cabe_todas(subset, a, demand, supply, I):
+                if not cabe_todas(subset, a, inst):
                     continue
 
-                U = unidades(subset, demand)
+                U = unidades(subset, inst)
                 if MAX_UNITS is not None and U > MAX_UNITS:
                     continue  # patrón demasiado grande para el rango UB opcional
 
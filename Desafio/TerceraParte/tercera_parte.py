@@ -1,41 +1,31 @@
 
 from pyscipopt import Model, quicksum
 from itertools import combinations
-import sys, collections
+import sys, os, collections
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from comun.instancia import load_instance
+from comun.candidatos import candidate_index
 
 def read_base_data(input_txt):
-    with open(input_txt) as f:
-        O, I, A = map(int, f.readline().split())
-        demand = [[0]*I for _ in range(O)]
-        for b in range(O):
-            k, *pairs = map(int, f.readline().split())
-            for idx in range(0, 2*k, 2):
-                item, qty = pairs[idx], pairs[idx+1]
-                demand[b][item] = qty
-        supply = [[0]*I for _ in range(A)]
-        for a in range(A):
-            l, *pairs = map(int, f.readline().split())
-            for idx in range(0, 2*l, 2):
-                item, qty = pairs[idx], pairs[idx+1]
-                supply[a][item] = qty
-        LB, UB = map(int, f.readline().split())
-        print(LB)
-    return O, I, A, demand, supply, LB, UB
-
-def cabe_todas(ordenes, pasillo, demand, supply, I):
+    inst = load_instance(input_txt)
+    print(inst.LB)
+    return inst
+
+def cabe_todas(ordenes, pasillo, inst):
     """True si el pasillo cubre la suma de demandas del subconjunto."""
-    for i in range(I):
-        if sum(demand[o][i] for o in ordenes) > supply[pasillo][i]:
-            return False
-    return True
+    items, need = inst.demand_of(ordenes)
+    items_a, qty_a = inst.aisle(pasillo)
+    have = dict(zip(items_a.tolist(), qty_a.tolist()))
+    return all(q <= have.get(i, 0) for i, q in zip(items.tolist(), need.tolist()))
 
-def unidades(ordenes, demand):
-    return sum(sum(demand[o]) for o in ordenes)
+def unidades(ordenes, inst):
+    return inst.units_of(ordenes)
 
 class ColumnGenerationMaster:
-    def __init__(self, O, I, demand, pasillos_fijos, LB, UB):
+    def __init__(self, O, I, inst, pasillos_fijos, LB, UB):
         self.O, self.I   = O, I
-        self.demand      = demand
+        self.inst        = inst
         self.Afix        = pasillos_fijos
         self.LB, self.UB = LB, UB
 
@@ -93,21 +83,22 @@ class ColumnGenerationMaster:
 
 
 def column_generation(input_txt, fixed_file):
-    O,I,A,demand,supply,LB,UB = read_base_data(input_txt)
+    inst = read_base_data(input_txt)
+    O, LB, UB = inst.O, inst.LB, inst.UB
     pasillos_fijos = set(map(int, open(fixed_file).read().split()))
 
-    cg = ColumnGenerationMaster(O,I,demand,pasillos_fijos,LB,UB)
+    cg = ColumnGenerationMaster(O,inst.I,inst,pasillos_fijos,LB,UB)
+
+    cand = candidate_index(inst)          # pasillo → órdenes que entran solas
 
     pid = 1
     for a in pasillos_fijos:
-        for o in range(O):
-            if cabe_todas([o], a, demand, supply, I):
-                cg.add_pattern({'id': f"p{pid}",
-                                'ordenes': {o},
-                                'aisle':   a,
-                                'unidades': unidades([o], demand)})
-                pid += 1
-                break
+        for o in cand.orders_for(a)[:1].tolist():
+            cg.add_pattern({'id': f"p{pid}",
+                            'ordenes': {o},
+                            'aisle':   a,
+                            'unidades': unidades([o], inst)})
+            pid += 1
 
     cg.add_pattern({
         'id'      : 'dummy',
@@ -142,14 +133,13 @@ def column_generation(input_txt, fixed_file):
             mejor_delta = -1e20
             mejor_subset = None
 
-            candidatos = [o for o in range(O)
-                          if cabe_todas([o], a, demand, supply, I)]
+            candidatos = cand.orders_for(a).tolist()
 
             for r in range(1, min(MAX_R, len(candidatos))+1):
                 for subset in combinations(candidatos, r):
-                    if not cabe_todas(subset, a, demand, supply, I):
+                    if not cabe_todas(subset, a, inst):
                         continue
-                    U = unidades(subset, demand)
+                    U = unidades(subset, inst)
                     rc = U - sum(dual_order[o] for o in subset) - dual_aisle.get(a,0)
                     rc -= U * (dlb - dub)
                     if rc > mejor_delta + EPS:
@@ -161,7 +151,7 @@ def column_generation(input_txt, fixed_file):
                 cg.add_pattern({'id': f"p{pid}",
                                 'ordenes': set(mejor_subset),
                                 'aisle':   a,
-                                'unidades': unidades(mejor_subset, demand)})
+                                'unidades': unidades(mejor_subset, inst)})
                 nuevas += 1
 
         if nuevas == 0:
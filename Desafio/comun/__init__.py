@@ -0,0 +1,6 @@
+"""
+Código compartido por los solvers de las distintas partes del desafío.
+
+Los scripts de cada parte se ejecutan desde su propia carpeta, así que
+agregan ``Desafio/`` al ``sys.path`` antes de importar ``comun``.
+"""
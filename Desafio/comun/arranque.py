@@ -0,0 +1,120 @@
+"""
+Arranque en caliente para cualquier k
+-------------------------------------
+La mejor ola conocida se convierte en una ola factible con exactamente k
+pasillos y se le pasa a SCIP con ``addSol`` antes de optimizar, así tiene
+una incumbente desde el primer nodo:
+
+  • k mayor: se agregan los pasillos de afuera con más stock útil (cada
+    pasillo cuesta lo mismo en el cociente) y se llena con órdenes;
+  • k menor: se sacan los pasillos menos usados, se sacan las órdenes que
+    quedan sin stock y se vuelve a llenar.
+
+Cada modelo la traduce a sus variables:
+
+  • Basic (x_a, y_o): además la ola tiene que respetar las filas de
+    dominancia x_dom[b] >= x_b; ``lift_dominated`` cambia cada pasillo por
+    su dominador cuando éste no está (el stock no baja).
+  • Columns / Solver (columnas (a, S)): cada orden tiene que entrar entera
+    en un pasillo, así que ``columns_for_k`` trabaja por columnas: reparte
+    las órdenes de la ola entre sus pasillos (first fit, de más a menos
+    unidades; las que no entran en ninguno se descartan), ajusta k con
+    pasillos sin órdenes o sacando las de menos unidades y completa el
+    stock que sobra con órdenes que entran solas en cada pasillo.  Un
+    pasillo que queda sin órdenes es la variable vacía e_a del RMP, no una
+    columna del pool.
+"""
+
+import numpy as np
+
+from comun.ola import WaveState
+from comun.cotas import useful_stock
+from comun.busqueda_local import LocalSearch
+from comun.candidatos import candidate_index
+
+
+def wave_for_k(inst, sol, k, ls=None):
+    """WaveState factible con k pasillos armado desde sol, o None."""
+    if not sol or k < 1 or k > inst.A:
+        return None
+    ls = ls or LocalSearch(inst)
+    s  = WaveState(inst, sol["orders"], sol["aisles"])
+    if s.k < k:
+        for a in np.argsort(-useful_stock(inst), kind="stable").tolist():
+            if s.k == k:
+                break
+            if not s.y[a]:
+                s.add_aisle(a)
+    while s.k > k:
+        util = ls.utilization(s)
+        ais  = np.flatnonzero(s.y)
+        s.remove_aisle(int(ais[np.argmin(util[ais])]))
+        ls.repair(s)
+    ls.fill(s)
+    return s if s.feasible and s.k == k else None
+
+
+def lift_dominated(inst, s, dom):
+    """Cambia cada pasillo cuyo dominador no está en la ola por el dominador."""
+    t = s.copy()
+    changed = True
+    while changed:
+        changed = False
+        for b in np.flatnonzero(t.y).tolist():
+            a = int(dom[b])
+            if a >= 0 and not t.y[a]:
+                t.remove_aisle(b)
+                t.add_aisle(a)
+                changed = True
+    return t if t.feasible else None
+
+
+def columns_for_k(inst, sol, k):
+    """
+    [(a, órdenes, unidades)] con k pasillos para los modelos de columnas, o
+    None si no llega a LB.  Se reparte sol entre sus pasillos y el ajuste de
+    k se hace por columnas: con k mayor entran pasillos vacíos (los de más
+    stock útil), con k menor salen las columnas de menos unidades.  Las
+    entradas con órdenes vacías van como e_a (``_add_column`` de cada modelo).
+    """
+    if not sol or k < 1 or k > inst.A:
+        return None
+    ais  = sorted(sol["aisles"])
+    caps = {a: inst.supply_row(a) for a in ais}
+    part = {a: [] for a in ais}
+    units = {a: 0 for a in ais}
+    for o in sorted(sol["orders"], key=lambda o: -int(inst.units[o])):
+        items, qty = inst.order(o)
+        for a in ais:
+            if (caps[a][items] >= qty).all():
+                caps[a][items] -= qty
+                part[a].append(o)
+                units[a] += int(inst.units[o])
+                break
+    for a in np.argsort(-useful_stock(inst), kind="stable").tolist():
+        if len(ais) >= k:
+            break
+        if a not in caps:
+            ais.append(a)
+            caps[a], part[a], units[a] = inst.supply_row(a), [], 0
+    while len(ais) > k:
+        ais.remove(min(ais, key=lambda a: units[a]))
+
+    # completar con órdenes que entran solas en cada pasillo
+    taken = {o for a in ais for o in part[a]}
+    tot   = sum(units[a] for a in ais)
+    cand  = candidate_index(inst)
+    for a in ais:
+        fit = cand.orders_for(a)
+        for o in fit[np.argsort(-inst.units[fit], kind="stable")].tolist():
+            u = int(inst.units[o])
+            if o in taken or tot + u > inst.UB:
+                continue
+            items, qty = inst.order(o)
+            if (caps[a][items] >= qty).all():
+                caps[a][items] -= qty
+                part[a].append(o); taken.add(o)
+                units[a] += u; tot += u
+    if not inst.LB <= tot <= inst.UB:
+        return None
+    return [(a, part[a], units[a]) for a in ais]
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark de motores de pricing (comun/knapsack.py) cabeza a cabeza.
+
+Genera R rondas de duales aleatorios (semilla fija), arma el vector de
+costos reducidos y resuelve el knapsack de cada pasillo con cada motor.
+Reporta tiempo total, columnas encontradas y la máxima diferencia de
+objetivo contra el primer motor de la lista.
+
+Uso (desde Desafio/):
+    python -m comun.bench_pricing SextaParte/datasets/a/instance_0001.txt
+    python -m comun.bench_pricing inst.txt --rounds 3 --aisles 20 --lb 0
+"""
+import argparse, time
+
+import numpy as np
+
+from comun.instancia import load_instance
+from comun.knapsack import ENGINES, make_engine
+from comun.pricing import reduced_costs
+
+
+def random_duals(inst, rng):
+    pi    = rng.exponential(0.5, inst.I) * (rng.random(inst.I) < 0.3)
+    sigma = rng.exponential(1.0, inst.O) * (rng.random(inst.O) < 0.5)
+    return pi, sigma
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("instance")
+    ap.add_argument("--engines", default=",".join(ENGINES),
+                    help="motores separados por coma (el primero es la referencia)")
+    ap.add_argument("--rounds", type=int, default=2)
+    ap.add_argument("--aisles", type=int, default=None, help="primeros N pasillos")
+    ap.add_argument("--lb", type=int, default=None, help="pisa el LB de la instancia")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    inst   = load_instance(args.instance)
+    names  = args.engines.split(",")
+    aisles = range(inst.A if args.aisles is None else min(args.aisles, inst.A))
+    rng    = np.random.default_rng(args.seed)
+    rounds = []
+    for _ in range(args.rounds):
+        pi, sigma = random_duals(inst, rng)
+        rounds.append(reduced_costs(inst, pi, 0.0, 0.0, sigma))
+
+    print(f"inst={args.instance} O={inst.O} I={inst.I} A={inst.A} "
+          f"rondas={args.rounds} pasillos={len(aisles)}")
+    ref = None
+    for name in names:
+        engine = make_engine(name)
+        vals, tic = [], time.time()
+        for rc in rounds:
+            for a in aisles:
+                res = engine.solve(a, rc, inst, lb=args.lb)
+                vals.append(np.nan if res is None else res[1])
+        elapsed = time.time() - tic
+        vals = np.array(vals)
+        found = int(np.sum(vals > 1e-6))
+        if ref is None:
+            ref, gap = vals, 0.0
+        else:
+            both = ~np.isnan(ref) & ~np.isnan(vals)
+            gap  = float(np.max(np.abs(ref[both] - vals[both]), initial=0.0))
+            gap  = gap if (np.isnan(ref) == np.isnan(vals)).all() else float("inf")
+        extra = " ".join(f"{k}={v}" for k, v in sorted(engine.stats.items()))
+        print(f"{name:>5}: time={elapsed:8.3f}s  per_knap={1e3*elapsed/len(vals):8.2f}ms  "
+              f"cols>0={found:5d}  max|Δobj|={gap:.2e}  {extra}")
+
+
+if __name__ == "__main__":
+    main()
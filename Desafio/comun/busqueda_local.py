@@ -0,0 +1,133 @@
+"""
+Búsqueda local sobre la ola final
+---------------------------------
+Después de ``Opt_PasillosFijos`` suele sobrar parte del umbral.  Con
+``WaveState`` cada movimiento cuesta O(nnz), así que ese resto se usa para
+mejorar la ola sin otro MIP:
+
+  • llenar:   con los pasillos fijos, agregar órdenes (de más a menos
+              unidades) mientras entren en el stock que sobra y en UB;
+  • sacar:    quitar un pasillo, sacar las órdenes que quedan sin stock
+              (de menos a más unidades) y volver a llenar;
+  • cambiar:  lo mismo pero entrando otro pasillo de afuera (los de más
+              stock útil).
+
+Los pasillos se prueban de menor a mayor utilización.  Se acepta la primera
+mejora del cociente y se vuelve a empezar hasta que no haya mejora o se
+acabe el tiempo.  Cada vecino se prueba sobre la misma ola y se deshace
+(``WaveState.undo``) si no mejora.
+"""
+
+import time
+import numpy as np
+
+from comun.ola import WaveState
+from comun.cotas import useful_stock
+
+
+class LocalSearch:
+    def __init__(self, inst, swap_cands=20, eps=1e-9):
+        self.inst = inst
+        self.eps  = eps
+        self.by_units = np.argsort(-inst.units, kind="stable")
+        self.units = inst.units.tolist()
+        self.ais_rows = np.repeat(np.arange(inst.A), np.diff(inst.ais_ptr))
+        # pasillos para entrar en un cambio: los de más stock útil
+        self.cands = np.argsort(-useful_stock(inst), kind="stable")[:swap_cands]
+        self.moves = 0
+
+    # ---------------- piezas ---------------------------------------------------
+    def fill(self, s):
+        """Agrega órdenes que entran en el stock que sobra, sin pasar UB."""
+        inst = self.inst
+        bad = (s.res[inst.ord_items] < inst.ord_qty) & ~s.x[inst.ord_rows]
+        blocked = np.bincount(inst.ord_rows[bad], minlength=inst.O) > 0
+        free = ~s.x & ~blocked & (inst.units <= s.UB - s.units)
+        for o in self.by_units[free[self.by_units]].tolist():
+            if s.units + self.units[o] <= s.UB and s.fits(o):
+                s.add_order(o)
+        return s
+
+    def repair(self, s):
+        """Saca órdenes que piden ítems faltantes hasta que no falte nada."""
+        inst = self.inst
+        if s.short:
+            hit = (s.res[inst.ord_items] < 0) & s.x[inst.ord_rows]
+            ords = np.unique(inst.ord_rows[hit])
+            for o in ords[np.argsort(inst.units[ords], kind="stable")].tolist():
+                s.remove_order(o)
+                if not s.short:
+                    break
+        return s
+
+    def utilization(self, s):
+        """Fracción del stock de cada pasillo de la ola que la demanda usa."""
+        inst = self.inst
+        need = np.maximum(inst.supply_of(np.flatnonzero(s.y)) - s.res, 0)
+        used = np.bincount(self.ais_rows, weights=np.minimum(inst.ais_qty, need[inst.ais_items]),
+                           minlength=inst.A)
+        return used / np.maximum(inst.stock, 1)
+
+    # ---------------- vecindarios ----------------------------------------------
+    def _try(self, s, out, into=None):
+        """Mueve s en el lugar; si no mejora el cociente lo deshace (sin copiar arreglos)."""
+        before = s.ratio
+        m = s.mark()
+        s.remove_aisle(out)
+        if into is not None:
+            s.add_aisle(into)
+        self.fill(self.repair(s))
+        self.moves += 1
+        if s.feasible and s.ratio > before + self.eps:
+            s.commit(m)
+            return s
+        s.undo(m)
+        return None
+
+    def improve(self, s, deadline):
+        util = self.utilization(s)
+        ais  = sorted(np.flatnonzero(s.y).tolist(), key=lambda a: util[a])
+        if s.k > 1:
+            for a in ais:
+                if time.time() >= deadline:
+                    return None
+                t = self._try(s, a)
+                if t:
+                    return t
+        for a in ais:
+            for b in self.cands.tolist():
+                if s.y[b]:
+                    continue
+                if time.time() >= deadline:
+                    return None
+                t = self._try(s, a, b)
+                if t:
+                    return t
+        return None
+
+    def run(self, sol, deadline):
+        s = self.fill(WaveState(self.inst, sol["orders"], sol["aisles"]))
+        if not s.feasible:
+            return sol
+        while time.time() < deadline:
+            t = self.improve(s, deadline)
+            if t is None:
+                break
+            s = t
+        if s.ratio > sol["obj"] + self.eps:
+            return s.wave()
+        return sol
+
+
+def local_search(inst, sol, deadline, log=print):
+    """Mejora ``sol`` (formato de ``_extract``) hasta ``deadline`` (time.time())."""
+    if not sol or time.time() >= deadline:
+        return sol
+    tic = time.time()
+    ls  = LocalSearch(inst)
+    new = ls.run(sol, deadline)
+    if log:
+        log(f"[busqueda local] obj {sol['obj']:.4f} -> {new['obj']:.4f} "
+            f"k {len(sol['aisles'])} -> {len(new['aisles'])} "
+            f"movs={ls.moves} t={time.time() - tic:.2f}s")
+    return new
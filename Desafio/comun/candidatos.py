@@ -0,0 +1,72 @@
+"""
+Índice de candidatos por pasillo
+--------------------------------
+Una orden sólo puede ir en una columna del pasillo a si cada ítem que pide
+está en a con stock suficiente.  ``CandidateIndex`` precalcula, una sola
+vez por instancia:
+
+  • ítem → pasillos que lo tienen      (``aisles_for_item``, la CSC de stock)
+  • pasillo → órdenes que entran solas (``orders_for``, en CSR)
+
+``candidate_index(inst)`` lo construye la primera vez y lo deja colgado de
+la instancia para que todos los que la comparten usen el mismo.
+"""
+
+import numpy as np
+
+
+class CandidateIndex:
+    def __init__(self, inst):
+        self.inst = inst
+        O, A = inst.O, inst.A
+
+        # por cada no-cero (o, i, q) de la demanda, los pasillos con u_ai >= q
+        i_ptr = inst.item_ais_ptr
+        rows  = inst.ord_rows
+        lens  = (i_ptr[inst.ord_items + 1] - i_ptr[inst.ord_items])
+        nz    = np.repeat(np.arange(len(rows)), lens)
+        pos   = (np.arange(len(nz)) - np.repeat(np.cumsum(lens) - lens, lens)
+                 + np.repeat(i_ptr[inst.ord_items], lens))
+        ok    = inst.item_ais_qty[pos] >= inst.ord_qty[nz]
+        o_ok, a_ok = rows[nz[ok]], inst.item_aisles[pos[ok]]
+
+        # la orden entra en a si todos sus ítems quedaron cubiertos
+        key, hits = np.unique(o_ok.astype(np.int64) * A + a_ok, return_counts=True)
+        o_key, a_key = key // A, key % A
+        fit = hits == np.diff(inst.ord_ptr)[o_key]
+        o_fit, a_fit = o_key[fit], a_key[fit]
+
+        empty = np.flatnonzero(np.diff(inst.ord_ptr) == 0)   # sin ítems: entran en todos
+        if len(empty):
+            o_fit = np.concatenate([o_fit, np.tile(empty, A)])
+            a_fit = np.concatenate([a_fit, np.repeat(np.arange(A), len(empty))])
+
+        perm = np.lexsort((o_fit, a_fit))
+        self.fit_orders = o_fit[perm].astype(np.int32)
+        self.fit_ptr = np.zeros(A + 1, dtype=np.int64)
+        np.cumsum(np.bincount(a_fit, minlength=A), out=self.fit_ptr[1:])
+
+    @classmethod
+    def from_arrays(cls, inst, fit_ptr, fit_orders):
+        """Reusa un índice ya armado (p.ej. en memoria compartida)."""
+        idx = cls.__new__(cls)
+        idx.inst, idx.fit_ptr, idx.fit_orders = inst, fit_ptr, fit_orders
+        return idx
+
+    def orders_for(self, a):
+        """Órdenes (crecientes) que entran solas en el pasillo a."""
+        return self.fit_orders[self.fit_ptr[a]:self.fit_ptr[a + 1]]
+
+    def aisles_for_item(self, i):
+        """Pasillos que tienen el ítem i."""
+        return self.inst.aisles_with(i)[0]
+
+    def sizes(self):
+        """Cantidad de órdenes candidatas por pasillo."""
+        return np.diff(self.fit_ptr)
+
+
+def candidate_index(inst):
+    if not hasattr(inst, "_cand_index"):
+        inst._cand_index = CandidateIndex(inst)
+    return inst._cand_index
@@ -0,0 +1,64 @@
+"""
+Cotas por cantidad de pasillos
+------------------------------
+Con k pasillos ninguna ola junta más de
+
+    min(UB, stock útil de los k pasillos con más stock útil)
+
+unidades, donde el stock útil de un pasillo cuenta cada ítem a lo sumo
+hasta la demanda total de ese ítem.  Dividido k es una cota del cociente
+para ese k que no necesita resolver nada; si ni los k mejores pasillos
+llegan a LB, k es infactible.
+
+Cuando la relajación de RMP(k) se resolvió con column generation hasta el
+final su valor también acota RMP(k) (cota LP).  ``KBounds`` junta las dos
+y descarta los k cuya cota no supera a la incumbente.
+"""
+
+import numpy as np
+
+
+def useful_stock(inst):
+    """Σ_i min(u_ai, demanda total de i) por pasillo."""
+    demand = np.bincount(inst.ord_items, weights=inst.ord_qty, minlength=inst.I)
+    rows = np.repeat(np.arange(inst.A), np.diff(inst.ais_ptr))
+    cap  = np.minimum(inst.ais_qty, demand[inst.ais_items])
+    return np.bincount(rows, weights=cap, minlength=inst.A)
+
+
+def stock_bounds(inst):
+    """Cota del cociente para k = 0..A (-inf en k = 0 y en los k infactibles)."""
+    top = np.concatenate([[0.0], np.cumsum(np.sort(useful_stock(inst))[::-1])])
+    k   = np.arange(inst.A + 1)
+    bound = np.full(inst.A + 1, -np.inf)
+    ok = (k > 0) & (top >= inst.LB)
+    bound[ok] = np.minimum(top[ok], min(inst.UB, int(inst.units.sum()))) / k[ok]
+    return bound
+
+
+class KBounds:
+    def __init__(self, inst, eps=1e-9):
+        self.bound  = stock_bounds(inst)
+        self.eps    = eps
+        self.pruned = []                     # k descartados sin resolver
+
+    def lp(self, k, value):
+        """Anota el valor (unidades) de la relajación de RMP(k) ya convergida."""
+        self.bound[k] = min(self.bound[k], value / k)
+
+    def dual(self, k, value):
+        """
+        Cota de unidades con a lo sumo k pasillos: como una ola se puede
+        completar con pasillos cualquiera, vale para todo k' <= k.
+        """
+        kk = np.arange(1, k + 1)
+        self.bound[1:k + 1] = np.minimum(self.bound[1:k + 1], value / kk)
+
+    def alive(self, k, incumbent):
+        return self.bound[k] > incumbent + self.eps
+
+    def prune(self, k_list, incumbent):
+        """Saca de k_list los k que no pueden mejorar la incumbente."""
+        keep = [k for k in k_list if self.alive(k, incumbent)]
+        self.pruned += [k for k in k_list if not self.alive(k, incumbent)]
+        return keep
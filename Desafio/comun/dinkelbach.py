@@ -0,0 +1,52 @@
+"""
+Dinkelbach para el cociente unidades / |pasillos|
+-------------------------------------------------
+En vez de resolver un modelo por cada k = 1..A, se resuelve la versión
+paramétrica
+
+    F(λ) = max  unidades(x) - λ·|pasillos(x)|
+
+con |pasillos| libre.  Con la ola x_t de F(λ_t) se actualiza
+λ_{t+1} = unidades(x_t) / |pasillos(x_t)|; la sucesión de λ crece y en
+pocas iteraciones llega al cociente óptimo, donde F(λ*) = 0.
+
+Para cualquier ola x' con k' pasillos, u(x')/k' - λ = (u(x') - λk')/k'
+<= F(λ)/k' <= F(λ), porque k' >= 1.  Entonces F(λ) acota el gap del
+cociente y se corta cuando F(λ) <= tol.  (El k de la ola de F(λ) no sirve
+para escalar: el óptimo del cociente puede usar otro k.)
+
+``dinkelbach`` sólo maneja λ; cada modelo (Basic, Columns, Solver) pone
+su propio ``solve(λ, tiempo_restante)``.
+"""
+
+import time
+
+
+def dinkelbach(solve, umbral, lam0=0.0, tol=1e-4, max_iter=30, log=print):
+    """
+    ``solve(lam, rem)`` resuelve F(lam) con a lo sumo rem segundos y devuelve
+    la ola como dict con "units" y "aisles" (o None si no encontró ninguna).
+
+    Devuelve (mejor ola, trayectoria) donde la trayectoria es una lista de
+    (iteración, λ, F(λ), cociente de la ola encontrada).
+    """
+    start = time.time()
+    lam, best, traj = lam0, None, []
+    for it in range(1, max_iter + 1):
+        rem = umbral - (time.time() - start)
+        if rem <= 0:
+            break
+        sol = solve(lam, rem)
+        if sol is None:
+            break
+        units, k = sol["units"], len(sol["aisles"])
+        F, ratio = units - lam * k, units / k
+        traj.append((it, lam, F, ratio))
+        if log:
+            log(f"[dinkelbach] it={it} lambda={lam:.6f} F={F:.6f} ratio={ratio:.6f} k={k}")
+        if best is None or ratio > best["obj"]:
+            best = dict(sol, obj=ratio)
+        if F <= tol or ratio <= lam:             # gap cerrado o sin progreso
+            break
+        lam = ratio
+    return best, traj
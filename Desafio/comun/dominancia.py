@@ -0,0 +1,80 @@
+"""
+Dominancia entre pasillos
+-------------------------
+El pasillo a domina a b si u_ai >= u_bi para todo ítem i.  Dos pasillos que
+se dominan mutuamente son idénticos y forman una clase; el representante
+es el de menor índice.
+
+  • pricing: una columna (b, S) entra en b sólo si cada orden de S entra,
+    y entonces también entra en cualquier a que domine a b.  Como el RMP
+    no tiene filas propias de cada pasillo, el costo reducido es el mismo:
+    alcanza con resolver el knapsack de los pasillos no dominados.
+  • modelo compacto: en una ola que usa b y no a se puede cambiar b por a
+    sin perder nada, así que x_a >= x_b no saca el óptimo.  Con un solo
+    dominador por pasillo esas filas además rompen la simetría entre
+    pasillos idénticos.
+
+``aisle_dominance(inst)`` se calcula una vez y queda colgado de la
+instancia, igual que el índice de candidatos.
+"""
+
+import numpy as np
+
+
+class AisleDominance:
+    def __init__(self, inst):
+        A = inst.A
+        a_ptr = inst.item_ais_ptr
+        rows  = np.repeat(np.arange(A), np.diff(inst.ais_ptr))
+
+        # por cada no-cero (b, i, q) del stock, los pasillos a con u_ai >= q
+        lens = a_ptr[inst.ais_items + 1] - a_ptr[inst.ais_items]
+        nz   = np.repeat(np.arange(len(rows)), lens)
+        pos  = (np.arange(len(nz)) - np.repeat(np.cumsum(lens) - lens, lens)
+                + np.repeat(a_ptr[inst.ais_items], lens))
+        ok   = inst.item_ais_qty[pos] >= inst.ais_qty[nz]
+        b_ok, a_ok = rows[nz[ok]], inst.item_aisles[pos[ok]]
+
+        # a domina a b si cubre todos los ítems de b
+        key, hits = np.unique(b_ok.astype(np.int64) * A + a_ok, return_counts=True)
+        b_key, a_key = key // A, key % A
+        full = (hits == np.diff(inst.ais_ptr)[b_key]) & (a_key != b_key)
+        b_key, a_key = b_key[full], a_key[full]
+        # mutua (= mismo stock total): sólo el de menor índice domina
+        same = inst.stock[a_key] == inst.stock[b_key]
+        keep = ~same | (a_key < b_key)
+        b_key, a_key, same = b_key[keep], a_key[keep], same[keep]
+
+        # un dominador por pasillo: el de más stock (el menor índice si empatan)
+        self.dom = np.full(A, -1, dtype=np.int64)
+        perm = np.lexsort((a_key, -inst.stock[a_key], b_key))
+        first = np.ones(len(perm), dtype=bool)
+        first[1:] = b_key[perm][1:] != b_key[perm][:-1]
+        self.dom[b_key[perm][first]] = a_key[perm][first]
+
+        empty = np.flatnonzero(np.diff(inst.ais_ptr) == 0)   # sin stock: cualquiera lo domina
+        if len(empty):
+            top = int(np.argmax(inst.stock))
+            self.dom[empty[empty != top]] = top
+
+        # clases de idénticos: representante = menor índice de la clase
+        self.rep = np.arange(A)
+        np.minimum.at(self.rep, b_key[same], a_key[same])
+
+    def pricing_aisles(self):
+        """Pasillos que nadie domina: los únicos que hace falta pricear."""
+        return np.flatnonzero(self.dom < 0)
+
+    def duplicates(self):
+        """Pasillos idénticos a otro de menor índice."""
+        return np.flatnonzero(self.rep != np.arange(len(self.rep)))
+
+    def summary(self):
+        return (f"[dominancia] A={len(self.dom)} no dominados={len(self.pricing_aisles())} "
+                f"duplicados={len(self.duplicates())}")
+
+
+def aisle_dominance(inst):
+    if not hasattr(inst, "_dominance"):
+        inst._dominance = AisleDominance(inst)
+    return inst._dominance
@@ -0,0 +1,95 @@
+"""
+Exploración de k en paralelo
+----------------------------
+Los RMP(k) de distintos k son independientes: ``explore_parallel`` los
+reparte en un pool de procesos.
+
+  • cada worker arma su propio solver (la instancia sale del cache mmap,
+    así que no se copia) y conserva sus RMP entre los k que le tocan.
+  • la incumbente (mejor cociente) vive en un ``multiprocessing.Value``:
+    antes de resolver un k el worker la lee y lo descarta si la cota de k
+    (``solver.kbounds``) no la supera; si resuelve y mejora, la actualiza.
+  • todos comparten el mismo deadline absoluto: el umbral es global, no
+    por worker.
+  • si el solver tiene ``k_metrics(k)``, el worker devuelve también el
+    tamaño de su RMP(k) (para las METRICS: el modelo queda allá); si
+    tiene ``cg_stats``, devuelve lo que sumó ese k y acá se acumula.
+
+Los k se reparten de a uno (``imap_unordered``) en orden de cota
+decreciente, así los primeros en resolverse son los más prometedores.
+"""
+
+import os, time
+import multiprocessing as mp
+
+_W = {}
+
+
+def _init_worker(factory, args, method, best, deadline):
+    solver = factory(*args)
+    _W.update(solver=solver, solve=getattr(solver, method), best=best,
+              deadline=deadline)
+
+
+def _solve_k(k):
+    s, best = _W["solver"], _W["best"]
+    rem = _W["deadline"] - time.time()
+    if rem <= 0:
+        return k, "timeout", None, 0.0, None
+    inc = best.value
+    if not s.kbounds.alive(k, inc):
+        return k, "pruned", None, 0.0, None
+    cg  = getattr(s, "cg_stats", None)
+    cg0 = dict(cg) if cg is not None else None
+    tic = time.time()
+    sol = _W["solve"](k, rem, None if inc == float("-inf") else inc)
+    if sol:
+        with best.get_lock():
+            if sol["obj"] > best.value:
+                best.value = sol["obj"]
+    dt = time.time() - tic
+    info = s.k_metrics(k) if hasattr(s, "k_metrics") else {}
+    if cg is not None:
+        info = dict(info or {}, cg={key: cg[key] - cg0.get(key, 0) for key in cg})
+    return k, "solved", sol, dt, info or None
+
+
+def explore_parallel(factory, args, method, k_list, umbral, workers):
+    """
+    Resuelve ``factory(*args).<method>(k, tiempo, incumbente)`` para los k
+    de ``k_list`` con ``workers`` procesos y a lo sumo ``umbral`` segundos.
+
+    Devuelve (mejor ola, estadísticas) con estadísticas = dict(solved,
+    pruned, time) como en la exploración secuencial, más ``metrics``:
+    {k: k_metrics(k)} de los k resueltos, y ``cg``: la suma de los
+    ``cg_stats`` de los workers.
+    """
+    best = mp.Value("d", float("-inf"))
+    deadline = time.time() + umbral
+    stats = {"solved": 0, "pruned": [], "time": 0.0, "metrics": {}, "cg": {}}
+    best_sol = None
+    ctx = mp.get_context()
+    with ctx.Pool(workers, initializer=_init_worker,
+                  initargs=(factory, args, method, best, deadline)) as pool:
+        for k, status, sol, dt, info in pool.imap_unordered(_solve_k, k_list):
+            if status == "pruned":
+                stats["pruned"].append(k)
+            elif status == "solved":
+                stats["solved"] += 1
+                stats["time"]   += dt
+                if info is not None:
+                    for key, v in info.pop("cg", {}).items():
+                        stats["cg"][key] = stats["cg"].get(key, 0) + v
+                    if info:
+                        stats["metrics"][k] = info
+            if sol and (best_sol is None or sol["obj"] > best_sol["obj"] or
+                        (sol["obj"] == best_sol["obj"] and
+                         len(sol["aisles"]) < len(best_sol["aisles"]))):
+                best_sol = sol
+    return best_sol, stats
+
+
+def default_explore_workers():
+    """Workers pedidos por la variable EXPLORE_WORKERS (0 = todos los núcleos)."""
+    n = int(os.environ.get("EXPLORE_WORKERS", "1"))
+    return (os.cpu_count() or 1) if n <= 0 else n
@@ -0,0 +1,304 @@
+"""
+Lectura de instancias del desafío en formato ralo
+-------------------------------------------------
+Formato de texto (``O I A``):
+
+    O I A
+    k  i1 q1 ... ik qk          (una línea por orden)
+    l  i1 q1 ... il ql          (una línea por pasillo)
+    LB UB
+
+En vez de matrices densas ``demand[o][i]`` / ``supply[a][i]`` (O·I enteros
+de Python) se guardan las dos matrices en CSR con arreglos NumPy int32:
+
+  • órdenes×ítems   → ord_ptr, ord_items, ord_qty
+  • pasillos×ítems  → ais_ptr, ais_items, ais_qty
+
+y sus transpuestas (CSC, "quién pide / quién tiene el ítem i"):
+
+  • ítems×órdenes   → item_ord_ptr, item_ords, item_ord_qty
+  • ítems×pasillos  → item_ais_ptr, item_aisles, item_ais_qty
+
+Además quedan precalculadas las unidades por orden (``units``) y el stock
+total por pasillo (``stock``).
+
+``load_instance`` guarda la primera lectura en un binario al lado del .txt
+(``__instcache__/<nombre>.<hash>.bin``, hash del contenido del .txt) y las
+lecturas siguientes lo mapean en memoria sin copiar ni volver a parsear.
+La ruta queda en ``inst.cache_path`` para guardar al lado datos derivados
+de la instancia (``<bin>.<etiqueta>``), que se borran junto con el binario.
+"""
+
+import os, re, glob, json, mmap, hashlib
+import numpy as np
+
+IDX = np.int32          # índices y cantidades
+PTR = np.int64          # punteros de fila
+
+
+def _transpose(ptr, idx, val, ncols):
+    """CSR (n×ncols) → CSR de la transpuesta (ncols×n)."""
+    n    = len(ptr) - 1
+    rows = np.repeat(np.arange(n, dtype=IDX), np.diff(ptr))
+    perm = np.argsort(idx, kind="stable")
+    t_ptr = np.zeros(ncols + 1, dtype=PTR)
+    np.cumsum(np.bincount(idx, minlength=ncols), out=t_ptr[1:])
+    return t_ptr, rows[perm], val[perm]
+
+
+def _row_sums(ptr, val):
+    n    = len(ptr) - 1
+    rows = np.repeat(np.arange(n), np.diff(ptr))
+    return np.bincount(rows, weights=val, minlength=n).astype(np.int64)
+
+
+class Instance:
+    """Instancia del wave picking con demanda y stock ralos."""
+
+    # arreglos que se guardan en el cache binario (en este orden)
+    ARRAYS = ("ord_ptr", "ord_items", "ord_qty",
+              "ais_ptr", "ais_items", "ais_qty",
+              "item_ord_ptr", "item_ords", "item_ord_qty",
+              "item_ais_ptr", "item_aisles", "item_ais_qty",
+              "units", "stock")
+
+    def __init__(self, O, I, A, LB, UB,
+                 ord_ptr, ord_items, ord_qty,
+                 ais_ptr, ais_items, ais_qty, derived=None):
+        self.cache_path = None                       # binario del cache, si hay
+        self.O, self.I, self.A = int(O), int(I), int(A)
+        self.LB, self.UB       = int(LB), int(UB)
+
+        self.ord_ptr, self.ord_items, self.ord_qty = ord_ptr, ord_items, ord_qty
+        self.ais_ptr, self.ais_items, self.ais_qty = ais_ptr, ais_items, ais_qty
+
+        if derived is not None:                      # viene del cache
+            for name, arr in derived.items():
+                setattr(self, name, arr)
+            return
+
+        (self.item_ord_ptr, self.item_ords,
+         self.item_ord_qty) = _transpose(ord_ptr, ord_items, ord_qty, self.I)
+        (self.item_ais_ptr, self.item_aisles,
+         self.item_ais_qty) = _transpose(ais_ptr, ais_items, ais_qty, self.I)
+
+        self.units = _row_sums(ord_ptr, ord_qty)     # u_o
+        self.stock = _row_sums(ais_ptr, ais_qty)     # Σ_i u_ai
+
+    # ---------------- filas / columnas -------------------------------------
+    def order(self, o):
+        """(ítems, cantidades) de la orden o."""
+        s, e = self.ord_ptr[o], self.ord_ptr[o + 1]
+        return self.ord_items[s:e], self.ord_qty[s:e]
+
+    def aisle(self, a):
+        """(ítems, cantidades) del pasillo a."""
+        s, e = self.ais_ptr[a], self.ais_ptr[a + 1]
+        return self.ais_items[s:e], self.ais_qty[s:e]
+
+    def orders_with(self, i):
+        """(órdenes, cantidades) que piden el ítem i."""
+        s, e = self.item_ord_ptr[i], self.item_ord_ptr[i + 1]
+        return self.item_ords[s:e], self.item_ord_qty[s:e]
+
+    def aisles_with(self, i):
+        """(pasillos, cantidades) que tienen el ítem i."""
+        s, e = self.item_ais_ptr[i], self.item_ais_ptr[i + 1]
+        return self.item_aisles[s:e], self.item_ais_qty[s:e]
+
+    # ---------------- agregados --------------------------------------------
+    def supply_row(self, a):
+        """Stock del pasillo a como vector denso de largo I (copia)."""
+        cap = np.zeros(self.I, dtype=np.int64)
+        items, qty = self.aisle(a)
+        cap[items] = qty
+        return cap
+
+    def supply_of(self, aisles):
+        """Stock sumado de un conjunto de pasillos, vector denso de largo I."""
+        cap = np.zeros(self.I, dtype=np.int64)
+        for a in aisles:
+            items, qty = self.aisle(a)
+            cap[items] += qty
+        return cap
+
+    def demand_of(self, orders):
+        """Demanda agregada de un conjunto de órdenes: (ítems, cantidades) != 0."""
+        orders = list(orders)
+        if not orders:
+            return np.empty(0, dtype=IDX), np.empty(0, dtype=np.int64)
+        items = np.concatenate([self.order(o)[0] for o in orders])
+        qty   = np.concatenate([self.order(o)[1] for o in orders])
+        uniq, inv = np.unique(items, return_inverse=True)
+        return uniq, np.bincount(inv, weights=qty).astype(np.int64)
+
+    def units_of(self, orders):
+        return int(sum(int(self.units[o]) for o in orders))
+
+    @property
+    def ord_rows(self):
+        """Orden de cada no-cero de la CSR de demanda (se calcula una vez)."""
+        if not hasattr(self, "_ord_rows"):
+            self._ord_rows = np.repeat(np.arange(self.O), np.diff(self.ord_ptr))
+        return self._ord_rows
+
+    def demand_dot(self, vec):
+        """Producto D·vec (D = demanda O×I): Σ_i d_oi·vec_i para cada orden."""
+        vec = np.asarray(vec, dtype=float)
+        return np.bincount(self.ord_rows, weights=vec[self.ord_items] * self.ord_qty,
+                           minlength=self.O)
+
+    @property
+    def nbytes(self):
+        return sum(arr.nbytes for arr in vars(self).values()
+                   if isinstance(arr, np.ndarray))
+
+
+# ---------------- lectura ----------------------------------------------------
+def _parse_block(tok, pos, n, ncols):
+    """Lee n filas ``k i1 q1 ... ik qk`` a partir de tok[pos]; devuelve CSR."""
+    counts = np.empty(n, dtype=PTR)
+    heads  = np.empty(n, dtype=PTR)
+    for r in range(n):
+        k = int(tok[pos])
+        heads[r], counts[r] = pos, k
+        pos += 1 + 2*k
+
+    start = heads[0] if n else pos
+    body  = np.ones(pos - start, dtype=bool)
+    body[heads - start] = False
+    pairs = tok[start:pos][body].reshape(-1, 2)
+
+    rows = np.repeat(np.arange(n, dtype=PTR), counts)
+    # ítems repetidos en una misma fila: vale la última aparición
+    key  = rows * ncols + pairs[:, 0]
+    uniq, first = np.unique(key[::-1], return_index=True)
+    keep = len(key) - 1 - first
+
+    ptr = np.zeros(n + 1, dtype=PTR)
+    np.cumsum(np.bincount((uniq // ncols), minlength=n), out=ptr[1:])
+    return (ptr, pairs[keep, 0].astype(IDX), pairs[keep, 1].astype(IDX)), pos
+
+
+def _parse_text(text):
+    tok = np.array(text.split(), dtype=np.int64)
+    O, I, A = (int(x) for x in tok[:3])
+    orders, pos = _parse_block(tok, 3, O, I)
+    aisles, pos = _parse_block(tok, pos, A, I)
+    LB, UB = (int(x) for x in tok[pos:pos + 2])
+    return Instance(O, I, A, LB, UB, *orders, *aisles)
+
+
+def read_instance(fname):
+    """Parsea el .txt de la instancia y devuelve un ``Instance`` (sin cache)."""
+    with open(fname) as f:
+        return _parse_text(f.read())
+
+
+# ---------------- cache binario ---------------------------------------------
+# Layout del .bin:
+#   MAGIC (8 bytes) | largo del header (uint64) | header JSON | arreglos
+# El header tiene O, I, A, LB, UB y por arreglo (dtype, offset, largo).
+# Cada arreglo arranca alineado a ALIGN bytes para poder mapearlo tal cual.
+MAGIC = b"WOPINST1"
+ALIGN = 64
+CACHE_DIR = "__instcache__"
+
+
+def _cache_path(fname, digest):
+    d, base = os.path.split(os.path.abspath(fname))
+    return os.path.join(d, CACHE_DIR, f"{base}.{digest}.bin")
+
+
+def _remove_stale(fname, path):
+    """
+    Borra los binarios viejos de fname (otro hash) y sus derivados (<bin>.*,
+    p.ej. semillas).  Sólo los de este archivo: ``<base>.<hash>.bin...``
+    exacto, no los de otro que empiece igual (``<base>.bak.<hash>.bin``).
+    """
+    d = os.path.dirname(path)
+    base = os.path.basename(os.path.abspath(fname))
+    pat = re.compile(rf"{re.escape(base)}\.[0-9a-f]{{16}}\.bin.*")
+    keep = os.path.basename(path)
+    for name in glob.glob(os.path.join(glob.escape(d), glob.escape(base) + ".*")):
+        name = os.path.basename(name)
+        if pat.fullmatch(name) and not name.startswith(keep):
+            try:
+                os.remove(os.path.join(d, name))
+            except FileNotFoundError:
+                pass                       # lo borró otro proceso
+
+
+def _write_cache(inst, path):
+    meta = {"O": inst.O, "I": inst.I, "A": inst.A,
+            "LB": inst.LB, "UB": inst.UB, "arrays": {}}
+    arrays = [(name, np.ascontiguousarray(getattr(inst, name)))
+              for name in Instance.ARRAYS]
+
+    # el header se escribe con offsets relativos al fin del header
+    off = 0
+    for name, arr in arrays:
+        meta["arrays"][name] = [arr.dtype.str, off, int(arr.size)]
+        off += -(-arr.nbytes // ALIGN) * ALIGN
+    head = json.dumps(meta).encode()
+    head += b" " * (-(len(MAGIC) + 8 + len(head)) % ALIGN)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(np.uint64(len(head)).tobytes())
+        f.write(head)
+        for _, arr in arrays:
+            f.write(arr.tobytes())
+            f.write(b"\0" * (-arr.nbytes % ALIGN))
+    os.replace(tmp, path)                  # atómico: otro proceso no ve medio archivo
+
+
+def _map_cache(path):
+    with open(path, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if buf[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path}: no es un cache de instancia")
+    hlen  = int(np.frombuffer(buf, np.uint64, 1, len(MAGIC))[0])
+    base  = len(MAGIC) + 8
+    meta  = json.loads(bytes(buf[base:base + hlen]))
+    base += hlen
+    arr = {name: np.frombuffer(buf, np.dtype(dt), n, base + off)
+           for name, (dt, off, n) in meta["arrays"].items()}
+    core = [arr.pop(name) for name in Instance.ARRAYS[:6]]
+    return Instance(meta["O"], meta["I"], meta["A"], meta["LB"], meta["UB"],
+                    *core, derived=arr)
+
+
+def load_instance(fname, cache=True):
+    """
+    Como ``read_instance`` pero con cache binario mapeado en memoria.
+
+    La clave del cache es un hash del contenido del .txt: si el archivo
+    cambia se vuelve a parsear y se reemplaza el binario viejo.  Si la
+    carpeta no es escribible se sigue sin cache.
+    """
+    with open(fname, "rb") as f:
+        raw = f.read()
+    if not cache:
+        return _parse_text(raw.decode())
+
+    digest = hashlib.blake2b(raw, digest_size=8).hexdigest()
+    path   = _cache_path(fname, digest)
+    if os.path.exists(path):
+        try:
+            inst = _map_cache(path)
+            inst.cache_path = path
+            return inst
+        except (ValueError, KeyError, OSError):
+            pass                           # cache corrupto: se regenera
+
+    inst = _parse_text(raw.decode())
+    try:
+        _remove_stale(fname, path)
+        _write_cache(inst, path)
+        inst.cache_path = path
+    except OSError:
+        pass
+    return inst
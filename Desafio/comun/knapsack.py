@@ -0,0 +1,237 @@
+"""
+Motores para el knapsack multidimensional de pricing
+----------------------------------------------------
+Para un pasillo a y un vector de ganancias p_o (costos reducidos, densidades…)
+
+    max  Σ_o p_o z_o
+    s.a. Σ_o d_oi z_o <= u_ai        para cada ítem i que tiene el pasillo
+         LB <= Σ_o u_o z_o <= UB
+         z_o ∈ {0,1}
+
+Todos los motores exponen ``solve(a, profit, inst, candidates=None, lb=None,
+ub=None)`` y devuelven ``(órdenes, valor)`` o ``None`` si es infactible.
+Además dejan en ``last_pool`` otras soluciones factibles que vieron en esa
+llamada ([(órdenes, valor)], sin la óptima), para quien quiera más de una
+columna por pasillo:
+
+  • ``BranchBoundEngine`` ("bb")  – sólo mira las órdenes que entran solas en
+    el pasillo; si el stock no puede atar resuelve un DP exacto en unidades,
+    si no hace branch-and-bound con cotas O(1).  Al pasar el límite de nodos
+    delega en ``fallback`` (SCIP por defecto).
+  • ``ScipEngine`` ("scip")       – el modelo 0-1 de siempre, con SCIP, sobre
+    las mismas órdenes candidatas.
+
+El pool es el de soluciones de SCIP o, en el branch-and-bound, las
+incumbentes que fue mejorando; el DP no deja ninguna.
+"""
+
+import sys
+from collections import defaultdict
+
+import numpy as np
+from pyscipopt import Model, quicksum
+
+from comun.candidatos import candidate_index
+
+EPS = 1e-9
+
+
+def fitting_orders(a, inst, candidates=None, ub=None):
+    """Órdenes (de ``candidates`` o todas) que entran solas en el pasillo a."""
+    fits = candidate_index(inst).orders_for(a).astype(np.int64)
+    if ub is not None:
+        fits = fits[inst.units[fits] <= ub]
+    if candidates is not None:
+        fits = fits[np.isin(fits, np.fromiter(candidates, dtype=np.int64))]
+    return fits
+
+
+class ScipEngine:
+    name = "scip"
+
+    def __init__(self):
+        self.stats = defaultdict(int)
+        self.last_pool = []
+
+    def solve(self, a, profit, inst, candidates=None, lb=None, ub=None):
+        lb = inst.LB if lb is None else lb
+        ub = inst.UB if ub is None else ub
+        self.last_pool = []
+        orders = fitting_orders(a, inst, candidates).tolist()   # el resto nunca entra
+        units_o = inst.units
+
+        knap = Model(f"pricing_{a}")
+        z = {o: knap.addVar(vtype="B", obj=float(profit[o])) for o in orders}
+
+        terms = defaultdict(list)
+        for o in z:
+            items, qty = inst.order(o)
+            for i, q in zip(items.tolist(), qty.tolist()):
+                terms[i].append((o, q))
+        cap = inst.supply_row(a).tolist()
+        for i, row in terms.items():         # ítems sin demanda: fila 0 <= u_ai
+            knap.addCons(quicksum(q * z[o] for o, q in row) <= cap[i])
+        tot = quicksum(int(units_o[o]) * z[o] for o in z)
+        knap.addCons(tot >= lb)
+        knap.addCons(tot <= ub)
+        knap.setMaximize()
+
+        try: knap.hideOutput()
+        except AttributeError: knap.setParam("display/verblevel", 0)
+
+        knap.optimize()
+        self.stats["solves"] += 1
+        if knap.getStatus() != "optimal":
+            return None
+        sel = [o for o in z if knap.getVal(z[o]) > 0.5]
+        self.last_pool = [([o for o in z if knap.getSolVal(s, z[o]) > 0.5], knap.getSolObjVal(s))
+                          for s in knap.getSols()[1:]]
+        return sel, knap.getObjVal()
+
+
+class _NodeLimit(Exception):
+    pass
+
+
+class BranchBoundEngine:
+    name = "bb"
+
+    DP_CELLS = 5e7          # n·(UB+1) máximo para la tabla del DP
+    POOL     = 10           # incumbentes previas que se guardan en last_pool
+
+    def __init__(self, node_limit=20_000, fallback=None):
+        self.node_limit = node_limit
+        self.fallback   = ScipEngine() if fallback is None else fallback
+        self.stats = defaultdict(int)
+        self.last_pool = []
+
+    def solve(self, a, profit, inst, candidates=None, lb=None, ub=None):
+        lb = inst.LB if lb is None else lb
+        ub = inst.UB if ub is None else ub
+        self.stats["solves"] += 1
+        self.last_pool = []
+
+        cand = fitting_orders(a, inst, candidates, ub)
+        units = inst.units[cand]
+        gain  = np.asarray(profit, dtype=float)[cand]
+
+        # órdenes sin ítems: no consumen nada, entran si suman
+        free  = units == 0
+        base  = cand[free & (gain > 0)].tolist()
+        base_val = float(gain[free & (gain > 0)].sum())
+        keep = ~free
+        if lb <= 0:                        # sin piso, p_o <= 0 nunca conviene
+            keep &= gain > EPS
+        cand, units, gain = cand[keep], units[keep], gain[keep]
+        if len(cand) == 0:
+            return (base, base_val) if lb <= 0 else None
+
+        # ¿puede atar el stock?  Si la demanda total de las candidatas no
+        # supera el stock en ningún ítem, sólo queda la dimensión unidades.
+        items, need = inst.demand_of(cand.tolist())
+        if (need <= inst.supply_row(a)[items]).all() \
+                and len(cand) * (ub + 1) <= self.DP_CELLS:
+            self.stats["dp"] += 1
+            res = self._dp(cand, units, gain, lb, ub)
+        else:
+            res = self._branch(a, cand, units, gain, inst, lb, ub)
+            if res is _NodeLimit:
+                self.stats["fallback"] += 1
+                sub = set(cand.tolist())
+                res = self.fallback.solve(a, profit, inst, sub, lb, ub)
+                self.last_pool = self.fallback.last_pool
+        if res is None:
+            return None
+        sel, val = res
+        self.last_pool = [(sorted(base + list(p)), v + base_val) for p, v in self.last_pool]
+        return sorted(base + list(sel)), val + base_val
+
+    # ---------------- DP exacto en unidades --------------------------------
+    @staticmethod
+    def _dp(cand, units, gain, lb, ub):
+        n = len(cand)
+        best = np.full(ub + 1, -np.inf); best[0] = 0.0
+        take = np.zeros((n, ub + 1), dtype=bool)
+        for j in range(n):
+            u, p = int(units[j]), gain[j]
+            new = best[:ub + 1 - u] + p
+            upd = new > best[u:] + EPS
+            take[j, u:] = upd
+            best[u:] = np.where(upd, new, best[u:])
+        window = best[lb:]
+        if not np.isfinite(window).any():
+            return None
+        t = lb + int(np.argmax(window))
+        val = float(best[t])
+        sel = []
+        for j in range(n - 1, -1, -1):
+            if take[j, t]:
+                sel.append(int(cand[j])); t -= int(units[j])
+        return sel, val
+
+    # ---------------- branch-and-bound -------------------------------------
+    def _branch(self, a, cand, units, gain, inst, lb, ub):
+        ratio = gain / units
+        perm  = np.argsort(-ratio, kind="stable")
+        cand, units, gain, ratio = cand[perm], units[perm], gain[perm], ratio[perm]
+        n = len(cand)
+
+        u_l = units.tolist(); p_l = gain.tolist(); r_l = ratio.tolist()
+        rows = [tuple(zip(*(x.tolist() for x in inst.order(o)))) for o in cand.tolist()]
+        suf_pos = np.concatenate([np.cumsum(np.maximum(gain, 0)[::-1])[::-1], [0.0]]).tolist()
+        suf_u   = np.concatenate([np.cumsum(units[::-1])[::-1], [0]]).tolist()
+
+        items, qty = inst.aisle(a)
+        cap = dict(zip(items.tolist(), qty.tolist()))
+        best = {"val": -np.inf, "sel": None}
+        history = []
+        chosen = []
+        nodes = [0]
+        limit = self.node_limit
+
+        def dfs(j, val, tot):
+            nodes[0] += 1
+            if nodes[0] > limit:
+                raise _NodeLimit
+            if tot >= lb and val > best["val"] + EPS:
+                if best["sel"] is not None:          # la incumbente anterior va al pool
+                    history.append((best["sel"], best["val"]))
+                best["val"], best["sel"] = val, list(chosen)
+            if j == n or tot + suf_u[j] < lb:
+                return
+            room  = ub - tot
+            bound = val + min(suf_pos[j], room * max(r_l[j], 0.0))
+            if bound <= best["val"] + EPS:
+                return
+            if u_l[j] <= room and all(cap[i] >= q for i, q in rows[j]):
+                for i, q in rows[j]: cap[i] -= q
+                chosen.append(j)
+                dfs(j + 1, val + p_l[j], tot + u_l[j])
+                chosen.pop()
+                for i, q in rows[j]: cap[i] += q
+            dfs(j + 1, val, tot)
+
+        old = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(old, n + 200))
+        try:
+            dfs(0, 0.0, 0)
+        except _NodeLimit:
+            return _NodeLimit
+        finally:
+            sys.setrecursionlimit(old)
+            self.stats["nodes"] += nodes[0]
+        if best["sel"] is None:
+            return None
+        self.last_pool = [([int(cand[j]) for j in sel], v) for sel, v in history[-self.POOL:]]
+        return [int(cand[j]) for j in best["sel"]], best["val"]
+
+
+ENGINES = {"bb": BranchBoundEngine, "scip": ScipEngine}
+
+
+def make_engine(name="bb"):
+    try:
+        return ENGINES[name]()
+    except KeyError:
+        raise ValueError(f"motor de pricing desconocido: {name!r} "
+                         f"(opciones: {', '.join(ENGINES)})") from None
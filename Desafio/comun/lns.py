@@ -0,0 +1,206 @@
+"""
+LNS sobre subproblemas de pasillos fijos
+----------------------------------------
+Con los pasillos fijos la ola es un MIP chico de selección de órdenes
+(``Opt_PasillosFijos``, SegundaParte).  El LNS aprovecha eso:
+
+  1. destruir: sacar r pasillos de la incumbente, elegidos por un operador
+     (menor utilización, al azar, o los que cubren menos unidades);
+  2. reabrir:  los pasillos que quedan + un conjunto de candidatos de
+     afuera (los de más stock útil de los ítems que piden las órdenes que
+     todavía no entran, y algunos al azar);
+  3. reparar:  resolver con tiempo corto el MIP restringido a esos
+     pasillos y a las órdenes cuyos ítems están todos en ellos, con
+     objetivo  Σ u_o y_o − λ Σ x_a  y  λ = cociente de la incumbente: una
+     solución con objetivo > 0 tiene cociente > λ (un paso de Dinkelbach).
+     La incumbente sin los pasillos sacados, reparada, entra como solución
+     inicial.
+
+Los operadores se eligen por ruleta con pesos adaptativos (ALNS): cada
+iteración el peso del operador usado se mueve hacia el puntaje que sacó
+(nueva mejor / solución sin mejora / nada).  Cada mejora se informa al
+momento por ``log`` y queda en ``LNS.history`` como (t, it, operador, obj, k).
+
+``greedy_wave`` arma una ola inicial en milisegundos (pasillos por stock
+útil + llenado), así el LNS no necesita esperar a column generation.
+"""
+
+import time, random
+import numpy as np
+from pyscipopt import Model, quicksum
+
+from comun.ola import WaveState
+from comun.cotas import useful_stock
+from comun.busqueda_local import LocalSearch
+
+OPERATORS = ("utilizacion", "azar", "unidades")
+SCORES    = {"mejor": 3.0, "factible": 1.0, "nada": 0.0}
+
+
+def _print(msg):
+    print(msg, flush=True)                       # cada mejora sale en el momento
+
+
+def greedy_wave(inst):
+    """Ola factible armada agregando pasillos por stock útil y llenando con órdenes."""
+    ls = LocalSearch(inst)
+    s  = WaveState(inst)
+    best = None
+    for a in np.argsort(-useful_stock(inst), kind="stable").tolist():
+        s.add_aisle(a)
+        ls.fill(s)
+        if s.feasible and (best is None or s.ratio > best["obj"]):
+            best = s.wave()
+        elif best is not None:
+            break                               # con más pasillos ya no mejora
+    return best
+
+
+class LNS:
+    def __init__(self, inst, seed=0, reaction=0.2, n_cands=10, sub_time=2.0, log=_print):
+        self.inst = inst
+        self.rng  = random.Random(seed)
+        self.reaction = reaction
+        self.n_cands  = n_cands
+        self.sub_time = sub_time
+        self.log  = log
+        self.ls   = LocalSearch(inst)
+        self.useful = useful_stock(inst)
+        self.ais_rows = self.ls.ais_rows
+        self.weights = dict.fromkeys(OPERATORS, 1.0)
+        self.history = []
+        self.stats   = {"it": 0, "improved": 0}
+
+    # ---------------- destruir -------------------------------------------------
+    def _destroy(self, s, op, r):
+        ais = np.flatnonzero(s.y)
+        if op == "azar":
+            return self.rng.sample(ais.tolist(), r)
+        if op == "utilizacion":
+            score = self.ls.utilization(s)[ais]
+        else:                                    # unidades que cada pasillo cubre
+            inst = self.inst
+            need = np.maximum(inst.supply_of(ais) - s.res, 0)
+            score = np.bincount(self.ais_rows, weights=np.minimum(inst.ais_qty, need[inst.ais_items]),
+                                minlength=inst.A)[ais]
+        return ais[np.argsort(score, kind="stable")[:r]].tolist()
+
+    def _candidates(self, s, keep):
+        """Pasillos de afuera con stock de lo que piden las órdenes que no entran."""
+        inst = self.inst
+        out_nz = ~s.x[inst.ord_rows]
+        want = np.bincount(inst.ord_items[out_nz], weights=inst.ord_qty[out_nz], minlength=inst.I)
+        gain = np.bincount(self.ais_rows, weights=np.minimum(inst.ais_qty, want[inst.ais_items]),
+                           minlength=inst.A)
+        gain[list(keep)] = -1
+        top = np.argsort(-gain, kind="stable")[:self.n_cands].tolist()
+        rest = [a for a in range(inst.A) if a not in keep and a not in top]
+        return top + self.rng.sample(rest, min(len(rest), max(1, self.n_cands // 2)))
+
+    # ---------------- reparar --------------------------------------------------
+    def _repair(self, open_ais, start, lam, tlim):
+        """MIP de selección de órdenes sobre open_ais; objetivo Σ u_o y_o − λ Σ x_a."""
+        inst = self.inst
+        open_ais = sorted(set(open_ais))
+        cap = inst.supply_of(open_ais)
+        # órdenes con todos sus ítems en los pasillos abiertos (y que solas entran)
+        miss = np.bincount(inst.ord_rows[cap[inst.ord_items] < inst.ord_qty], minlength=inst.O) > 0
+        ords = np.flatnonzero(~miss & (inst.units <= inst.UB)).tolist()
+        if not ords:
+            return None
+
+        m = Model("LNS")
+        try: m.hideOutput()
+        except AttributeError: m.setParam("display/verblevel", 0)
+        x = {a: m.addVar(vtype="B", name=f"x_{a}") for a in open_ais}
+        y = {o: m.addVar(vtype="B", name=f"y_{o}") for o in ords}
+        units = inst.units.tolist()
+        tot = quicksum(units[o] * y[o] for o in ords)
+        m.addCons(tot >= inst.LB)
+        m.addCons(tot <= inst.UB)
+        m.addCons(quicksum(x.values()) >= 1)
+
+        lhs = {}
+        for o in ords:
+            for i, q in zip(*(v.tolist() for v in inst.order(o))):
+                lhs.setdefault(i, []).append((q, y[o]))
+        for a in open_ais:
+            for i, q in zip(*(v.tolist() for v in inst.aisle(a))):
+                if i in lhs:
+                    lhs[i].append((-q, x[a]))
+        for i, terms in lhs.items():
+            m.addCons(quicksum(c * v for c, v in terms) <= 0)
+        m.setObjective(tot - lam * quicksum(x.values()), "maximize")
+
+        if start is not None:                    # incumbente sin los pasillos sacados
+            sol = m.createSol()
+            for a in open_ais:
+                m.setSolVal(sol, x[a], 1.0 if start.y[a] else 0.0)
+            for o in ords:
+                m.setSolVal(sol, y[o], 1.0 if start.x[o] else 0.0)
+            m.addSol(sol, free=True)
+
+        m.setParam("limits/time", max(tlim, 0.05))
+        m.optimize()
+        if m.getNSols() == 0:
+            return None
+        aisles = [a for a in open_ais if m.getVal(x[a]) > 0.5]
+        orders = [o for o in ords if m.getVal(y[o]) > 0.5]
+        t = WaveState(inst, orders, aisles)
+        return t if t.feasible else None
+
+    # ---------------- bucle ----------------------------------------------------
+    def _pick(self):
+        ops = list(self.weights)
+        return self.rng.choices(ops, weights=[self.weights[o] for o in ops])[0]
+
+    def run(self, sol, deadline):
+        tic = time.time()
+        best = WaveState(self.inst, sol["orders"], sol["aisles"])
+        if not best.feasible:
+            return sol
+        while time.time() < deadline:
+            self.stats["it"] += 1
+            op = self._pick()
+            r  = self.rng.randint(1, max(1, (best.k + 2) // 3))
+            r  = min(r, best.k)
+            drop = set(self._destroy(best, op, r))
+            keep = set(np.flatnonzero(best.y).tolist()) - drop
+
+            start = best.copy()
+            for a in drop:
+                start.remove_aisle(a)
+            self.ls.repair(start)
+            start = start if start.feasible else None
+
+            rem = deadline - time.time()
+            t = self._repair(list(keep) + self._candidates(best, keep),
+                             start, best.ratio, min(self.sub_time, rem))
+            if t is not None:
+                self.ls.fill(t)
+            if t is not None and t.ratio > best.ratio + 1e-9:
+                best, score = t, SCORES["mejor"]
+                self.stats["improved"] += 1
+                ev = (time.time() - tic, self.stats["it"], op, best.ratio, best.k)
+                self.history.append(ev)
+                if self.log:
+                    self.log(f"[lns] t={ev[0]:.1f}s it={ev[1]} op={op} obj={best.ratio:.4f} k={best.k}")
+            else:
+                score = SCORES["factible"] if t is not None else SCORES["nada"]
+            w = self.weights[op]
+            self.weights[op] = max(0.1, (1 - self.reaction) * w + self.reaction * score)
+
+        new = best.wave()
+        return new if new["obj"] > sol["obj"] + 1e-9 else sol
+
+
+def lns(inst, sol, deadline, log=_print, **kw):
+    """LNS desde sol (o desde ``greedy_wave`` si sol es None) hasta deadline."""
+    if sol is None:
+        sol = greedy_wave(inst)
+        if sol is None:
+            return None
+        if log:
+            log(f"[lns] inicial (greedy) obj={sol['obj']:.4f} k={len(sol['aisles'])}")
+    eng = LNS(inst, log=log, **kw)
+    return eng.run(sol, deadline)
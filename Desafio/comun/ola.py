@@ -0,0 +1,217 @@
+"""
+Estado incremental de una ola
+-----------------------------
+``WaveState`` mantiene, para una ola (órdenes, pasillos):
+
+  • res[i]  = stock de i en los pasillos elegidos − demanda de i de las
+              órdenes elegidas (capacidad residual por ítem);
+  • short   = cantidad de ítems con res[i] < 0;
+  • units   = Σ u_o de las órdenes elegidas,  k = #pasillos.
+
+Agregar o sacar una orden / un pasillo toca sólo sus no-ceros (una fila de
+la CSR) y actualiza short con los ítems que cruzan el cero, así que cada
+movimiento es O(nnz de la fila) y la factibilidad y el cociente salen al
+instante:
+
+    factible  ⇔  short == 0  y  LB <= units <= UB  y  k > 0
+    cociente  =  units / k
+
+Los ``delta_*`` evalúan el movimiento sin aplicarlo (para elegir el mejor
+vecino); ``add_*`` / ``remove_*`` lo aplican.  ``wave()`` devuelve la ola
+en el formato de siempre ({"obj", "units", "aisles", "orders"}).
+
+Para probar un vecino sin copiar res/x/y: ``m = s.mark()``, moverse, y
+``s.undo(m)`` si no sirve (o ``s.commit(m)`` si se queda).  Las filas de
+la CSR como vistas se arman una vez por instancia (``row_views``).
+"""
+
+import numpy as np
+
+
+class RowViews:
+    """Filas de la CSR (órdenes y pasillos) como vistas, y las unidades como lista."""
+    def __init__(self, inst):
+        self.ord = [inst.order(o) for o in range(inst.O)]
+        self.ais = [inst.aisle(a) for a in range(inst.A)]
+        self.units = inst.units.tolist()
+
+
+def row_views(inst):
+    if not hasattr(inst, "_row_views"):
+        inst._row_views = RowViews(inst)
+    return inst._row_views
+
+
+class WaveState:
+    def __init__(self, inst, orders=(), aisles=()):
+        self.inst = inst
+        self.LB, self.UB = inst.LB, inst.UB
+        self.res   = np.zeros(inst.I, dtype=np.int64)
+        self.x     = np.zeros(inst.O, dtype=bool)
+        self.y     = np.zeros(inst.A, dtype=bool)
+        self.units = 0
+        self.k     = 0
+        self.short = 0
+        self.trail = None                    # movimientos desde mark(): (±1 orden / ±2 pasillo, índice)
+        # filas de la CSR como vistas, para no rebanar en cada movimiento
+        views = row_views(inst)
+        self._ord, self._ais, self._u = views.ord, views.ais, views.units
+        for a in aisles:
+            self.add_aisle(a)
+        for o in orders:
+            self.add_order(o)
+
+    # ---------------- consultas ------------------------------------------------
+    @property
+    def feasible(self):
+        return self.short == 0 and self.k > 0 and self.LB <= self.units <= self.UB
+
+    @property
+    def ratio(self):
+        return self.units / self.k if self.k else 0.0
+
+    def orders(self):
+        return set(np.flatnonzero(self.x).tolist())
+
+    def aisles(self):
+        return set(np.flatnonzero(self.y).tolist())
+
+    def fits(self, o):
+        """La orden o entra con el stock que sobra (sin mirar UB)."""
+        items, qty = self._ord[o]
+        return bool((self.res[items] >= qty).all())
+
+    def wave(self):
+        if not self.feasible:
+            return None
+        return {"obj": self.ratio, "units": self.units,
+                "aisles": self.aisles(), "orders": self.orders()}
+
+    # ---------------- movimientos ---------------------------------------------
+    def _shift(self, items, delta):
+        """res[items] += delta; actualiza short con los que cruzan el cero."""
+        r = self.res[items]
+        new = r + delta
+        self.short += int(np.count_nonzero(new < 0)) - int(np.count_nonzero(r < 0))
+        self.res[items] = new
+
+    def _short_after(self, items, delta):
+        r = self.res[items]
+        return self.short + int(np.count_nonzero(r + delta < 0)) - int(np.count_nonzero(r < 0))
+
+    def _answer(self, short, units, k):
+        ok = short == 0 and k > 0 and self.LB <= units <= self.UB
+        return ok, (units / k if k else 0.0)
+
+    def add_order(self, o):
+        if self.x[o]:
+            return self.feasible, self.ratio
+        items, qty = self._ord[o]
+        self._shift(items, -qty)
+        self.x[o] = True
+        self.units += self._u[o]
+        if self.trail is not None:
+            self.trail.append((1, o))
+        return self.feasible, self.ratio
+
+    def remove_order(self, o):
+        if not self.x[o]:
+            return self.feasible, self.ratio
+        items, qty = self._ord[o]
+        self._shift(items, qty)
+        self.x[o] = False
+        self.units -= self._u[o]
+        if self.trail is not None:
+            self.trail.append((-1, o))
+        return self.feasible, self.ratio
+
+    def add_aisle(self, a):
+        if self.y[a]:
+            return self.feasible, self.ratio
+        items, qty = self._ais[a]
+        self._shift(items, qty)
+        self.y[a] = True
+        self.k += 1
+        if self.trail is not None:
+            self.trail.append((2, a))
+        return self.feasible, self.ratio
+
+    def remove_aisle(self, a):
+        if not self.y[a]:
+            return self.feasible, self.ratio
+        items, qty = self._ais[a]
+        self._shift(items, -qty)
+        self.y[a] = False
+        self.k -= 1
+        if self.trail is not None:
+            self.trail.append((-2, a))
+        return self.feasible, self.ratio
+
+    # ---------------- deltas sin aplicar ----------------------------------------
+    def delta_add_order(self, o):
+        """(factible, cociente) si se agregara la orden o."""
+        if self.x[o]:
+            return self.feasible, self.ratio
+        items, qty = self._ord[o]
+        return self._answer(self._short_after(items, -qty), self.units + self._u[o], self.k)
+
+    def delta_remove_order(self, o):
+        if not self.x[o]:
+            return self.feasible, self.ratio
+        items, qty = self._ord[o]
+        return self._answer(self._short_after(items, qty), self.units - self._u[o], self.k)
+
+    def delta_add_aisle(self, a):
+        if self.y[a]:
+            return self.feasible, self.ratio
+        items, qty = self._ais[a]
+        return self._answer(self._short_after(items, qty), self.units, self.k + 1)
+
+    def delta_remove_aisle(self, a):
+        if not self.y[a]:
+            return self.feasible, self.ratio
+        items, qty = self._ais[a]
+        return self._answer(self._short_after(items, -qty), self.units, self.k - 1)
+
+    # ---------------- deshacer ------------------------------------------------
+    def mark(self):
+        """Empieza (o sigue) a anotar movimientos; devuelve la marca para ``undo``."""
+        if self.trail is None:
+            self.trail = []
+        return len(self.trail)
+
+    def undo(self, mark):
+        """
+        Deshace los movimientos hechos desde mark: las banderas y contadores
+        uno por uno (del último al primero) y res de una sola vez.
+        """
+        moves = self.trail[mark:]
+        del self.trail[mark:]
+        if moves:
+            items, qty = [], []
+            for kind, j in reversed(moves):
+                if kind in (1, -1):              # orden agregada (+1) o sacada (-1)
+                    it, q = self._ord[j]
+                    self.x[j] = kind < 0
+                    self.units -= kind * self._u[j]
+                    items.append(it); qty.append(q if kind > 0 else -q)
+                else:                            # pasillo agregado (+2) o sacado (-2)
+                    it, q = self._ais[j]
+                    self.y[j] = kind < 0
+                    self.k -= kind // 2
+                    items.append(it); qty.append(-q if kind > 0 else q)
+            np.add.at(self.res, np.concatenate(items), np.concatenate(qty))
+            self.short = int(np.count_nonzero(self.res < 0))
+        self.commit(mark)
+
+    def commit(self, mark):
+        """Se queda con los movimientos; en la marca de más afuera deja de anotar."""
+        if mark == 0:
+            self.trail = None
+
+    def copy(self):
+        new = object.__new__(WaveState)
+        new.__dict__.update(self.__dict__)
+        new.res, new.x, new.y = self.res.copy(), self.x.copy(), self.y.copy()
+        new.trail = None
+        return new
@@ -0,0 +1,123 @@
+"""
+Pricing por pasillo en paralelo
+-------------------------------
+Dados los duales de una ronda, el knapsack de cada pasillo es independiente
+de los demás.  ``AislePricer`` los reparte en un pool de procesos:
+
+  • al arrancar copia una sola vez los arreglos de la instancia (y el índice
+    de candidatos) a un bloque de ``multiprocessing.shared_memory``; cada
+    worker arma su ``Instance`` con vistas sobre ese bloque, sin copiar.
+  • por ronda sólo viaja el vector rc_o (largo O) y κ; cada worker resuelve
+    un bloque contiguo de pasillos con su propio motor.
+  • los resultados vuelven en orden de pasillo, igual que el loop secuencial,
+    así que las columnas que se agregan no dependen de cuántos workers haya.
+
+Con ``workers <= 1`` no se abre ningún proceso y se usa el motor local.
+"""
+
+import os, weakref
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from comun.instancia import Instance, ALIGN
+from comun.candidatos import CandidateIndex, candidate_index
+from comun.knapsack import make_engine
+from comun.pricing import price_aisle_cols
+
+INDEX_ARRAYS = ("fit_ptr", "fit_orders")
+
+
+def _to_shm(inst):
+    """Copia los arreglos de inst a un SharedMemory; devuelve (shm, layout)."""
+    idx = candidate_index(inst)
+    arrays = [(n, getattr(inst, n)) for n in Instance.ARRAYS] + \
+             [(n, getattr(idx, n)) for n in INDEX_ARRAYS]
+    layout, off = {}, 0
+    for name, arr in arrays:
+        layout[name] = (arr.dtype.str, off, int(arr.size))
+        off += -(-arr.nbytes // ALIGN) * ALIGN
+    shm = shared_memory.SharedMemory(create=True, size=max(off, 1))
+    for name, arr in arrays:
+        dt, o, n = layout[name]
+        np.ndarray(n, np.dtype(dt), shm.buf, o)[:] = arr
+    return shm, layout
+
+
+# ---------------- lado del worker -------------------------------------------
+_W = {}
+
+
+def _init_worker(shm_name, layout, dims, engine_name):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    arr = {name: np.ndarray(n, np.dtype(dt), shm.buf, off)
+           for name, (dt, off, n) in layout.items()}
+    core = [arr.pop(name) for name in Instance.ARRAYS[:6]]
+    fit  = [arr.pop(name) for name in INDEX_ARRAYS]
+    inst = Instance(*dims, *core, derived=arr)
+    inst._cand_index = CandidateIndex.from_arrays(inst, *fit)
+    _W.update(shm=shm, inst=inst, engine=make_engine(engine_name))
+
+
+def _price_chunk(args):
+    aisles, rc, dual_k, n_cols = args
+    inst, engine = _W["inst"], _W["engine"]
+    return [(a, price_aisle_cols(a, rc, dual_k, inst, engine, n_cols)) for a in aisles]
+
+
+# ---------------- lado del maestro ------------------------------------------
+def _shutdown(pool, shm):
+    if pool is not None:
+        pool.terminate()
+    if shm is not None:
+        shm.close()
+        shm.unlink()
+
+
+class AislePricer:
+    """
+    Resuelve ``price_aisle_cols`` para todos los pasillos de una ronda.
+
+    ``engine`` es el motor local (se usa tal cual con ``workers <= 1``); en
+    modo paralelo cada worker crea uno del mismo tipo (``engine.name``).
+    """
+
+    def __init__(self, inst, engine, workers=1):
+        self.inst, self.engine = inst, engine
+        self.workers = max(1, min(int(workers or 1), inst.A))
+        self._pool = self._shm = None
+        if self.workers > 1:
+            self._shm, layout = _to_shm(inst)
+            dims = (inst.O, inst.I, inst.A, inst.LB, inst.UB)
+            self._pool = mp.get_context().Pool(
+                self.workers, initializer=_init_worker,
+                initargs=(self._shm.name, layout, dims, engine.name))
+        self._finalizer = weakref.finalize(self, _shutdown, self._pool, self._shm)
+
+    def price(self, rc, dual_k, aisles=None, n_cols=1):
+        """
+        [(a, (órdenes, unidades, costo reducido))] con hasta n_cols columnas
+        de costo reducido positivo por pasillo (``price_aisle_cols``), en
+        orden creciente de pasillo.
+        """
+        aisles = list(range(self.inst.A) if aisles is None else aisles)
+        if self._pool is None:
+            res = [(a, price_aisle_cols(a, rc, dual_k, self.inst, self.engine, n_cols))
+                   for a in aisles]
+        else:
+            rc = np.ascontiguousarray(rc, dtype=float)
+            chunks = [c.tolist() for c in np.array_split(aisles, self.workers * 4) if len(c)]
+            res = [r for part in self._pool.map(_price_chunk,
+                                                [(c, rc, dual_k, n_cols) for c in chunks])
+                   for r in part]
+        return [(a, p) for a, cols in res for p in cols]
+
+    def close(self):
+        self._finalizer()
+
+
+def default_workers():
+    """Workers pedidos por la variable PRICING_WORKERS (0 = todos los núcleos)."""
+    n = int(os.environ.get("PRICING_WORKERS", "1"))
+    return (os.cpu_count() or 1) if n <= 0 else n
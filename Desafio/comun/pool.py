@@ -0,0 +1,91 @@
+"""
+Pool global de columnas
+-----------------------
+Una columna (pasillo a, órdenes S) es factible para cualquier k: sólo el
+RMP cambia con k.  ``ColumnPool`` guarda todas las columnas que se vieron
+(semillas y generadas) para reusarlas entre los RMP de distintos k.
+
+Cada columna ocupa un id entero; los metadatos van en arreglos paralelos
+(pasillo, unidades, órdenes en CSR) y la clave ``(a, frozenset(S))`` sólo
+se usa para no repetir.  Con los duales de una ronda el costo reducido de
+todo el pool sale de una suma acumulada sobre el vector rc_o.
+
+El pool es además el registro de columnas de los RMP: cada variable se
+llama ``c<id>`` y guarda su (pasillo, órdenes), así que la ola se lee de
+los metadatos y no de nombres con la lista de órdenes adentro.
+"""
+
+import numpy as np
+
+
+class ColumnPool:
+    def __init__(self, inst=None):
+        self.inst  = inst                    # para la cobertura (demanda por ítem)
+        self.index = {}                      # (a, frozenset(S)) -> id
+        self._aisle, self._units, self._ords = [], [], []
+        self._cov  = {}                      # id -> (ítems, cantidades), a demanda
+        self._arr = None                     # (aisle, units, ptr, flat), se rearma si crece
+
+    def __len__(self):
+        return len(self._aisle)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def add(self, a, orders, units):
+        """Agrega la columna si es nueva; devuelve su id."""
+        key = (a, frozenset(orders))
+        cid = self.index.get(key)
+        if cid is None:
+            cid = self.index[key] = len(self._aisle)
+            self._aisle.append(a)
+            self._units.append(int(units))
+            self._ords.append(np.asarray(sorted(orders), dtype=np.int32))
+            self._arr = None
+        return cid
+
+    def column(self, cid):
+        """(pasillo, órdenes, unidades) de la columna cid."""
+        return self._aisle[cid], self._ords[cid].tolist(), self._units[cid]
+
+    def coverage(self, cid):
+        """Demanda agregada de la columna cid: (ítems, cantidades)."""
+        cov = self._cov.get(cid)
+        if cov is None:
+            cov = self._cov[cid] = self.inst.demand_of(self._ords[cid].tolist())
+        return cov
+
+    def _arrays(self):
+        if self._arr is None:
+            ptr = np.zeros(len(self._ords) + 1, dtype=np.int64)
+            np.cumsum([len(x) for x in self._ords], out=ptr[1:])
+            flat = np.concatenate(self._ords) if self._ords else np.empty(0, np.int32)
+            self._arr = (np.asarray(self._aisle), np.asarray(self._units), ptr, flat)
+        return self._arr
+
+    def reduced_costs(self, rc, dual_k):
+        """Costo reducido Σ_{o∈S} rc_o - κ de cada columna del pool."""
+        _, _, ptr, flat = self._arrays()
+        vals = np.concatenate([[0.0], np.cumsum(np.asarray(rc, dtype=float)[flat])])
+        return vals[ptr[1:]] - vals[ptr[:-1]] - dual_k
+
+    def best(self, rc, dual_k, skip=(), limit=None, eps=1e-6):
+        """
+        Columnas del pool con costo reducido > eps que no estén en ``skip``
+        (claves ya presentes en el RMP), de mayor a menor costo reducido:
+        [(a, órdenes, unidades, costo reducido)].
+        """
+        if not self._aisle:
+            return []
+        red  = self.reduced_costs(rc, dual_k)
+        cand = np.flatnonzero(red > eps)
+        cand = cand[np.argsort(-red[cand], kind="stable")]
+        out = []
+        for cid in cand.tolist():
+            a, orders, units = self.column(cid)
+            if (a, frozenset(orders)) in skip:
+                continue
+            out.append((a, orders, units, float(red[cid])))
+            if limit is not None and len(out) >= limit:
+                break
+        return out
@@ -0,0 +1,119 @@
+"""
+Presolve de la instancia
+------------------------
+Antes de modelar se saca de la instancia lo que nunca puede estar en una ola:
+
+  • órdenes que piden de algún ítem más que el stock total de todos los
+    pasillos, u órdenes que solas ya superan UB;
+  • ítems que ninguna de las órdenes restantes pide;
+  • pasillos que no tienen ninguno de los ítems pedidos.
+
+``presolve(inst)`` devuelve la instancia reducida (renumerada 0..n-1) y una
+``Reduction`` con los mapas nuevo → original de órdenes, ítems y pasillos.
+Todos los modelos trabajan con la reducida; la ola se devuelve a índices
+originales con ``Reduction.to_original`` justo antes de escribirla.
+
+Si no hay nada que sacar se devuelve la misma instancia (con su cache mmap).
+"""
+
+import numpy as np
+
+from comun.instancia import Instance, load_instance, IDX, PTR
+
+
+class Reduction:
+    def __init__(self, orig, inst, ord_map, item_map, ais_map):
+        self.orig, self.inst = orig, inst
+        self.ord_map, self.item_map, self.ais_map = ord_map, item_map, ais_map
+        self.stats = {}
+
+    @classmethod
+    def identity(cls, inst):
+        return cls(inst, inst, np.arange(inst.O), np.arange(inst.I), np.arange(inst.A))
+
+    def orders(self, idx):
+        """Órdenes de la reducida → índices originales."""
+        return {int(self.ord_map[o]) for o in idx}
+
+    def aisles(self, idx):
+        """Pasillos de la reducida → índices originales."""
+        return {int(self.ais_map[a]) for a in idx}
+
+    def to_original(self, sol):
+        """
+        Copia de la ola con pasillos y órdenes en índices originales (en el
+        mismo tipo de contenedor: set o lista ordenada).
+        """
+        if not sol:
+            return sol
+        back = lambda ids, like: ids if isinstance(like, set) else sorted(ids)
+        return dict(sol, aisles=back(self.aisles(sol["aisles"]), sol["aisles"]),
+                    orders=back(self.orders(sol["orders"]), sol["orders"]))
+
+    def summary(self):
+        o, i, a = self.orig, self.inst, self.stats
+        return (f"[presolve] O {o.O}->{i.O} I {o.I}->{i.I} A {o.A}->{i.A} "
+                f"(órdenes sin stock={a.get('no_stock', 0)} >UB={a.get('over_ub', 0)}, "
+                f"pasillos sin ítems pedidos={a.get('idle_aisles', 0)})")
+
+
+def _select(ptr, idx, val, keep_rows, col_map):
+    """CSR con sólo las filas keep_rows y columnas renumeradas (col_map = -1: fuera)."""
+    lens = np.diff(ptr)
+    rows = np.repeat(np.arange(len(lens)), lens)
+    new_col = col_map[idx]
+    nz = keep_rows[rows] & (new_col >= 0)
+    new_ptr = np.zeros(int(keep_rows.sum()) + 1, dtype=PTR)
+    np.cumsum(np.bincount(rows[nz], minlength=len(lens))[keep_rows], out=new_ptr[1:])
+    return new_ptr, new_col[nz].astype(IDX), val[nz].astype(IDX)
+
+
+def _renumber(mask):
+    m = np.full(len(mask), -1, dtype=np.int64)
+    m[mask] = np.arange(int(mask.sum()))
+    return m
+
+
+def presolve(inst, log=print):
+    """Devuelve (instancia reducida, Reduction)."""
+    O, I, A = inst.O, inst.I, inst.A
+
+    # órdenes: cada ítem dentro del stock total y unidades <= UB
+    supply  = np.bincount(inst.ais_items, weights=inst.ais_qty, minlength=I)
+    bad_nz  = inst.ord_qty > supply[inst.ord_items]
+    no_stock = np.bincount(inst.ord_rows[bad_nz], minlength=O) > 0
+    over_ub  = inst.units > inst.UB
+    keep_o = ~(no_stock | over_ub)
+
+    # ítems pedidos por alguna orden que queda
+    keep_i = np.bincount(inst.ord_items[keep_o[inst.ord_rows]], minlength=I) > 0
+
+    # pasillos con stock de algún ítem pedido
+    ais_rows = np.repeat(np.arange(A), np.diff(inst.ais_ptr))
+    useful   = keep_i[inst.ais_items] & (inst.ais_qty > 0)
+    keep_a = np.bincount(ais_rows[useful], minlength=A) > 0
+
+    if keep_o.all() and keep_i.all() and keep_a.all():
+        red = Reduction.identity(inst)
+    else:
+        item_map = _renumber(keep_i)
+        orders = _select(inst.ord_ptr, inst.ord_items, inst.ord_qty, keep_o, item_map)
+        aisles = _select(inst.ais_ptr, inst.ais_items, inst.ais_qty, keep_a, item_map)
+        small = Instance(int(keep_o.sum()), int(keep_i.sum()), int(keep_a.sum()),
+                         inst.LB, inst.UB, *orders, *aisles)
+        red = Reduction(inst, small, np.flatnonzero(keep_o),
+                        np.flatnonzero(keep_i), np.flatnonzero(keep_a))
+        if inst.cache_path:                      # derivados de la reducida: <bin>.red.*
+            small.cache_path = inst.cache_path + ".red"
+
+    red.stats = {"no_stock": int(no_stock.sum()),
+                 "over_ub": int((over_ub & ~no_stock).sum()),
+                 "idle_aisles": int((~keep_a).sum())}
+    if log:
+        log(red.summary())
+    return red.inst, red
+
+
+def load_reduced(fname, log=print):
+    """``load_instance`` + ``presolve``: (instancia reducida, Reduction)."""
+    return presolve(load_instance(fname), log)
@@ -0,0 +1,148 @@
+"""
+Pricing de columnas (pasillo, subconjunto de órdenes)
+-----------------------------------------------------
+El costo reducido de una columna del pasillo a con órdenes S es
+
+    Σ_{o∈S} rc_o  - κ        con  rc_o = u_o - Σ_i π_i d_oi - (λ+μ) u_o - σ_o
+
+y rc_o no depende de a.  Por eso el pricing se hace en dos pasos:
+
+  1. ``reduced_costs``  – una vez por ronda, producto ralo D·π sobre los duales.
+  2. ``price_aisle``    – por pasillo, knapsack sobre el vector compartido.
+
+``price_column`` queda como atajo de los dos pasos para un único pasillo.
+El knapsack lo resuelve un motor de comun/knapsack.py.
+
+``price_aisle_cols`` devuelve hasta n_cols columnas del pasillo con costo reducido positivo, todas con LB <= unidades <= UB:
+
+  • la óptima del knapsack;
+  • las otras soluciones que vio el motor (``engine.last_pool``);
+  • la óptima completada greedy con órdenes (de mayor a menor rc_o) que
+    todavía entran, mientras el costo reducido siga positivo;
+  • vecinos por quitar una orden de la óptima y completar greedy sin ella.
+
+Se eligen de mayor a menor costo reducido salteando las que se parecen
+demasiado (Jaccard > ``MAX_OVERLAP``) a una ya elegida, así cada re-solve
+del RMP recibe columnas distintas y no variaciones de una sola.  Cuántas
+por pasillo se toma de COLS_PER_AISLE (default 3; 1 = una sola, como antes).
+"""
+
+import os
+import numpy as np
+
+from comun.knapsack import make_engine
+from comun.candidatos import candidate_index
+
+CAP = 1e+09          # tope a |rc_o| para no pasarle inf/nan a SCIP
+
+
+def reduced_costs(inst, dual_cov, dual_lb, dual_ub, dual_order):
+    """Vector rc_o (largo O) para los duales de la ronda actual."""
+    units = inst.units.astype(float)
+    rc  = units.copy()                            # + u_o
+    rc -= inst.demand_dot(dual_cov)               # - Σ_i π_i d_oi
+    rc -= units * (dual_lb + dual_ub)             # - (λ+μ) u_o
+    rc -= np.asarray(dual_order, dtype=float)     # - σ_o
+    rc[np.isnan(rc)] = -CAP
+    return np.clip(rc, -CAP, CAP)
+
+
+def price_aisle(a, rc, dual_k, inst, engine=None):
+    """
+    Mejor columna del pasillo a dado el vector rc de ``reduced_costs``.
+    ``engine`` es un motor de comun/knapsack.py (por defecto branch-and-bound).
+    Devuelve (órdenes, unidades, costo reducido) o None si no mejora o si
+    no tiene órdenes (con LB <= 0 y κ < 0 el vacío puede "mejorar").
+    """
+    engine = _default_engine() if engine is None else engine
+    res = engine.solve(a, rc, inst)
+    if res is None:
+        return None
+    sel, val = res
+    red_cost = val - dual_k
+    if not sel or red_cost <= 1e-6:
+        return None
+    return sel, inst.units_of(sel), red_cost
+
+
+MAX_OVERLAP = 0.8    # Jaccard máximo entre dos columnas de un mismo pasillo y ronda
+
+
+def _complete(a, sel, rc, dual_k, inst, skip=(), min_rc=0.0):
+    """
+    Completa sel con órdenes que entran en lo que queda del pasillo a (de
+    mayor a menor rc_o, con rc_o > min_rc) sin que el costo reducido deje
+    de ser positivo.  Devuelve (órdenes, unidades, costo reducido).
+    """
+    cap = inst.supply_row(a)
+    for o in sel:
+        items, qty = inst.order(o)
+        cap[items] -= qty
+    sel, tot = list(sel), inst.units_of(sel)
+    val = float(rc[sel].sum()) if sel else 0.0
+    taken = set(sel) | set(skip)
+    fit = candidate_index(inst).orders_for(a)
+    fit = fit[rc[fit] > min_rc]
+    for o in fit[np.argsort(-rc[fit], kind="stable")].tolist():
+        u = int(inst.units[o])
+        if o in taken or tot + u > inst.UB or val + rc[o] - dual_k <= 1e-6:
+            continue
+        items, qty = inst.order(o)
+        if (qty <= cap[items]).all():
+            cap[items] -= qty
+            sel.append(o); tot += u; val += rc[o]
+    return sorted(sel), tot, val - dual_k
+
+
+def price_aisle_cols(a, rc, dual_k, inst, engine=None, n_cols=1):
+    """
+    Hasta n_cols columnas distintas del pasillo a con costo reducido
+    positivo: [(órdenes, unidades, costo reducido)], la mejor primero.
+    """
+    engine = _default_engine() if engine is None else engine
+    rc = np.asarray(rc, dtype=float)
+    best = price_aisle(a, rc, dual_k, inst, engine)
+    if best is None:
+        return []
+    if n_cols <= 1:
+        return [best]
+    sel = best[0]
+    cands = [best]
+    cands += [(p, inst.units_of(p), v - dual_k) for p, v in getattr(engine, "last_pool", [])]
+    cands.append(_complete(a, sel, rc, dual_k, inst, min_rc=-np.inf))
+    for o in sorted(sel, key=lambda o: rc[o])[:n_cols]:       # quitar primero las que menos aportan
+        rest = [p for p in sel if p != o]
+        cands.append(_complete(a, rest, rc, dual_k, inst, skip=(o,)))
+
+    out, seen = [], set()
+    for cols, units, red in sorted(cands, key=lambda c: -c[2]):
+        key = frozenset(cols)
+        if (red <= 1e-6 or not cols or key in seen
+                or not inst.LB <= units <= inst.UB):
+            continue
+        if any(len(key & s) > MAX_OVERLAP * len(key | s) for s in seen):
+            continue
+        seen.add(key)
+        out.append((sorted(cols), units, red))
+        if len(out) == n_cols:
+            break
+    return out
+
+
+def default_cols_per_aisle():
+    """Columnas por pasillo y ronda según la variable COLS_PER_AISLE (default 3)."""
+    return max(1, int(os.environ.get("COLS_PER_AISLE", "3")))
+
+
+def price_column(a, dual_cov, dual_lb, dual_ub, dual_k, dual_order, inst, engine=None):
+    rc = reduced_costs(inst, dual_cov, dual_lb, dual_ub, dual_order)
+    return price_aisle(a, rc, dual_k, inst, engine)
+
+
+_ENGINE = None
+
+def _default_engine():
+    global _ENGINE
+    if _ENGINE is None:
+        _ENGINE = make_engine()
+    return _ENGINE
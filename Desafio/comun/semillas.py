@@ -0,0 +1,152 @@
+"""
+Columnas semilla greedy para todos los pasillos
+-----------------------------------------------
+La semilla de un pasillo a es el greedy de siempre: recorrer las órdenes que
+entran solas en a (índice de candidatos) en un orden fijo y tomar cada una
+que todavía entra en el stock que queda, sin pasar UB.
+
+``greedy_seeds`` las arma para todos los pasillos de una vez:
+
+  • el orden de las órdenes se calcula una sola vez para la instancia
+    (``order_rank``) y los candidatos de cada pasillo se ordenan con ese
+    rango, sin volver a ordenar todas las órdenes por pasillo;
+  • la prueba "entra" mira sólo los no-ceros de la orden (su fila de la
+    CSR) contra el stock que queda del pasillo.
+
+Criterios de orden:
+  "units": más unidades primero (Columns);
+  "dens":  más unidades por ítem distinto primero, y después más unidades
+           (Solver).
+
+Con ``rounds`` > 1 se arman varias semillas disjuntas por pasillo: cada
+ronda saltea las órdenes que ya tomaron las anteriores.
+
+Las semillas no dependen de k: ``cached_seeds`` las calcula una vez por
+instancia (quedan colgadas de ella, como el índice de candidatos) y, si
+se pide (``persist`` o SEED_CACHE=1), las guarda al lado del cache binario
+de la instancia (``<bin>.<etiqueta>.seeds.npz``) para los procesos y
+corridas siguientes.
+"""
+
+import os
+import numpy as np
+
+from comun.candidatos import candidate_index
+
+
+def order_rank(inst, by="units"):
+    """Posición de cada orden en el recorrido greedy."""
+    O = inst.O
+    units = inst.units.astype(float)
+    if by == "units":
+        perm = np.argsort(-units, kind="stable")
+    elif by == "dens":
+        dens = units / np.maximum(np.diff(inst.ord_ptr), 1)
+        perm = np.lexsort((np.arange(O), -units, -dens))
+    else:
+        raise ValueError(f"criterio de orden desconocido: {by}")
+    rank = np.empty(O, dtype=np.int64)
+    rank[perm] = np.arange(O)
+    return rank
+
+
+def greedy_seeds(inst, by="units", rounds=1, aisles=None):
+    """
+    Semillas de los pasillos de ``aisles`` (todos si es None).  Devuelve una
+    lista de largo A con [(órdenes, unidades), ...] por pasillo (vacía para
+    los que no se pidieron o no tienen ninguna orden que entre).
+    """
+    cand  = candidate_index(inst)
+    rank  = order_rank(inst, by)
+    units = inst.units.tolist()
+    ptr, items_all, qty_all = inst.ord_ptr, inst.ord_items, inst.ord_qty
+    UB = inst.UB
+
+    seeds = [[] for _ in range(inst.A)]
+    for a in (range(inst.A) if aisles is None else aisles):
+        fit = cand.orders_for(a)
+        if not len(fit):
+            continue
+        fit = fit[np.argsort(rank[fit], kind="stable")].tolist()
+        cap = inst.supply_row(a)
+        used = set()
+        for _ in range(rounds):
+            left = cap.copy()
+            sel, tot = [], 0
+            for o in fit:
+                u = units[o]
+                if o in used or tot + u > UB:
+                    continue
+                s, e = ptr[o], ptr[o + 1]
+                items, qty = items_all[s:e], qty_all[s:e]
+                if (qty <= left[items]).all():
+                    sel.append(o); tot += u
+                    left[items] -= qty
+                if tot == UB:
+                    break
+            if not sel:
+                break
+            seeds[a].append((sel, tot))
+            used.update(sel)
+    return seeds
+
+
+# ---------------- cache --------------------------------------------------------
+def default_persist():
+    """Guardar semillas en disco según la variable SEED_CACHE (1 = sí)."""
+    return os.environ.get("SEED_CACHE", "0") == "1"
+
+
+def _pack(seeds):
+    aisle = [a for a, pats in enumerate(seeds) for _ in pats]
+    units = [u for pats in seeds for _, u in pats]
+    lens  = [len(o) for pats in seeds for o, _ in pats]
+    flat  = [o for pats in seeds for sel, _ in pats for o in sel]
+    ptr = np.zeros(len(lens) + 1, dtype=np.int64)
+    np.cumsum(lens, out=ptr[1:])
+    return {"aisle": np.array(aisle, dtype=np.int64), "units": np.array(units, dtype=np.int64),
+            "ptr": ptr, "flat": np.array(flat, dtype=np.int64)}
+
+
+def _unpack(arr, A):
+    seeds = [[] for _ in range(A)]
+    ptr, flat = arr["ptr"], arr["flat"].tolist()
+    for j, (a, u) in enumerate(zip(arr["aisle"].tolist(), arr["units"].tolist())):
+        seeds[a].append((flat[ptr[j]:ptr[j + 1]], u))
+    return seeds
+
+
+def cached_seeds(inst, tag, build, persist=None):
+    """
+    Semillas [(órdenes, unidades), ...] por pasillo de la etiqueta ``tag``:
+    de memoria, del disco o de ``build()`` (que se llama una sola vez).
+    """
+    if not hasattr(inst, "_seeds"):
+        inst._seeds = {}
+    memo = inst._seeds
+    if tag in memo:
+        return memo[tag]
+    persist = default_persist() if persist is None else persist
+    path = inst.cache_path and f"{inst.cache_path}.{tag}.seeds.npz"
+    if persist and path and os.path.exists(path):
+        try:
+            with np.load(path) as arr:
+                memo[tag] = _unpack(arr, inst.A)
+            return memo[tag]
+        except (ValueError, KeyError, OSError):
+            pass                                 # archivo roto: se recalcula
+    memo[tag] = build()
+    if persist and path:
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        try:
+            np.savez(tmp, **_pack(memo[tag]))
+            os.replace(tmp, path)
+        except OSError:
+            pass
+    return memo[tag]
+
+
+def seed_columns(inst, by="units", rounds=1, persist=None):
+    """``greedy_seeds`` de todos los pasillos, calculado una vez por instancia."""
+    return cached_seeds(inst, f"greedy-{by}-{rounds}",
+                        lambda: greedy_seeds(inst, by, rounds), persist)
@@ -0,0 +1,97 @@
+"""
+Motores de knapsack contra fuerza bruta en instancias chicas al azar.
+
+El stock de cada pasillo alcanza para algunas órdenes pero no para todas,
+así el stock ata y BranchBoundEngine va por el branch-and-bound y no por
+el DP.  Correr desde Desafio/:  python -m pytest -q comun/test_knapsack.py
+"""
+
+from itertools import combinations
+import numpy as np
+
+from comun.instancia import _parse_text
+from comun.knapsack import BranchBoundEngine, ScipEngine, fitting_orders
+
+N_INST = 300
+
+
+def _random_instance(rng):
+    O, I, A = int(rng.integers(4, 11)), int(rng.integers(2, 5)), 2
+    lines = [f"{O} {I} {A}"]
+    for _ in range(O):
+        items = rng.choice(I, size=int(rng.integers(1, I + 1)), replace=False)
+        lines.append(" ".join([str(len(items))] +
+                              [f"{i} {int(rng.integers(1, 4))}" for i in items]))
+    for _ in range(A):                   # poco stock: no entran todas a la vez
+        lines.append(" ".join([str(I)] + [f"{i} {int(rng.integers(1, 6))}" for i in range(I)]))
+    LB = int(rng.integers(0, 6))
+    UB = LB + int(rng.integers(2, 15))
+    lines.append(f"{LB} {UB}")
+    return _parse_text("\n".join(lines))
+
+
+def _fits(inst, a, sel):
+    items, need = inst.demand_of(list(sel))
+    return (need <= inst.supply_row(a)[items]).all()
+
+
+def _brute(inst, a, profit):
+    """Mejor valor de un subconjunto que entra en a con LB <= unidades <= UB."""
+    orders = fitting_orders(a, inst).tolist()
+    best = None
+    for r in range(len(orders) + 1):
+        for sel in combinations(orders, r):
+            u = inst.units_of(list(sel))
+            if not inst.LB <= u <= inst.UB or (sel and not _fits(inst, a, sel)):
+                continue
+            val = float(profit[list(sel)].sum()) if sel else 0.0
+            if best is None or val > best + 1e-9:
+                best = val
+    return best
+
+
+def _check(engine, inst, a, profit, want):
+    res = engine.solve(a, profit, inst)
+    if want is None:
+        assert res is None
+        return
+    assert res is not None
+    sel, val = res
+    assert abs(val - want) < 1e-6
+    assert abs(float(profit[sel].sum()) - val) < 1e-6
+    assert inst.LB <= inst.units_of(sel) <= inst.UB
+    assert not sel or _fits(inst, a, sel)
+    for p, v in engine.last_pool:            # el pool también es factible
+        assert inst.LB <= inst.units_of(p) <= inst.UB and (not p or _fits(inst, a, p))
+        assert abs(float(profit[p].sum()) - v) < 1e-6 and v <= val + 1e-6
+
+
+def test_branch_bound_vs_brute_force():
+    rng = np.random.default_rng(2025)
+    bb = BranchBoundEngine()
+    for _ in range(N_INST):
+        inst = _random_instance(rng)
+        profit = rng.uniform(-3, 5, inst.O)
+        for a in range(inst.A):
+            _check(bb, inst, a, profit, _brute(inst, a, profit))
+    assert bb.stats["solves"] > bb.stats["dp"] + N_INST   # la mayoría por branch-and-bound
+
+
+def test_fallback_vs_brute_force():
+    """Con tope de nodos mínimo el branch-and-bound delega en SCIP."""
+    rng = np.random.default_rng(7)
+    bb = BranchBoundEngine(node_limit=1)
+    for _ in range(30):
+        inst = _random_instance(rng)
+        profit = rng.uniform(-3, 5, inst.O)
+        _check(bb, inst, 0, profit, _brute(inst, 0, profit))
+    assert bb.stats["fallback"] > 0
+
+
+def test_scip_vs_brute_force():
+    rng = np.random.default_rng(11)
+    scip = ScipEngine()
+    for _ in range(30):
+        inst = _random_instance(rng)
+        profit = rng.uniform(-3, 5, inst.O)
+        _check(scip, inst, 0, profit, _brute(inst, 0, profit))
@@ -0,0 +1,94 @@
+"""
+WaveState contra el verificador completo: cada ``delta_*`` tiene que dar lo
+mismo que aplicar el movimiento y verificar la ola desde cero, y ``undo``
+tiene que dejar res/x/y/contadores exactamente como estaban.
+Correr desde Desafio/:  python -m pytest -q comun/test_ola.py
+"""
+
+import os, random
+import numpy as np
+
+from comun.instancia import read_instance
+from comun.ola import WaveState
+from comun.verificador import check
+from comun.busqueda_local import LocalSearch
+
+INST = read_instance(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  "..", "PrimeraParte", "input_0001.txt"))
+N_MOVES = 400
+
+
+def _full(s):
+    """(factible, cociente) de la ola de s verificada desde cero."""
+    r = check(INST, s.orders(), s.aisles())
+    k = len(s.aisles())
+    return r["feasible"], (r["units"] / k if k else 0.0)
+
+
+def _snapshot(s):
+    return s.res.copy(), s.x.copy(), s.y.copy(), s.units, s.k, s.short
+
+
+def _same(a, b):
+    return all(np.array_equal(u, v) if isinstance(u, np.ndarray) else u == v
+               for u, v in zip(a, b))
+
+
+def _random_move(s, rng):
+    if rng.random() < 0.5:
+        o = rng.randrange(INST.O)
+        return ("remove_order" if s.x[o] else "add_order"), o
+    a = rng.randrange(INST.A)
+    return ("remove_aisle" if s.y[a] else "add_aisle"), a
+
+
+def test_deltas_match_full_check():
+    rng = random.Random(0)
+    ls = LocalSearch(INST)
+    s = ls.fill(WaveState(INST, (), rng.sample(range(INST.A), 10)))
+    seen = set()
+    for it in range(N_MOVES):
+        if it % 10 == 0:                                    # volver cerca de factible
+            ls.fill(ls.repair(s))
+        name, j = _random_move(s, rng)
+        before = _snapshot(s)
+        ok, ratio = getattr(s, "delta_" + name)(j)
+        assert _same(before, _snapshot(s))                  # delta no toca el estado
+        got = getattr(s, name)(j)
+        want = _full(s)
+        assert (ok, ratio) == got
+        assert ok == want[0] and abs(ratio - want[1]) < 1e-9
+        assert s.short == int(np.count_nonzero(s.res < 0))
+        seen.add(ok)
+    assert seen == {True, False}                            # pasó por los dos casos
+
+
+def test_undo_restores_state():
+    rng = random.Random(1)
+    s = WaveState(INST, rng.sample(range(INST.O), 15), rng.sample(range(INST.A), 5))
+    for _ in range(50):
+        before = _snapshot(s)
+        m = s.mark()
+        for _ in range(rng.randint(1, 30)):
+            name, j = _random_move(s, rng)
+            getattr(s, name)(j)
+        s.undo(m)
+        assert _same(before, _snapshot(s)) and s.trail is None
+        assert _full(s) == (s.feasible, s.ratio)
+        name, j = _random_move(s, rng)                      # seguir desde otro estado
+        getattr(s, name)(j)
+
+
+def test_local_search_move_undone():
+    """Un vecino que no mejora deja la ola igual; uno que mejora queda aplicado."""
+    ls = LocalSearch(INST)
+    s = ls.fill(WaveState(INST, (), range(INST.A)))         # todos los pasillos: factible y malo
+    assert s.feasible
+    for a in np.flatnonzero(s.y).tolist():
+        before = _snapshot(s)
+        t = ls._try(s, a)
+        if t is None:
+            assert _same(before, _snapshot(s))
+        else:
+            assert t is s and s.feasible and s.ratio > before[3] / before[4]
+            assert _full(s) == (True, s.ratio)
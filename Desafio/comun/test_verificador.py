@@ -0,0 +1,116 @@
+"""
+Verificador: los tres formatos de solución, los motivos de infactibilidad y
+los .sol que dejan los run_experimento.py.
+Correr desde Desafio/:  python -m pytest -q comun/test_verificador.py
+"""
+
+import os, json, importlib.util
+
+from comun.instancia import _parse_text
+from comun.verificador import check, read_solution, check_dir
+
+# 3 órdenes, 2 ítems, 2 pasillos; LB = 2, UB = 5
+#   o0: 2 del ítem 0            a0: 3 del ítem 0
+#   o1: 1 del ítem 1            a1: 1 del ítem 0, 2 del ítem 1
+#   o2: 3 del ítem 0, 1 del 1
+TEXT = """3 2 2
+1 0 2
+1 1 1
+2 0 3 1 1
+1 0 3
+2 0 1 1 2
+2 5
+"""
+INST = _parse_text(TEXT)
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def _write(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def test_feasible_wave():
+    r = check(INST, {0, 1}, {0, 1})
+    assert r["feasible"] and r["units"] == 3 and r["obj"] == 1.5 and r["reason"] == ""
+
+
+def test_over_stock():
+    r = check(INST, [2], [0])                    # el ítem 1 no está en a0
+    assert not r["feasible"] and r["obj"] is None
+    assert "sin stock" in r["reason"] and "ítem 1: 1 > 0" in r["reason"]
+
+
+def test_units_out_of_range():
+    low  = check(INST, [1], [1])                 # 1 unidad < LB
+    high = check(INST, [0, 2], [0, 1])           # 6 unidades > UB
+    for r, u in ((low, 1), (high, 6)):
+        assert not r["feasible"] and r["units"] == u
+        assert "fuera de [2,5]" in r["reason"]
+
+
+def test_index_out_of_range():
+    assert "orden fuera de rango" in check(INST, [3], [0])["reason"]
+    assert "pasillo fuera de rango" in check(INST, [0], [2])["reason"]
+
+
+def test_read_desafio(tmp_path):
+    f = _write(tmp_path / "instance_0001.sol", "2\n0\n1\n2\n0\n1\n")
+    assert read_solution(f) == ("desafio", [0, 1], [0, 1])
+
+
+def test_read_json(tmp_path):
+    sol = {"obj": 1.5, "units": 3, "orders": [0, 1], "aisles": [0, 1]}
+    f = _write(tmp_path / "instance_0001.sol", json.dumps(sol))
+    assert read_solution(f) == ("json", [0, 1], [0, 1])
+    f = _write(tmp_path / "instance_0002.sol", "null")
+    assert read_solution(f) == ("json", None, None)
+
+
+def test_read_vars(tmp_path):
+    f = _write(tmp_path / "instance_0001.out", "x_0 1\nx_1 0\ny_0 1\ny_1 1.0\ny_2 0\n")
+    assert read_solution(f) == ("vars", [0, 1], [0])
+
+
+def test_read_other(tmp_path):
+    f = _write(tmp_path / "instance_0001.sol", "SCIP Status : time limit\n")
+    assert read_solution(f) == ("otro", None, None)
+
+
+def test_check_dir(tmp_path):
+    data, out = tmp_path / "datos", tmp_path / "out"
+    data.mkdir(); out.mkdir()
+    _write(data / "instance_0001.txt", TEXT)
+    _write(out / "instance_0001.sol", "2\n0\n1\n2\n0\n1\n")
+    _write(out / "instance_0001.out", "x_0 1\ny_2 1\n")          # falta el ítem 1
+    _write(out / "instance_0009.sol", "1\n0\n1\n0\n")             # sin instancia
+    rows = {r["file"]: r for r in check_dir(str(out), str(data), log=None)}
+    assert rows["instance_0001.sol"]["feasible"]
+    assert not rows["instance_0001.out"]["feasible"]
+    assert "sin stock" in rows["instance_0001.out"]["reason"]
+    assert rows["instance_0009.sol"]["reason"] == "sin instancia"
+
+
+def _runner(parte):
+    spec = importlib.util.spec_from_file_location(
+        f"run_{parte}", os.path.join(ROOT, parte, "run_experimento.py"))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)                 # sin correr el __main__
+    return mod
+
+
+def test_runner_solutions(tmp_path):
+    """Los runners dejan la ola en el .sol y check_dir la verifica."""
+    runs = [("SextaParte", "columns.py", "instance_0001.txt"),
+            ("SeptimaParte", "modelo_competencia.py", "instance_0001_a.txt")]
+    for parte, solver, inst in runs:
+        out = tmp_path / parte
+        out.mkdir()
+        data = os.path.join(ROOT, parte, "datasets", "a")     # el inPath del .cfg
+        stdout, _ = _runner(parte).run_one(os.path.join(ROOT, parte, solver),
+                                           os.path.join(data, inst), 3, str(out))
+        assert "METRICS" in stdout
+        rows = check_dir(str(out), data, log=None)
+        assert len(rows) == 1 and rows[0]["format"] == "json"
+        assert rows[0]["instance"] == inst
+        assert rows[0]["feasible"], rows[0]["reason"]
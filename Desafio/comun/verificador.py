@@ -0,0 +1,184 @@
+"""
+Verificador de olas
+-------------------
+Con la ola como dos vectores 0/1 (x sobre órdenes, y sobre pasillos) la
+factibilidad son dos productos ralos contra las CSR de la instancia:
+
+    demanda = Dᵀx      stock = Sᵀy      (vectores de largo I)
+
+y la ola es factible si LB <= Σ u_o x_o <= UB y demanda <= stock.  Cada
+producto es un ``bincount`` sobre los no-ceros, sin recorrer órdenes ni
+pasillos en Python.
+
+Formatos de solución que se reconocen (``read_solution``):
+
+  • el del desafío: #órdenes, una orden por línea, #pasillos, un pasillo
+    por línea;
+  • el JSON que escriben columns.py / modelo_competencia.py
+    ({"obj", "aisles", "orders"}, o null si no hubo ola);
+  • el .out de la parte 4 (``x_a v`` / ``y_o v``).
+
+Modo lote: ``check_dir(out_dir, data_dir)`` verifica todos los .sol/.out
+de una carpeta contra sus instancias (cada instancia se lee una vez) y
+devuelve una fila por archivo; ``write_report`` la guarda en JSON o CSV.
+"""
+
+import os, re, csv, glob, json
+import numpy as np
+
+from comun.instancia import load_instance
+
+FIELDS = ("file", "instance", "format", "feasible", "units", "orders",
+          "aisles", "obj", "reason")
+
+
+def _mask(idx, n):
+    m = np.zeros(n, dtype=bool)
+    m[idx] = True
+    return m
+
+
+def check(inst, orders, aisles):
+    """
+    Verifica la ola (órdenes, pasillos) en ``inst``.  Devuelve un dict con
+    feasible, units, orders, aisles, obj (None si no es factible) y reason.
+    """
+    orders = np.unique(np.asarray(list(orders), dtype=np.int64))
+    aisles = np.unique(np.asarray(list(aisles), dtype=np.int64))
+    res = {"feasible": False, "units": 0, "orders": len(orders),
+           "aisles": len(aisles), "obj": None, "reason": ""}
+
+    if ((orders < 0) | (orders >= inst.O)).any():
+        res["reason"] = f"orden fuera de rango (O={inst.O})"
+        return res
+    if ((aisles < 0) | (aisles >= inst.A)).any():
+        res["reason"] = f"pasillo fuera de rango (A={inst.A})"
+        return res
+
+    x, y = _mask(orders, inst.O), _mask(aisles, inst.A)
+    ais_rows = np.repeat(np.arange(inst.A), np.diff(inst.ais_ptr))
+    need = np.bincount(inst.ord_items, weights=x[inst.ord_rows] * inst.ord_qty,
+                       minlength=inst.I)                                  # Dᵀx
+    have = np.bincount(inst.ais_items, weights=y[ais_rows] * inst.ais_qty,
+                       minlength=inst.I)                                  # Sᵀy
+    units = int(inst.units[orders].sum())
+    res["units"] = units
+
+    short = np.flatnonzero(need > have)
+    if not (inst.LB <= units <= inst.UB):
+        res["reason"] = f"unidades {units} fuera de [{inst.LB},{inst.UB}]"
+    elif len(short):
+        i = int(short[0])
+        res["reason"] = (f"{len(short)} ítems sin stock suficiente "
+                         f"(ítem {i}: {int(need[i])} > {int(have[i])})")
+    elif not len(aisles):
+        res["reason"] = "ola sin pasillos"
+    else:
+        res["feasible"] = True
+        res["obj"] = units / len(aisles)
+    return res
+
+
+# ---------------- lectura de soluciones --------------------------------------
+def read_solution(fname):
+    """
+    Devuelve (formato, órdenes, pasillos); órdenes = pasillos = None si el
+    archivo no trae una ola (p.ej. un .sol que sólo tiene la salida del
+    solver, o ``obj NA``).
+    """
+    with open(fname) as f:
+        text = f.read()
+
+    try:
+        sol = json.loads(text)
+    except ValueError:
+        sol = False
+    if sol is None or isinstance(sol, dict):
+        if not sol or "orders" not in sol:
+            return "json", None, None
+        return "json", list(sol["orders"]), list(sol["aisles"])
+
+    var = re.findall(r"^\s*([xy])_(\d+)\s+([0-9.eE+-]+)\s*$", text, re.M)
+    if var:
+        on = lambda t: [int(j) for v, j, val in var if v == t and float(val) > 0.5]
+        return "vars", on("y"), on("x")
+
+    tok = text.split()
+    try:
+        nums = [int(t) for t in tok]
+        no = nums[0]
+        orders = nums[1:1 + no]
+        na = nums[1 + no]
+        aisles = nums[2 + no:2 + no + na]
+        if len(orders) == no and len(aisles) == na:
+            return "desafio", orders, aisles
+    except (ValueError, IndexError):
+        pass
+    return "otro", None, None
+
+
+def find_instance(sol_file, data_dir):
+    """
+    Instancia de un archivo de salida: ``instance_NNNN`` en el nombre.
+    Un prefijo ``<d>_`` (a_instance_0001.sol) o un sufijo ``_<d>``
+    (instance_0001_a.sol, como los datasets de la parte 7) se buscan
+    primero en data_dir/<d>/, con y sin el sufijo en el nombre.
+    """
+    stem = os.path.splitext(os.path.basename(sol_file))[0]
+    m = re.search(r"(?:(\w+?)_)?(instance_\d+|input_\d+)(?:_(\w+))?$", stem)
+    if not m:
+        return None
+    prefix, name, suffix = m.groups()
+    cands = []
+    if suffix:
+        cands += [os.path.join(data_dir, name + "_" + suffix + ".txt"),
+                  os.path.join(data_dir, suffix, name + "_" + suffix + ".txt"),
+                  os.path.join(data_dir, suffix, name + ".txt")]
+    if prefix:
+        cands += [os.path.join(data_dir, prefix, name + ".txt"),
+                  os.path.join(data_dir, prefix, name + "_" + prefix + ".txt"),
+                  os.path.join(data_dir, name + "_" + prefix + ".txt")]
+    cands.append(os.path.join(data_dir, name + ".txt"))
+    for cand in cands:
+        if os.path.exists(cand):
+            return cand
+    return None
+
+
+# ---------------- modo lote ---------------------------------------------------
+def check_dir(out_dir, data_dir, log=print):
+    """Verifica cada .sol/.out de out_dir; devuelve la lista de filas del reporte."""
+    files = sorted(glob.glob(os.path.join(out_dir, "*.sol")) +
+                   glob.glob(os.path.join(out_dir, "*.out")))
+    cache, rows = {}, []
+    for fname in files:
+        row = dict.fromkeys(FIELDS)
+        row.update(file=os.path.basename(fname), feasible=False)
+        inst_file = find_instance(fname, data_dir)
+        fmt, orders, aisles = read_solution(fname)
+        row.update(format=fmt, instance=inst_file and os.path.relpath(inst_file, data_dir))
+        if inst_file is None:
+            row["reason"] = "sin instancia"
+        elif orders is None:
+            row["reason"] = "sin ola"
+        else:
+            if inst_file not in cache:
+                cache[inst_file] = load_instance(inst_file)
+            row.update(check(cache[inst_file], orders, aisles))
+        rows.append(row)
+        if log:
+            obj = f"{row['obj']:.4f}" if row["obj"] is not None else "-"
+            log(f"[check] {row['file']:28s} {'OK ' if row['feasible'] else 'NO '} "
+                f"obj={obj} {row['reason'] or ''}")
+    return rows
+
+
+def write_report(rows, fname):
+    """Guarda el reporte: CSV si el nombre termina en .csv, si no JSON."""
+    with open(fname, "w", newline="") as f:
+        if fname.endswith(".csv"):
+            w = csv.DictWriter(f, fieldnames=FIELDS)
+            w.writeheader()
+            w.writerows(rows)
+        else:
+            json.dump(rows, f, indent=1)
@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 # solve_subprob1.py
 
+import sys, os
 from pyscipopt import Model, quicksum
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Desafio"))
+from comun.instancia import load_instance
+
 def read_data(filename):
     """
     Lee el input con formato:
@@ -10,38 +14,15 @@ def read_data(filename):
       siguientes o líneas: k (item cantidad)*k   (demanda_por_bolsitaa de cada bolsita)
       siguientes a líneas: l (item cantidad)*l   (oferta de cada contenedor)
       última línea: 2 enteros (ignorados)
-    Devuelve: cant_bolsitas, cant_items, cant_contenedores, demanda_por_bolsita, items_por_contenedor
-    - demanda_por_bolsita[b][i] = cantidad del ítem i en bolsita b
-    - items_por_contenedor[c][i] = cantidad del ítem i en contenedor c
+    Devuelve la instancia rala (ver Desafio/comun/instancia.py):
+    - inst.order(b)        = (ítems, cantidades) de la bolsita b
+    - inst.orders_with(i)  = (bolsitas, cantidades) que piden el ítem i
+    - inst.aisles_with(i)  = (contenedores, cantidades) que tienen el ítem i
     """
-    with open(filename, 'r') as f:
-        o, i, a = map(int, f.readline().split())
-
-        cant_bolsitas, cant_items, cant_contenedores = o, i, a
-
-        # matriz que guarda para cada bolsita b y cada ítem i, cuántas unidades pide
-        demanda_por_bolsita = [[0] * cant_items for _ in range(cant_bolsitas)]
-        for bolsita in range(cant_bolsitas):
-            datos = list(map(int, f.readline().split()))
-            k = datos[0]
-            pares = datos[1:]
-            for idx in range(0, 2*k, 2):
-                item, cantidad = pares[idx], pares[idx+1]
-                demanda_por_bolsita[bolsita][item] = cantidad
-
-        items_por_contenedor = [[0]*cant_items for _ in range(cant_contenedores)]
-        for contenedor in range(cant_contenedores):
-            datos = list(map(int, f.readline().split()))
-            l = datos[0]
-            pares = datos[1:]
-            for idx in range(0, 2*l, 2):
-                item, cantidad = pares[idx], pares[idx+1]
-                items_por_contenedor[contenedor][item] = cantidad
-        _ = f.readline()
-
-    return cant_bolsitas, cant_items, cant_contenedores, demanda_por_bolsita, items_por_contenedor
+    return load_instance(filename)
 
-def solve(cant_bolsitas, cant_items, cant_contenedores, demanda_por_bolsita, items_por_contenedor):
+def solve(inst):
+    cant_bolsitas, cant_items, cant_contenedores = inst.O, inst.I, inst.A
     model = Model("Punto1")
 
     # Variables binarias (si se elige el contenedor o la bolsita 1 sino 0)
@@ -54,14 +35,16 @@ def solve(cant_bolsitas, cant_items, cant_contenedores, demanda_por_bolsita, ite
 
     # Cobertura por ítem
     for item in range(cant_items):
+        bolsitas, pide = inst.orders_with(item)
+        conts, tiene   = inst.aisles_with(item)
         model.addCons(
-            quicksum(y[b] * demanda_por_bolsita[b][item] for b in range(cant_bolsitas))
+            quicksum(y[b] * q for b, q in zip(bolsitas.tolist(), pide.tolist()))
             <=
-            quicksum(x[c] * items_por_contenedor[c][item] for c in range(cant_contenedores)),
+            quicksum(x[c] * q for c, q in zip(conts.tolist(), tiene.tolist())),
             name=f"Cover_item_{item}"
         )
     # Beneficios (cada ítem vale 1)
-    bagVal = {b: sum(demanda_por_bolsita[b]) for b in range(cant_bolsitas)} 
+    bagVal = dict(enumerate(inst.units.tolist()))
 
     #contVal = {c: sum(items_por_contenedor[c]) for c in range(cant_contenedores)} #cada contenedor vale 1 o vale lo que sumen sus items?
     contVal = { c: 1 for c in range(cant_contenedores) }
@@ -87,5 +70,5 @@ def solve(cant_bolsitas, cant_items, cant_contenedores, demanda_por_bolsita, ite
 
 if __name__ == "__main__":
     input_file = "input_0001.txt"
-    cant_bolsitas, cant_items, cant_contenedores, demanda_por_bolsita, items_por_contenedor = read_data(input_file)
-    solve(cant_bolsitas, cant_items, cant_contenedores, demanda_por_bolsita, items_por_contenedor)
+    inst = read_data(input_file)
+    solve(inst)
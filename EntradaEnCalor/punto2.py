@@ -6,41 +6,20 @@
 #   sum_{c in A'} -10 (por ejemplo)           (cada contenedor vale -10)
 # + sum_{b in O'} sum_i demanda_por_bolsita[b][i]  (cada ítem en la bolsita vale 1)
 
+import sys, os
 from pyscipopt import Model, quicksum
 
-def read_data(filename):
-    """Lee input.txt con el formato descrito y devuelve
-       cant_bolsitas, cant_items, cant_contenedores, demanda_por_bolsita, items_por_contenedor."""
-    with open(filename, 'r') as f:
-        o, i, a = map(int, f.readline().split())
-        cant_bolsitas, cant_items, cant_contenedores = o, i, a
-
-        # demanda_por_bolsitaa[b][i] = cantidad del ítem i que pide la bolsita b
-        demanda_por_bolsita = [[0]*cant_items for _ in range(cant_bolsitas)]
-        for bolsita in range(cant_bolsitas):
-            datos = list(map(int, f.readline().split()))
-            k = datos[0]
-            pares = datos[1:]
-            for idx in range(0, 2*k, 2):
-                item, cantidad = pares[idx], pares[idx+1]
-                demanda_por_bolsita[bolsita][item] = cantidad
-
-        # items_por_contenedor[c][i] = cantidad del ítem i que aporta el contenedor c
-        items_por_contenedor = [[0]*cant_items for _ in range(cant_contenedores)]
-        for c in range(cant_contenedores):
-            datos = list(map(int, f.readline().split()))
-            l, pares = datos[0], datos[1:]
-            for idx in range(l):
-                itm, cantidad = pares[2*idx], pares[2*idx+1]
-                items_por_contenedor[c][itm] = cantidad
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Desafio"))
+from comun.instancia import load_instance
 
-        # Ignorar los dos enteros finales (LB, UB)
-        f.readline()
-
-    return cant_bolsitas, cant_items, cant_contenedores, demanda_por_bolsita, items_por_contenedor
+def read_data(filename):
+    """Lee input.txt con el formato descrito y devuelve la instancia rala
+       (ver Desafio/comun/instancia.py); LB y UB no se usan acá."""
+    return load_instance(filename)
 
-def solve_point2(cant_bolsitas, cant_items, cant_contenedores, demanda_por_bolsita, items_por_contenedor):
+def solve_point2(inst):
     """Construye y resuelve el modelo del Punto 2 con PySCIPOpt."""
+    cant_bolsitas, cant_items, cant_contenedores = inst.O, inst.I, inst.A
     model = Model("Subprob2_Many_Containers")
 
     # Variables binarias
@@ -49,15 +28,17 @@ def solve_point2(cant_bolsitas, cant_items, cant_contenedores, demanda_por_bolsi
 
     # Restricciones de cobertura para cada ítem i
     for itm in range(cant_items):
+        bolsitas, pide = inst.orders_with(itm)
+        conts, tiene   = inst.aisles_with(itm)
         model.addCons(
-            quicksum(y[b]*demanda_por_bolsita[b][itm] for b in range(cant_bolsitas))
+            quicksum(y[b]*q for b, q in zip(bolsitas.tolist(), pide.tolist()))
             <=
-            quicksum(x[c]*items_por_contenedor[c][itm] for c in range(cant_contenedores)),
+            quicksum(x[c]*q for c, q in zip(conts.tolist(), tiene.tolist())),
             name=f"Cover_item_{itm}"
         )
 
     #Beneficios
-    bagVal  = {b: sum(demanda_por_bolsita[b])   for b in range(cant_bolsitas)}    # suma de ítems en bolsa b
+    bagVal  = dict(enumerate(inst.units.tolist()))    # suma de ítems en bolsa b
     contVal = {c: -10                 for c in range(cant_contenedores)} 
 
     # Función objetivo
@@ -83,5 +64,5 @@ def solve_point2(cant_bolsitas, cant_items, cant_contenedores, demanda_por_bolsi
 
 if __name__ == "__main__":
     fn = "input_0001.txt"
-    cant_bolsitas, cant_items, cant_contenedores, demanda_por_bolsita, items_por_contenedor = read_data(fn)
-    solve_point2(cant_bolsitas, cant_items, cant_contenedores, demanda_por_bolsita, items_por_contenedor)
+    inst = read_data(fn)
+    solve_point2(inst)